@@ -35,7 +35,7 @@ from PyQt4.QtGui import QFont, QGridLayout, QIcon, QWidget
 
 # Load the necessary "janus" modules.
 
-from janus_core import core
+from janus_qt_core import qt_core
 
 from janus_custom_Application import custom_Application
 from janus_custom_MainWindow import custom_MainWindow
@@ -77,7 +77,7 @@ class janus( object ) :
 		# Initialize an instance of "fc_spec" with the Wind/FC ion
 		# spectrum whose timestamp is closest to the time requested.
 
-		self.core = core( time=time )
+		self.core = qt_core( time=time )
 
 		# Initialize the application.
 
@@ -0,0 +1,214 @@
+################################################################################
+##
+## Janus -- GUI Software for Processing Thermal-Ion Measurements from the
+##          Wind Spacecraft's Faraday Cups
+##
+## Copyright (C) 2016 Bennett A. Maruca (bmaruca@udel.edu)
+##
+## This program is free software: you can redistribute it and/or modify it under
+## the terms of the GNU General Public License as published by the Free Software
+## Foundation, either version 3 of the License, or (at your option) any later
+## version.
+##
+## This program is distributed in the hope that it will be useful, but WITHOUT
+## ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+## FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+## details.
+##
+## You should have received a copy of the GNU General Public License along with
+## this program.  If not, see http://www.gnu.org/licenses/.
+##
+################################################################################
+
+
+
+################################################################################
+## LOAD THE NECESSARY MODULES.
+################################################################################
+
+# Load the modules necessary for parsing the command line and for file
+# operations.
+
+import os
+import sys
+
+from argparse import ArgumentParser
+
+# Load the (graphical-interface independent) analysis core of Janus.
+
+from janus_core import core
+
+# Load the archive of Wind/MFI data (for selecting its product).
+
+from janus_mfi_arcv import mfi_arcv
+
+# Load the dictionary of solvers for the non-linear analysis.
+
+from janus_nln_slvr import nln_slvr
+
+
+################################################################################
+## DEFINE THE "batch_sink" CLASS FOR REPORTING EVENTS WITHOUT A DISPLAY.
+################################################################################
+
+class batch_sink( object ) :
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE INITIALIZATION FUNCTION.
+	#-----------------------------------------------------------------------
+
+	def __init__( self, verbose=True, strm=None ) :
+
+		# Save the arguments for later use.
+
+		self.verbose = verbose
+		self.strm    = sys.stderr if ( strm is None ) else strm
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR RESPONDING TO AN EVENT FROM THE CORE.
+	#-----------------------------------------------------------------------
+
+	def __call__( self, sig, *args ) :
+
+		# Only messages and progress reports are reported (and only if
+		# requested); all other events exist solely to update the
+		# graphical interface.
+
+		if ( not self.verbose ) :
+			return
+
+		if ( sig == 'janus_mesg' ) :
+			self.strm.write( ' '.join( [ str( a )
+			                             for a in args ] ) )
+			self.strm.write( '\n' )
+
+		if ( sig == 'janus_prog_auto_run' ) :
+			self.strm.write( 'core prog auto {:d}/{:d}\n'.format(
+			                                    args[0], args[1] ) )
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR RUNNING AN AUTOMATED ANALYSIS WITHOUT A DISPLAY.
+################################################################################
+
+def janus_batch( argv=None ) :
+
+	# Parse the command-line arguments.
+
+	prs = ArgumentParser( prog='janus-batch',
+	             description='Run the Janus analyses on a range of ' +
+	                         'Wind/FC spectra without a display.'      )
+
+	prs.add_argument( 't_strt', help='start timestamp ' +
+	                                 '(yyyy-mm-dd/hh:mm:ss)' )
+	prs.add_argument( 't_stop', help='stop timestamp '  +
+	                                 '(yyyy-mm-dd/hh:mm:ss)' )
+	prs.add_argument( 'nm_fl' , help='output file'           )
+
+	prs.add_argument( '--next', action='store_true',
+	                  help='begin with the spectrum after "t_strt"' )
+	prs.add_argument( '--halt', action='store_true',
+	                  help='halt on the first analysis error'       )
+	prs.add_argument( '--xprt', action='store_true',
+	                  help='export a text file (instead of a save)' )
+	prs.add_argument( '--quiet', action='store_true',
+	                  help='suppress progress messages'             )
+	prs.add_argument( '--proc', type=int, default=1,
+	                  help='number of worker processes (0 for one ' +
+	                       'per core)'                                )
+	prs.add_argument( '--vpro', action='store_true',
+	                  help='solve for the densities separately in ' +
+	                       'the non-linear fit'                       )
+	prs.add_argument( '--slvr', default='lm',
+	                  choices=sorted( nln_slvr.keys( ) ),
+	                  help='solver for the non-linear fit (default: ' +
+	                       '"lm")'                                     )
+	prs.add_argument( '--cont', action='store_true',
+	                  help='initialize each non-linear fit from that ' +
+	                       'of the previous spectrum'                   )
+	prs.add_argument( '--tab', action='store_true',
+	                  help='start each non-linear fit with the ' +
+	                       'tabulated instrumental response'      )
+	prs.add_argument( '--mem', type=float, default=None,
+	                  help='memory budget [MB] for the loaded data ' +
+	                       '(per process)'                            )
+	prs.add_argument( '--src', default=None,
+	                  help='source of missing data files: an FTP ' +
+	                       'server ("ftp://host[:port]") or a local ' +
+	                       'mirror directory (default: CDAWeb)'        )
+	prs.add_argument( '--mwin', action='store_true',
+	                  help='read the Wind/MFI files in windows ' +
+	                       '(rather than whole days)'             )
+	prs.add_argument( '--mh2', action='store_true',
+	                  help='use the high-resolution (11 samples/s) ' +
+	                       'Wind/MFI data'                            )
+
+	arg = prs.parse_args( argv )
+
+	# If the necessary subdirectories do not exist, create them.
+
+	dname = os.path.dirname( os.path.abspath( __file__ ) )
+
+	lst = [ os.path.join( dname, 'data'        ),
+	        os.path.join( dname, 'data', 'fc'  ),
+	        os.path.join( dname, 'data', 'mfi' )  ]
+
+	for d in lst :
+		if ( not os.path.isdir( d ) ) :
+			os.mkdir( d )
+
+	# Initialize the analysis core with an event sink that reports its
+	# messages to the terminal.
+
+	cr = core( sink=batch_sink( verbose=( not arg.quiet ) ) )
+
+	# Enable the dynamic updating of every analysis so that each spectrum
+	# is carried through the non-linear analysis (and thus has its results
+	# added to the core's series).
+
+	cr.chng_dyn( 'mom', True, rerun=False )
+	cr.chng_dyn( 'gss', True, rerun=False )
+	cr.chng_dyn( 'sel', True, rerun=False )
+	cr.chng_dyn( 'nln', True, rerun=False )
+
+	cr.nln_vpro = arg.vpro
+	cr.nln_slvr = arg.slvr
+	cr.nln_cont = arg.cont
+
+	cr.nln_tab_use = arg.tab
+
+	if ( arg.mh2 ) :
+		cr.mfi_arcv = mfi_arcv( core=cr, bdgt=cr.bdgt, use_h2=True )
+
+	if ( arg.mem is not None ) :
+		cr.bdgt.mem_max = arg.mem * 2.**20
+
+	if ( arg.src is not None ) :
+		cr.fc_arcv.dnld.src  = arg.src
+		cr.mfi_arcv.dnld.src = arg.src
+
+	if ( arg.mwin ) :
+		cr.mfi_arcv.use_win = True
+
+	# Run the automated analysis (in parallel, if requested).
+
+	if ( arg.proc == 1 ) :
+		cr.auto_run( arg.t_strt, arg.t_stop,
+		             get_next=arg.next, err_halt=arg.halt, pause=0 )
+	else :
+		cr.auto_run_pool( arg.t_strt, arg.t_stop,
+		                  get_next=arg.next, err_halt=arg.halt,
+		                  n_proc=( None if ( arg.proc <= 0 )
+		                                else arg.proc        )   )
+
+	# Write the results to the output file.
+
+	if ( arg.xprt ) :
+		cr.xprt_res( arg.nm_fl )
+	else :
+		cr.save_res( arg.nm_fl )
+
+	# Return an exit status that indicates whether the automated analysis
+	# was aborted.
+
+	return 1 if ( cr.stop_auto_run ) else 0
@@ -0,0 +1,294 @@
+################################################################################
+##
+## Janus -- GUI Software for Processing Thermal-Ion Measurements from the
+##          Wind Spacecraft's Faraday Cups
+##
+## Copyright (C) 2016 Bennett A. Maruca (bmaruca@udel.edu)
+##
+## This program is free software: you can redistribute it and/or modify it under
+## the terms of the GNU General Public License as published by the Free Software
+## Foundation, either version 3 of the License, or (at your option) any later
+## version.
+##
+## This program is distributed in the hope that it will be useful, but WITHOUT
+## ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+## FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+## details.
+##
+## You should have received a copy of the GNU General Public License along with
+## this program.  If not, see http://www.gnu.org/licenses/.
+##
+################################################################################
+
+
+
+################################################################################
+## LOAD THE NECESSARY MODULES.
+################################################################################
+
+# Load the modules necessary for timing and for parsing the command line.
+
+from time import time
+
+from argparse import ArgumentParser
+
+# Load the modules necessary for handling dates and times.
+
+from datetime import datetime, timedelta
+
+from janus_time import calc_time_str, calc_time_val
+
+# Load the necessary array modules and mathematical functions.
+
+from numpy import append, arange, around, array, array_equal, tile, \
+                  transpose, where
+
+from numpy.random import RandomState
+
+# Load the (vectorized) ingestion of IDL "SAVE" files of Wind/FC and
+# Wind/MFI data.
+
+from janus_fc_arcv import calc_idl_cur
+
+from janus_mfi_arcv import calc_idl_date
+
+
+################################################################################
+## DEFINE THE REFERENCE (PER-SPECTRUM AND PER-DAY) IMPLEMENTATIONS.
+################################################################################
+
+# Note.  The functions below reproduce, operation for operation, the
+#        original ingestion of IDL "SAVE" files by the "read_date" method
+#        of the "fc_arcv" class (which loops over the spectra) and by the
+#        "load_date" method of the "mfi_arcv" class (which selects the
+#        data of each day with "where").  They are retained here only as
+#        baselines for the timing and accuracy comparisons.
+
+# Note.  The original test of each day-of-year value compared "doy" (i.e.,
+#        that of the requested date, which is always positive) rather
+#        than "doy_d" with zero.  Since any non-positive "doy_d" falls in
+#        the previous year (and so is skipped anyway), that test is simply
+#        omitted here.
+
+def ref_idl_cur( dat ) :
+
+	n_sub = len( dat.sec )
+
+	sub_cup1_cur = 1E12 * array( [
+	                  transpose( dat.currents[s,0,:,:] +
+	                             dat.currents[s,2,:,:] )
+	                  for s in range( n_sub )            ] )
+	sub_cup2_cur = 1E12 * array( [
+	                  transpose( dat.currents[s,1,:,:] +
+	                             dat.currents[s,3,:,:] )
+	                  for s in range( n_sub )            ] )
+
+	return ( sub_cup1_cur, sub_cup2_cur )
+
+def ref_idl_date( year, doy_min, ind_0, sub_t ) :
+
+	sub_ind = tile( -1, len( sub_t ) )
+
+	new_date_str = array( [ ] )
+	new_date_ind = array( [ ] )
+	n_new_date   = 0
+
+	for d in range( 20 ) :
+
+		doy_d = doy_min + d
+
+		time_epc_d = datetime( year, 1, 1, 12 ) + timedelta( doy_d - 1 )
+
+		time_epc_d_1 = datetime( year, 1, 1 ) + timedelta( doy_d - 1 )
+		time_epc_d_2 = datetime( year, 1, 1 ) + timedelta( doy_d )
+
+		if ( time_epc_d.year != year ) :
+			continue
+
+		date_str_d = calc_time_str( time_epc_d )[0:10]
+		date_ind_d = ind_0 + n_new_date
+
+		new_date_str = append( new_date_str, [ date_str_d ] )
+		new_date_ind = append( new_date_ind, [ date_ind_d ] )
+
+		n_new_date += 1
+
+		time_val_d_1 = calc_time_val( time_epc_d_1 )
+		time_val_d_2 = calc_time_val( time_epc_d_2 )
+
+		tk_d = where( ( sub_t >= time_val_d_1 ) &
+		              ( sub_t <  time_val_d_2 )   )[0]
+
+		n_tk_d = len( tk_d )
+
+		if ( n_tk_d > 0 ) :
+			sub_ind[tk_d] = date_ind_d
+
+	return ( new_date_str, new_date_ind, sub_ind )
+
+
+################################################################################
+## DEFINE THE CLASS THAT MIMICS THE CONTENTS OF AN IDL "SAVE" FILE.
+################################################################################
+
+# Note.  Like the object returned by "readsav", this is a dictionary whose
+#        entries may also be accessed as attributes (e.g., "dat.sec").
+
+class idl_sav( dict ) :
+
+	def __getattr__( self, name ) :
+
+		try :
+			return self[name]
+		except KeyError :
+			raise AttributeError( name )
+
+
+################################################################################
+## DEFINE THE FUNCTIONS FOR GENERATING RANDOM (BUT REALISTIC) INPUTS.
+################################################################################
+
+# Note.  The variables of an IDL "SAVE" file are stored big-endian, and
+#        "readsav" returns them as such (i.e., without converting them to
+#        the native byte order).  The arrays below are likewise.
+
+def bench_arg_fc( n, seed=0 ) :
+
+	# Generate the contents of an IDL "SAVE" file of "n" Wind/FC spectra
+	# (each with 4 half-cups, 20 look directions, and 31 velocity
+	# windows).
+
+	rnd = RandomState( seed )
+
+	dat = idl_sav( )
+
+	dat['sec'] = ( 92. * arange( n ) ).astype( '>f8' )
+
+	dat['currents'] = ( 1.e-12 * rnd.exponential( 1., ( n, 4, 20, 31 ) )
+	                  ).astype( '>f4' )
+
+	return dat
+
+def bench_arg_mfi( n_day, year=2008, doy_min=100, seed=0 ) :
+
+	# Generate the times (i.e., values) of the Wind/MFI data (at a
+	# cadence of about three seconds) in an IDL "SAVE" file that starts
+	# with day-of-year "doy_min" of "year" and spans "n_day" days.
+
+	rnd = RandomState( seed )
+
+	n = int( n_day * 86400. / 3. )
+
+	dat = idl_sav( )
+
+	dat['doymag'] = ( doy_min + n_day * ( arange( n ) + rnd.uniform(
+	                            0., 0.5, n ) ) / n ).astype( '>f8' )
+
+	# Convert the times as does the "load_date" method of "mfi_arcv".
+
+	time_val_year = calc_time_val( datetime( year, 1, 1 ) )
+
+	sub_t = around( time_val_year + ( 86400. * ( dat.doymag - 1. ) ), 3 )
+
+	return ( year, doy_min, 0, sub_t )
+
+
+################################################################################
+## DEFINE THE FUNCTIONS FOR TIMING AND COMPARING THE IMPLEMENTATIONS.
+################################################################################
+
+def bench_fc( n, rep=10 ) :
+
+	# Combine the currents of "n" spectra "rep" times with each
+	# implementation, and check that the results are identical.
+
+	dat = bench_arg_fc( n )
+
+	t_ref = time( )
+
+	for r in range( rep ) :
+		ret_ref = ref_idl_cur( dat )
+
+	t_ref = ( time( ) - t_ref ) / rep
+
+	t_new = time( )
+
+	for r in range( rep ) :
+		ret_new = calc_idl_cur( dat.currents )
+
+	t_new = ( time( ) - t_new ) / rep
+
+	for ( val_ref, val_new ) in zip( ret_ref, ret_new ) :
+		assert ( val_ref.shape == val_new.shape )
+		assert ( array_equal( val_ref, val_new ) )
+
+	return ( t_ref, t_new )
+
+def bench_mfi( n_day, doy_min, rep=3 ) :
+
+	# Date the data of "n_day" days (from day-of-year "doy_min") "rep"
+	# times with each implementation, and check that the results are
+	# identical.
+
+	arg = bench_arg_mfi( n_day, doy_min=doy_min )
+
+	t_ref = time( )
+
+	for r in range( rep ) :
+		ret_ref = ref_idl_date( *arg )
+
+	t_ref = ( time( ) - t_ref ) / rep
+
+	t_new = time( )
+
+	for r in range( rep ) :
+		ret_new = calc_idl_date( *arg )
+
+	t_new = ( time( ) - t_new ) / rep
+
+	for ( val_ref, val_new ) in zip( ret_ref, ret_new ) :
+		assert ( array_equal( val_ref, val_new ) )
+
+	return ( t_ref, t_new )
+
+
+################################################################################
+## RUN THE BENCHMARK.
+################################################################################
+
+if ( __name__ == '__main__' ) :
+
+	# Interpret the command-line arguments.
+
+	arg = ArgumentParser( description='Time the ingestion of IDL files.' )
+
+	arg.add_argument( 'n', nargs='*', type=int, default=[ 930, 9300 ],
+	                  help='number of Wind/FC spectra (default: 930 9300)' )
+	arg.add_argument( '--day', type=int, default=20,
+	                  help='days of Wind/MFI data (default: 20)' )
+
+	arg = arg.parse_args( )
+
+	# Time the two implementations for each of the requested sizes.
+
+	print( '{:>9}  {:>9}  {:>11}  {:>11}  {:>8}'.format(
+	       'data', 'n', 'loop [s]', 'array [s]', 'speed-up' ) )
+
+	for n in arg.n :
+
+		( t_ref, t_new ) = bench_fc( n )
+
+		print( '{:>9}  {:>9d}  {:>11.3e}  {:>11.3e}  {:>8.1f}'.format(
+		       'Wind/FC', n, t_ref, t_new, t_ref / t_new            ) )
+
+	# Note.  The second file of Wind/MFI data starts near the end of a
+	#        year, so most of its days are invalid.
+
+	for doy_min in [ 100, 360 ] :
+
+		( t_ref, t_new ) = bench_mfi( arg.day, doy_min )
+
+		print( '{:>9}  {:>9d}  {:>11.3e}  {:>11.3e}  {:>8.1f}'.format(
+		       'Wind/MFI', arg.day, t_ref, t_new, t_ref / t_new      ) )
+
+	print( 'The outputs of the two implementations are identical.' )
@@ -0,0 +1,319 @@
+################################################################################
+##
+## Janus -- GUI Software for Processing Thermal-Ion Measurements from the
+##          Wind Spacecraft's Faraday Cups
+##
+## Copyright (C) 2016 Bennett A. Maruca (bmaruca@udel.edu)
+##
+## This program is free software: you can redistribute it and/or modify it under
+## the terms of the GNU General Public License as published by the Free Software
+## Foundation, either version 3 of the License, or (at your option) any later
+## version.
+##
+## This program is distributed in the hope that it will be useful, but WITHOUT
+## ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+## FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+## details.
+##
+## You should have received a copy of the GNU General Public License along with
+## this program.  If not, see http://www.gnu.org/licenses/.
+##
+################################################################################
+
+
+
+################################################################################
+## LOAD THE NECESSARY MODULES.
+################################################################################
+
+# Load the modules necessary for timing and for parsing the command line.
+
+from time import time
+
+from argparse import ArgumentParser
+
+# Load the dictionary of physical constants.
+
+from janus_const import const
+
+# Load the necessary array modules and mathematical functions.
+
+from numpy import abs, amax, amin, any, arange, argmax, argsort, array, \
+                  atleast_1d, average, dot, isnan, mean, newaxis, polyfit, \
+                  sqrt, sum, tile, where
+
+from numpy.linalg import lstsq
+
+from numpy.random import RandomState
+
+# Load the (vectorized) models of the Wind/FC instrumental response and the
+# stacked moments analysis.
+
+from janus_fc_rsp import rsp_cur_bmx, rsp_dir_look
+
+from janus_mom_bat import calc_bat_mom
+
+# Load the reference (per-point) implementation of the cup response.
+
+from janus_bench_rsp import ref_dir_look, ref_eff_area
+
+
+################################################################################
+## DEFINE THE REFERENCE (PER-DIRECTION) IMPLEMENTATION OF THE MOMENTS ANALYSIS.
+################################################################################
+
+# Note.  The function below reproduces, operation for operation, the
+#        estimators and the anisotropy analysis of the original method
+#        "anls_mom" of the "core" class (i.e., the one that loops over the
+#        selected look directions in Python).  It is retained here only as
+#        a baseline for the timing and accuracy comparisons.
+
+def ref_anls_mom( alt, azm, vel_cen, vel_wid, cur, sel_azm, sel_cur,
+                  mfi_nrm, mfi_vld                                   ) :
+
+	( tk_t, tk_p ) = where( sel_azm )
+
+	n_eta = len( tk_t )
+
+	eta_dlk = tile( 0., [ n_eta, 3 ] )
+	eta_eca = tile( 0., n_eta )
+	eta_n   = tile( 0., n_eta )
+	eta_v   = tile( 0., n_eta )
+	eta_w   = tile( 0., n_eta )
+
+	for k in range( n_eta ) :
+
+		t = tk_t[k]
+		p = tk_p[k]
+
+		eta_dlk[k,:] = ref_dir_look( alt[t], azm[t,p] )
+
+		v = where( sel_cur[t,p,:] )[0]
+
+		eta_v[k] = - sum( cur[t,p,v] ) / sum( cur[t,p,v] / vel_cen[v] )
+
+	mom_v_vec = lstsq( eta_dlk, eta_v, rcond=None )[0]
+
+	for k in range( n_eta ) :
+
+		t = tk_t[k]
+		p = tk_p[k]
+
+		eta_eca[k] = ref_eff_area( eta_dlk[k,:], mom_v_vec )
+
+		v = where( sel_cur[t,p,:] )[0]
+
+		eta_n[k] = 1e-6 * ( ( 1. / const['q_p'] )
+		           / ( 1.e-4 * eta_eca[k] )
+		           * sum( ( 1.e-12 * cur[t,p,v] ) /
+		                  ( 1.e3 * vel_cen[v]   )   ) )
+
+		eta_w[k] = 1e-3 * sqrt( max( [ 0.,
+		           ( ( 1. / const['q_p'] )
+		           / ( 1.e-4 * eta_eca[k] )
+		           / ( 1.e6 * eta_n[k] )
+		           * sum( ( 1.e-12 * cur[t,p,v] ) *
+		                  ( 1.e3 * vel_cen[v]   )   ) )
+		           - ( 1e3 * eta_v[k] )**2               ] ) )
+
+	mom_n = average( eta_n, weights=eta_eca**2 )
+
+	aniso = mfi_vld
+
+	if ( aniso ) :
+
+		dat_x = array( [ dot( d, mfi_nrm ) for d in eta_dlk ] )**2
+		dat_y = eta_w**2
+
+		if ( amax( dat_x ) == amin( dat_x ) ) :
+			aniso = False
+
+	if ( aniso ) :
+
+		( f_slope, f_icept ) = polyfit( dat_x, dat_y, 1 )
+
+		if ( (   f_icept             <= 0 ) or
+		     ( ( f_icept + f_slope ) <= 0 )    ) :
+			aniso = False
+
+	if ( aniso ) :
+
+		mom_w_per = sqrt( f_icept )
+		mom_w_par = sqrt( f_icept + f_slope )
+
+		mom_w = sqrt( ( (2./3.) *   f_icept             ) +
+		              ( (1./3.) * ( f_icept + f_slope ) )   )
+
+	else :
+
+		mom_w_per = None
+		mom_w_par = None
+
+		mom_w = mean( eta_w )
+
+	return { 'n':mom_n, 'v_vec':mom_v_vec, 'w':mom_w,
+	         'w_per':mom_w_per, 'w_par':mom_w_par,
+	         'eta_n':eta_n, 'eta_v':eta_v, 'eta_w':eta_w }
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR GENERATING A RANDOM (BUT REALISTIC) INPUT.
+################################################################################
+
+def bench_arg( seed=0, zero_eca=False ) :
+
+	# Generate a (noisy) bi-Maxwellian spectrum with look directions and
+	# velocity windows similar to those of a Wind/FC spectrum.
+
+	rnd = RandomState( seed )
+
+	alt = array( [ 15., -15. ] )
+	azm = ( 18. * arange( 20 ) )[newaxis,:] + array( [ [ 0. ], [ 9. ] ] )
+
+	vel_cen = 200. * 1.06**arange( 31 )
+	vel_wid = 0.06 * vel_cen
+
+	mfi_nrm = rnd.normal( 0., 1., 3 )
+	mfi_nrm = mfi_nrm / sqrt( sum( mfi_nrm**2 ) )
+
+	cur = rsp_cur_bmx( vel_cen, vel_wid,
+	                   alt[:,newaxis,newaxis], azm[...,newaxis],
+	                   mfi_nrm[0], mfi_nrm[1], mfi_nrm[2],
+	                   5., -400., 20., -10., 30., 40.        )
+
+	cur = abs( cur + rnd.normal( 0., 0.01 * amax( cur ), cur.shape ) )
+
+	# Select the five look directions of each cup with the largest
+	# currents and, of each, the seven velocity windows about its peak.
+
+	sel_azm = tile( False, azm.shape )
+	sel_cur = tile( False, cur.shape )
+
+	for t in range( 2 ) :
+
+		for p in argsort( amax( cur[t], axis=-1 ) )[-5:] :
+
+			sel_azm[t,p] = True
+
+			v = min( max( argmax( cur[t,p] ), 3 ), 27 )
+
+			sel_cur[t,p,v-3:v+4] = True
+
+	# If requested, also select the look direction that is closest to
+	# perpendicular to the flow (and so has no effective collecting
+	# area).
+
+	if ( zero_eca ) :
+
+		dlk = rsp_dir_look( alt[:,newaxis], azm )
+
+		dot_v = abs( sum( dlk * array( [ -400., 20., -10. ] ),
+		                  axis=-1                              ) )
+
+		( t, p ) = [ tk[0] for tk in where( dot_v == amin( dot_v ) ) ]
+
+		sel_azm[t,p] = True
+		sel_cur[t,p,10:17] = True
+
+	return ( alt, azm, vel_cen, vel_wid, cur, sel_azm, sel_cur,
+	         mfi_nrm, True                                      )
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR TIMING AND COMPARING THE TWO IMPLEMENTATIONS.
+################################################################################
+
+def bench_mom( n, zero_eca=False ) :
+
+	# Analyze "n" spectra with each implementation (the stacked one at
+	# once).
+
+	arg = [ bench_arg( seed=s, zero_eca=zero_eca ) for s in range( n ) ]
+
+	t_ref = time( )
+
+	ret_ref = [ ref_anls_mom( *a ) for a in arg ]
+
+	t_ref = time( ) - t_ref
+
+	t_bat = time( )
+
+	ret_bat = calc_bat_mom( arg[0][0],
+	                        *[ array( [ a[k] for a in arg ] )
+	                           for k in range( 1, 9 )         ] )
+
+	t_bat = time( ) - t_bat
+
+	# Compute the largest difference between the two implementations
+	# (relative to the reference value).  A result that is "nan" (or, in
+	# the reference, "None") must be so in both.
+
+	err = 0.
+
+	for ( s, ref ) in enumerate( ret_ref ) :
+
+		( tk_t, tk_p ) = where( arg[s][5] )
+
+		for key in ref :
+
+			val_ref = ref[key]
+			val_bat = ret_bat[key][s]
+
+			if ( key[0:4] == 'eta_' ) :
+				val_bat = val_bat[tk_t,tk_p]
+
+			if ( val_ref is None ) :
+				val_ref = float( 'nan' )
+
+			val_ref = atleast_1d( array( val_ref, dtype=float ) )
+			val_bat = atleast_1d( array( val_bat, dtype=float ) )
+
+			if ( any( isnan( val_ref ) != isnan( val_bat ) ) ) :
+				return ( t_ref, t_bat, float( 'infinity' ) )
+
+			tk = where( ~ isnan( val_ref ) )
+
+			if ( len( tk[0] ) == 0 ) :
+				continue
+
+			err = max( [ err, amax( abs( val_bat[tk] - val_ref[tk] )
+			                        / abs( val_ref[tk] )            ) ] )
+
+	# Return the timings and the difference.
+
+	return ( t_ref, t_bat, err )
+
+
+################################################################################
+## RUN THE BENCHMARK.
+################################################################################
+
+if ( __name__ == '__main__' ) :
+
+	# Interpret the command-line arguments.
+
+	arg = ArgumentParser( description='Time the moments analysis.' )
+
+	arg.add_argument( 'n', nargs='*', type=int, default=[ 1, 100 ],
+	                  help='number of spectra (default: 1 100)' )
+
+	arg = arg.parse_args( )
+
+	# Time the two implementations for each of the requested sizes (with
+	# and without a selected look direction that has no effective
+	# collecting area).
+
+	print( '{:>9}  {:>8}  {:>11}  {:>11}  {:>8}  {:>9}'.format(
+	       'n', 'zero eca', 'loop [s]', 'stack [s]', 'speed-up',
+	       'rel. err.'                                           ) )
+
+	for n in arg.n :
+
+		for zero_eca in [ False, True ] :
+
+			( t_ref, t_bat, err ) = bench_mom( n,
+			                                   zero_eca=zero_eca )
+
+			print( '{:>9d}  {:>8}  {:>11.3e}  {:>11.3e}  {:>8.1f}  '
+			       '{:>9.1e}'.format( n, str( zero_eca ), t_ref,
+			                          t_bat, t_ref / t_bat, err  ) )
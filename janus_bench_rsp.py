@@ -0,0 +1,288 @@
+################################################################################
+##
+## Janus -- GUI Software for Processing Thermal-Ion Measurements from the
+##          Wind Spacecraft's Faraday Cups
+##
+## Copyright (C) 2016 Bennett A. Maruca (bmaruca@udel.edu)
+##
+## This program is free software: you can redistribute it and/or modify it under
+## the terms of the GNU General Public License as published by the Free Software
+## Foundation, either version 3 of the License, or (at your option) any later
+## version.
+##
+## This program is distributed in the hope that it will be useful, but WITHOUT
+## ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+## FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+## details.
+##
+## You should have received a copy of the GNU General Public License along with
+## this program.  If not, see http://www.gnu.org/licenses/.
+##
+################################################################################
+
+
+
+################################################################################
+## LOAD THE NECESSARY MODULES.
+################################################################################
+
+# Load the modules necessary for timing and for parsing the command line.
+
+from time import time
+
+from argparse import ArgumentParser
+
+# Load the dictionary of physical constants.
+
+from janus_const import const
+
+# Load the necessary array modules and mathematical functions.
+
+from numpy import abs, amax, arccos, array, cos, deg2rad, dot, exp, interp, \
+                  pi, rad2deg, sin, sqrt, sum, transpose
+
+from numpy.random import RandomState
+
+from scipy.special import erf
+
+# Load the (vectorized) model of the Wind/FC instrumental response.
+
+from janus_fc_rsp import eff_deg, eff_area, rsp_cur_bmx, rsp_cur_bmx_jac
+
+
+################################################################################
+## DEFINE THE REFERENCE (PER-POINT) IMPLEMENTATION OF THE CUP RESPONSE.
+################################################################################
+
+# Note.  The functions below reproduce, operation for operation, the
+#        original methods "calc_arr_dot", "calc_arr_nrm", "calc_arr_clp",
+#        "calc_dir_look", "calc_eff_area", and "calc_cur_bmx" of the
+#        "core" class (i.e., those that loop over the data in Python).
+#        They are retained here only as a baseline for the timing and
+#        accuracy comparisons.
+
+def ref_arr_dot( u, v ) :
+
+	if ( hasattr( u[0], '__iter__' ) and hasattr( v[0], '__iter__' ) ) :
+		return array( [ dot( uu, vv ) for ( uu, vv ) in zip( u, v ) ] )
+	elif ( hasattr( u[0], '__iter__' ) ) :
+		return array( [ dot( uu, v ) for uu in u ] )
+	elif ( hasattr( v[0], '__iter__' ) ) :
+		return array( [ dot( u, vv ) for vv in v ] )
+	else :
+		return dot( u, v )
+
+def ref_arr_nrm( v ) :
+
+	if ( hasattr( v[0], '__iter__' ) ) :
+		return array( [ vv / sqrt( sum( vv**2 ) ) for vv in v ] )
+	else :
+		return v / sqrt( sum( v**2 ) )
+
+def ref_arr_clp( a, lwr, upr ) :
+
+	if hasattr( a, '__iter__' ) :
+		return array( [ min( [ max( [ v, lwr ] ), upr ] ) for v in a ] )
+	else :
+		return min( [ max( [ a, lwr ] ), upr ] )
+
+def ref_dir_look( alt, azm ) :
+
+	the = - alt + 90.
+	phi = - azm
+
+	ret = array( [ sin( deg2rad( the ) ) * cos( deg2rad( phi ) ),
+	               sin( deg2rad( the ) ) * sin( deg2rad( phi ) ),
+	               cos( deg2rad( the ) )                          ] )
+
+	return ( transpose( ret ) if ( ret.ndim > 1 ) else ret )
+
+def ref_eff_area( d, v ) :
+
+	psi = rad2deg( arccos( ref_arr_dot( ref_arr_nrm( d ),
+	                                    -ref_arr_nrm( v ) ) ) )
+	psi = ref_arr_clp( psi, 0., 90. )
+
+	if hasattr( psi, '__iter__' ) :
+		return array( [ interp( p, eff_deg, eff_area ) for p in psi ] )
+	else :
+		return interp( psi, eff_deg, eff_area )
+
+def ref_cur_bmx( vel_cen, vel_wid, dir_alt, dir_azm,
+                 mag_x, mag_y, mag_z,
+                 prm_n, prm_v_x, prm_v_y, prm_v_z,
+                 prm_w_per, prm_w_par              ) :
+
+	prm_v = array( [ prm_v_x, prm_v_y, prm_v_z ] )
+
+	if ( prm_v.ndim > 1 ) :
+		prm_v = transpose( prm_v )
+
+	dlk = ref_dir_look( dir_alt, dir_azm )
+
+	mag = array( [ mag_x, mag_y, mag_z ] )
+
+	if ( mag.ndim > 1 ) :
+		mag = transpose( mag )
+
+	dmg_dlk = ref_arr_dot( ref_arr_nrm( mag ), dlk )
+
+	prm_w = sqrt( ( ( 1. - dmg_dlk**2 ) * prm_w_per**2 ) +
+	              (        dmg_dlk**2   * prm_w_par**2 )   )
+
+	ret_exp_1 = 1.e3 * prm_w * sqrt( 2. / pi ) * exp(
+	            - ( ( vel_cen - ( vel_wid / 2. )
+	            - ref_arr_dot( dlk, -prm_v ) ) / prm_w )**2 / 2. )
+	ret_exp_2 = 1.e3 * prm_w * sqrt( 2. / pi ) * exp(
+	            - ( ( vel_cen + ( vel_wid / 2. )
+	            - ref_arr_dot( dlk, -prm_v ) ) / prm_w )**2 / 2. )
+
+	ret_erf_1 = 1.e3 * ref_arr_dot( dlk, -prm_v ) * erf(
+	            ( vel_cen - ( vel_wid / 2. )
+	            - ref_arr_dot( dlk, -prm_v ) ) / ( sqrt(2.) * prm_w ) )
+	ret_erf_2 = 1.e3 * ref_arr_dot( dlk, -prm_v ) * erf(
+	            ( vel_cen + ( vel_wid / 2. )
+	            - ref_arr_dot( dlk, -prm_v ) ) / ( sqrt(2.) * prm_w ) )
+
+	ret_prn = ( ( ret_exp_2 + ret_erf_2 ) -
+	            ( ret_exp_1 + ret_erf_1 )   )
+
+	return ( ( 1.e12 ) * ( 1. / 2. ) * ( const['q_p'] )
+	         * ( 1.e6 * prm_n )
+	         * ( 1.e-4 * ref_eff_area( dlk, prm_v ) )
+	         * ( ret_prn ) )
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR GENERATING A RANDOM (BUT REALISTIC) INPUT.
+################################################################################
+
+def bench_arg( n, seed=0 ) :
+
+	# Generate "n" velocity windows and look directions (similar to those
+	# of a Wind/FC spectrum) and a drifting, per-point magnetic field.
+
+	rnd = RandomState( seed )
+
+	vel_cen = rnd.uniform( 150., 1300., n )
+	vel_wid = 0.06 * vel_cen
+	dir_alt = rnd.choice( [ -15., 15. ], n )
+	dir_azm = rnd.uniform( -180., 180., n )
+
+	mag_x = rnd.normal( 0., 5., n )
+	mag_y = rnd.normal( 0., 5., n )
+	mag_z = rnd.normal( 0., 5., n )
+
+	return ( vel_cen, vel_wid, dir_alt, dir_azm, mag_x, mag_y, mag_z,
+	         5., -400. + 0. * mag_x, 20. + 0. * mag_x, -10. + 0. * mag_x,
+	         30., 40.                                                    )
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR TIMING AND COMPARING THE TWO IMPLEMENTATIONS.
+################################################################################
+
+def bench_rsp( n, n_rep=1 ) :
+
+	# Time "n_rep" evaluations of each implementation.
+
+	arg = bench_arg( n )
+
+	t_ref = time( )
+
+	for r in range( n_rep ) :
+		ret_ref = ref_cur_bmx( *arg )
+
+	t_ref = ( time( ) - t_ref ) / n_rep
+
+	t_rsp = time( )
+
+	for r in range( n_rep ) :
+		ret_rsp = rsp_cur_bmx( *arg )
+
+	t_rsp = ( time( ) - t_rsp ) / n_rep
+
+	# Compute the largest difference between the two implementations
+	# (relative to the largest current).
+
+	err = amax( abs( ret_rsp - ret_ref ) ) / amax( abs( ret_ref ) )
+
+	# Return the timings and the difference.
+
+	return ( t_ref, t_rsp, err )
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR CHECKING THE JACOBIAN AGAINST FINITE DIFFERENCES.
+################################################################################
+
+def bench_jac( n ) :
+
+	# Compute the analytic Jacobian with respect to "n", "v_x", "v_y",
+	# "v_z", "w_per", and "w_par" (i.e., arguments 7 through 12).
+
+	arg = list( bench_arg( n ) )
+
+	( cur, jac ) = rsp_cur_bmx_jac( *arg )
+
+	# Estimate each column of the Jacobian through central differences,
+	# and return the largest difference from the analytic values
+	# (relative to the largest value of that column).
+
+	err = 0.
+
+	for k in range( 6 ) :
+
+		a = 7 + k
+
+		h = 1.e-6 * max( [ 1., amax( abs( arg[a] ) ) ] )
+
+		arg_p = list( arg )
+		arg_m = list( arg )
+
+		arg_p[a] = arg[a] + h
+		arg_m[a] = arg[a] - h
+
+		jac_fd = ( rsp_cur_bmx( *arg_p ) - rsp_cur_bmx( *arg_m ) ) / \
+		         ( 2. * h )
+
+		err = max( [ err, amax( abs( jac[:,k] - jac_fd ) ) /
+		                  amax( abs( jac_fd ) )             ] )
+
+	return err
+
+
+################################################################################
+## RUN THE BENCHMARK.
+################################################################################
+
+if ( __name__ == '__main__' ) :
+
+	# Interpret the command-line arguments.
+
+	arg = ArgumentParser( description='Time the Wind/FC response model.' )
+
+	arg.add_argument( 'n', nargs='*', type=int, default=[ 1240, 1000000 ],
+	                  help='number of data points (default: 1240 1000000)' )
+	arg.add_argument( '--rep', type=int, default=10,
+	                  help='repetitions at spectrum scale (default: 10)' )
+
+	arg = arg.parse_args( )
+
+	# Time the two implementations for each of the requested sizes.
+
+	print( '{:>9}  {:>11}  {:>11}  {:>8}  {:>9}'.format(
+	       'n', 'loop [s]', 'kernel [s]', 'speed-up', 'rel. err.' ) )
+
+	for n in arg.n :
+
+		( t_ref, t_rsp, err ) = bench_rsp( n,
+		                          arg.rep if ( n <= 10000 ) else 1 )
+
+		print( '{:>9d}  {:>11.3e}  {:>11.3e}  {:>8.1f}  {:>9.1e}'
+		       .format( n, t_ref, t_rsp, t_ref / t_rsp, err ) )
+
+	# Check the analytic Jacobian against finite differences.
+
+	print( 'Jacobian (rel. err. vs. finite differences): {:.1e}'.format(
+	       bench_jac( min( arg.n ) ) ) )
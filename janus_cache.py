@@ -0,0 +1,409 @@
+################################################################################
+##
+## Janus -- GUI Software for Processing Thermal-Ion Measurements from the
+##          Wind Spacecraft's Faraday Cups
+##
+## Copyright (C) 2016 Bennett A. Maruca (bmaruca@udel.edu)
+##
+## This program is free software: you can redistribute it and/or modify it under
+## the terms of the GNU General Public License as published by the Free Software
+## Foundation, either version 3 of the License, or (at your option) any later
+## version.
+##
+## This program is distributed in the hope that it will be useful, but WITHOUT
+## ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+## FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+## details.
+##
+## You should have received a copy of the GNU General Public License along with
+## this program.  If not, see http://www.gnu.org/licenses/.
+##
+################################################################################
+
+
+
+################################################################################
+## LOAD THE NECESSARY MODULES.
+################################################################################
+
+# Load the modules necessary for file I/O.
+
+import os
+
+from shutil import rmtree
+
+# Load the necessary "numpy" array modules.
+
+from numpy import ascontiguousarray, load, memmap, save
+
+
+################################################################################
+## DEFINE THE VERSION OF THE CACHE FORMAT.
+################################################################################
+
+# Note.  This value is written to the stamp of each cached date (along with
+#        the name, size, and modification time of its source file and the
+#        names, types, and shapes of its arrays).  It should be
+#        incremented whenever the conversion of any source file changes so
+#        that stale caches are ignored (and then rewritten).
+
+cache_ver = 2
+
+
+## +----------+----------------------------------------------------------------+
+## |          |                                                                |
+## | Argument | Comments                                                       |
+## |          |                                                                |
+## +----------+----------------------------------------------------------------+
+## |          |                                                                |
+## | path     | Data directory of the archive (the cache is kept in its        |
+## |          | "cache" subdirectory)                                          |
+## |          |                                                                |
+## | name     | Name of the cached item, which is used as the name of its      |
+## |          | directory; this should be derived from the name of its source  |
+## |          | file (e.g., "fc_wi_sw-ion-dist_swe-faraday_20010304_v02"), so  |
+## |          | that each version of a file is cached separately               |
+## |          |                                                                |
+## | src      | Path of the source file of the cached item                     |
+## |          |                                                                |
+## | key      | List of the names of the arrays (each stored in a ".npy" file) |
+## |          |                                                                |
+## | dat      | Dictionary of the arrays                                       |
+## |          |                                                                |
+## +----------+----------------------------------------------------------------+
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR COMPOSING THE STAMP OF A CACHED ITEM.
+################################################################################
+
+def calc_cache_stamp( key, dat, src=None ) :
+
+	# Compose the stamp from the version of the cache format, the name,
+	# size, and modification time of the source file (if any), and the
+	# name, type, and shape of each array.
+
+	stamp = 'janus_cache {:d}\n'.format( cache_ver )
+
+	if ( src is not None ) :
+		stamp += 'src {} {:d} {:.0f}\n'.format(
+		                       os.path.basename( src ),
+		                       os.path.getsize( src ),
+		                       os.path.getmtime( src )  )
+
+	for k in key :
+		stamp += '{} {} {}\n'.format( k, dat[k].dtype.str,
+		                                 dat[k].shape       )
+
+	return stamp
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR LOADING (I.E., MEMORY-MAPPING) A CACHED ITEM.
+################################################################################
+
+def load_cache( path, name, key, src=None ) :
+
+	# Determine the directory of the cached item.  If it does not exist,
+	# return "None".
+
+	dname = os.path.join( path, 'cache', name )
+
+	if ( not os.path.isdir( dname ) ) :
+		return None
+
+	# Attempt to read the stamp and to memory-map each array.  If the
+	# stamp was made by a different version of the cache format, from a
+	# different source file (or a since modified one), or for a different
+	# set of arrays, or if anything else goes wrong, return "None" (so
+	# that the item is converted from its source again).
+
+	try :
+
+		with open( os.path.join( dname, 'stamp.txt' ) ) as fl :
+			stamp = fl.read( )
+
+		if ( stamp.splitlines( )[0] !=
+		     calc_cache_stamp( [ ], { } ).splitlines( )[0] ) :
+			return None
+
+		dat = { }
+
+		for k in key :
+			dat[k] = load( os.path.join( dname, k + '.npy' ),
+			               mmap_mode='r'                      )
+
+		if ( stamp != calc_cache_stamp( key, dat, src=src ) ) :
+			return None
+
+	except :
+
+		return None
+
+	# Return the dictionary of (memory-mapped) arrays.
+
+	return dat
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR SAVING AN ITEM TO THE CACHE.
+################################################################################
+
+def save_cache( path, name, key, dat, src=None ) :
+
+	# Note.  The item is first written to a temporary directory, which is
+	#        then renamed.  Thus, a partially written item is never read
+	#        (even if several processes convert the same date at once).
+	#        Any failure (e.g., an unwritable data directory) is ignored,
+	#        as the cache is only an optimization.
+
+	dname = os.path.join( path, 'cache', name )
+	tname = dname + '.tmp{:d}'.format( os.getpid( ) )
+
+	try :
+
+		if ( not os.path.isdir( os.path.join( path, 'cache' ) ) ) :
+			os.makedirs( os.path.join( path, 'cache' ) )
+
+		if ( os.path.isdir( tname ) ) :
+			rmtree( tname )
+
+		os.mkdir( tname )
+
+		for k in key :
+			save( os.path.join( tname, k + '.npy' ),
+			      ascontiguousarray( dat[k] )        )
+
+		with open( os.path.join( tname, 'stamp.txt' ), 'w' ) as fl :
+			fl.write( calc_cache_stamp( key, dat, src=src ) )
+
+		if ( os.path.isdir( dname ) ) :
+			rmtree( dname )
+
+		os.rename( tname, dname )
+
+	except :
+
+		if ( os.path.isdir( tname ) ) :
+			rmtree( tname, ignore_errors=True )
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR DELETING AN ITEM FROM THE CACHE.
+################################################################################
+
+def drop_cache( path, name ) :
+
+	# Delete the directory of the cached item (if it exists).
+
+	# Note.  This should be called whenever the source file of the item
+	#        is deleted, as the item would otherwise be kept indefinitely.
+
+	rmtree( os.path.join( path, 'cache', name ), ignore_errors=True )
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR COUNTING THE BYTES OF AN ITEM HELD IN MEMORY.
+################################################################################
+
+def calc_cache_byte( dat ) :
+
+	# Return the total size of those arrays of the dictionary "dat" that
+	# are held in memory.
+
+	# Note.  Memory-mapped arrays (i.e., those returned by "load_cache")
+	#        are excluded.  Their pages are only read from the cache as
+	#        they are accessed and may be evicted by the operating system
+	#        at any time, so dropping them would not free any memory that
+	#        the budget (see "cache_bdgt") could otherwise reclaim.
+
+	return sum( [ dat[k].nbytes for k in dat
+	              if ( not isinstance( dat[k], memmap ) ) ] )
+
+
+################################################################################
+## DEFINE THE "cache_bdgt" CLASS FOR THE MEMORY BUDGET OF THE DATA ARCHIVES.
+################################################################################
+
+## +----------+----------------------------------------------------------------+
+## |          |                                                                |
+## | Argument | Comments                                                       |
+## |          |                                                                |
+## +----------+----------------------------------------------------------------+
+## |          |                                                                |
+## | mem_max  | Maximum number of bytes of data to be kept in memory (across   |
+## |          | all archives sharing the budget); "None" for no limit          |
+## |          |                                                                |
+## | arcv     | Archive (which must provide a "drop_date" function)            |
+## |          |                                                                |
+## | date_str | Date (of data loaded into the archive)                         |
+## |          |                                                                |
+## | n_byte   | Number of bytes of the date's data held in memory (see         |
+## |          | "calc_cache_byte")                                             |
+## |          |                                                                |
+## | use      | Whether adding the date counts as a use of it                  |
+## |          |                                                                |
+## +----------+----------------------------------------------------------------+
+
+class cache_bdgt( object ) :
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE INITIALIZATION FUNCTION.
+	#-----------------------------------------------------------------------
+
+	def __init__( self, mem_max=None ) :
+
+		# Save the maximum number of bytes.
+
+		if ( mem_max is None ) :
+			self.mem_max = float( 'infinity' )
+		else :
+			self.mem_max = mem_max
+
+		# Initialize the dictionary of loaded dates, each entry of which
+		# gives the date's size and the count of uses (of all dates) at
+		# the date's last use.
+
+		# Note.  The budget only counts the data that are held in
+		#        memory: those of each loaded date, of each finished
+		#        prefetch (see, e.g., "fc_arcv.cleanup_pref"), and of
+		#        the window of Wind/MFI data (see "mfi_arcv.read_win").
+		#        The memory-mapped arrays of the cache are deliberately
+		#        excluded (see "calc_cache_byte"), as is each prefetch
+		#        that is still running (which is counted once it
+		#        finishes).
+
+		self.item = { }
+
+		self.n_use = 0
+
+		# Initialize the set of pinned dates (i.e., those that are never
+		# dropped to enforce the budget).
+
+		self.pin = set( )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR ADDING A DATE TO THE BUDGET.
+	#-----------------------------------------------------------------------
+
+	# Note.  If "use" is "False", the date is added as though it had never
+	#        been used (e.g., for a date that has only been prefetched),
+	#        so it is the first to be dropped to enforce the budget.
+
+	def add_item( self, arcv, date_str, n_byte, use=True ) :
+
+		if ( use ) :
+			self.n_use += 1
+			self.item[( arcv, date_str )] = [ n_byte, self.n_use ]
+		else :
+			self.item[( arcv, date_str )] = [ n_byte, 0 ]
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR RECORDING A USE OF A DATE.
+	#-----------------------------------------------------------------------
+
+	def use_item( self, arcv, date_str ) :
+
+		itm = self.item.get( ( arcv, date_str ) )
+
+		if ( itm is not None ) :
+			self.n_use += 1
+			itm[1] = self.n_use
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR REMOVING A DATE FROM THE BUDGET.
+	#-----------------------------------------------------------------------
+
+	def drop_item( self, arcv, date_str ) :
+
+		self.item.pop( ( arcv, date_str ), None )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTIONS FOR PINNING AND UNPINNING A DATE.
+	#-----------------------------------------------------------------------
+
+	# Note.  A date may be pinned before it has been loaded (and added to
+	#        the budget) and remains pinned if it is dropped.
+
+	def pin_item( self, arcv, date_str ) :
+
+		self.pin.add( ( arcv, date_str ) )
+
+	def unpin_item( self, arcv, date_str ) :
+
+		self.pin.discard( ( arcv, date_str ) )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR COMPUTING THE NUMBER OF BYTES IN USE.
+	#-----------------------------------------------------------------------
+
+	def calc_mem( self, arcv=None ) :
+
+		# Return the total size of the loaded dates (from all archives
+		# or only from "arcv").
+
+		return sum( [ itm[0] for ( key, itm ) in self.item.items( )
+		              if ( ( arcv is None ) or ( key[0] is arcv ) ) ] )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR FINDING THE LEAST RECENTLY USED DATE.
+	#-----------------------------------------------------------------------
+
+	def calc_lru( self, arcv=None ) :
+
+		# Return the "( arcv, date_str )" key of the least recently used
+		# unpinned date (from all archives or only from "arcv") or, if
+		# there are no such dates, "None".
+
+		ret = None
+
+		for ( key, itm ) in self.item.items( ) :
+
+			if ( ( arcv is not None ) and ( key[0] is not arcv ) ) :
+				continue
+
+			if ( key in self.pin ) :
+				continue
+
+			if ( ret is None ) :
+				ret = key
+			elif ( itm[1] < self.item[ret][1] ) :
+				ret = key
+
+		return ret
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR ENFORCING THE BUDGET.
+	#-----------------------------------------------------------------------
+
+	def cleanup( self ) :
+
+		# Drop the least recently used dates until the loaded dates fit
+		# within the budget, and return the number of dates dropped.
+
+		# Note.  Neither the most recently used date nor any pinned date
+		#        is ever dropped (even if they alone exceed the budget).
+
+		n_drop = 0
+
+		while ( self.calc_mem( ) > self.mem_max ) :
+
+			key = self.calc_lru( )
+
+			if ( key is None ) :
+				break
+
+			n_use = max( [ itm[1] for itm in self.item.values( ) ] )
+
+			if ( self.item[key][1] == n_use ) :
+				break
+
+			( arcv, date_str ) = key
+
+			arcv.drop_date( date_str )
+
+			self.drop_item( arcv, date_str )
+
+			n_drop += 1
+
+		return n_drop
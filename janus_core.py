@@ -25,19 +25,16 @@
 ## LOAD THE NECESSARY MODULES.
 ################################################################################
 
-# Load the modules necessary for signaling the graphical interface.
-
-from PyQt4.QtCore import QObject, SIGNAL, QThread
-
 # Load the modules necessary for file operations.
 
 import os.path
 
 # Load the modules necessary for handling dates and times.
 
-from time import sleep
+from time import sleep, time
 from datetime import datetime, timedelta
-from janus_time import calc_time_epc, calc_time_sec, calc_time_val
+from janus_time import calc_time_epc, calc_time_sec, calc_time_str, \
+                       calc_time_val
 
 # Load the module necessary handling step functions.
 
@@ -51,18 +48,32 @@ from janus_const import const
 
 from janus_fc_arcv import fc_arcv
 from janus_mfi_arcv import mfi_arcv
+from janus_cache import cache_bdgt
+
+# Load the modules necessary for preprocessing the Wind/FC spectra and
+# preparing the Wind/MFI data.
+
+from janus_fc_prep import calc_cur_vld
+from janus_mfi_prep import mfi_prep
+
+# Load the (vectorized) model of the Wind/FC instrumental response.
+
+from janus_fc_rsp import eff_deg, eff_area, rsp_dir_look, rsp_eff_area, \
+                         rsp_cur_max, rsp_cur_bmx, rsp_cur_max_jac, \
+                         rsp_cur_bmx_jac, rsp_vec, rsp_tab
 
 # Load the necessary array modules and mathematical functions.
 
 from numpy import amax, amin, append, arccos, arctan2, arange, argsort, array, \
                     average, cos, deg2rad, diag, dot, exp, indices, interp, \
                     mean, pi, polyfit, rad2deg, reshape, sign, sin, sum, sqrt, \
-                    std, tile, transpose, where, zeros
+                    std, tile, transpose, where, zeros, newaxis, isfinite, \
+                    bincount, floor, inf
 
-from numpy.linalg import lstsq
+from numpy.linalg import lstsq, pinv, qr
+
+from scipy.optimize import nnls
 
-from scipy.interpolate import interp1d
-from scipy.optimize import curve_fit
 from scipy.special import erf
 from scipy.stats import pearsonr, spearmanr
 
@@ -72,19 +83,36 @@ from janus_helper import round_sig
 
 from janus_pyon import plas, series
 
+# Load the stacked (i.e., batch) non-linear fitter.
+
+from janus_nln_bat import calc_bat_lm
+
+# Load the stacked (i.e., batch) moments analysis.
+
+from janus_mom_bat import calc_bat_mom
+from janus_mom_sel import calc_sel_azm, calc_sel_cur
+
+# Load the solvers for the non-linear analysis.
+
+from janus_nln_slvr import calc_nln_slvr, calc_slvr_covar, nln_slvr_bnd
+
 # Load the modules necessary for saving results to a data file.
 
 import pickle
 
+# Load the modules necessary for running analyses in parallel processes.
+
+from multiprocessing import Pool, cpu_count
+
 
 ################################################################################
 ## DEFINE THE "core" CLASS: THE ANLYSIS CORE OF JANUS.
 ################################################################################
 
-class core( QObject ) :
+class core( object ) :
 
 	# +-------------------+------------------------------+
-	# | SIGNAL('janus_*') | Arguments                    |
+	# | Event 'janus_*'   | Arguments                    |
 	# +-------------------+------------------------------+
 	# | busy_beg          |                              |
 	# | busy_end          |                              |
@@ -105,26 +133,33 @@ class core( QObject ) :
 	# | chng_nln_res      |                              |
 	# | chng_dsp          |                              |
 	# | chng_dyn          |                              |
+	# | prog_auto_run     | n_done, n_shrd               |
 	# | done_auto_run     |                              |
 	# | exit              |                              |
 	# +-------------------+------------------------------+
 
+	# Note.  This class has no dependence on "Qt" (or on any graphical
+	#        interface).  Each event in the table above is passed to
+	#        "self.emit", which forwards it to the event sink (if any)
+	#        that was provided at initialization.  The graphical
+	#        interface instead uses the "qt_core" subclass, which
+	#        re-emits each event as a "Qt" signal.
+
 	#-----------------------------------------------------------------------
 	# DEFINE THE INITIALIZATION FUNCTION.
 	#-----------------------------------------------------------------------
 
-	def __init__( self, app=None, time=None ) :
+	def __init__( self, app=None, time=None, sink=None,
+	                    mem_max=None, arcv_fc=None, arcv_mfi=None ) :
 
-		# Inheret all attributes of the "QObject" class.
+		# Save the application (if any) and the event sink (if any).
 
-		# Note.  This class does not directly provide any graphical
-		#        interface.  Rather, the functions of the "QObject"
-		#        class are used principally for signal the classes that
-		#        do.
+		# Note.  The event sink, "sink", should be either "None" or a
+		#        callable that accepts the name of an event followed by
+		#        that event's arguments (see the table above).
 
-		super( core, self ).__init__( )
-
-		self.app = app
+		self.app  = app
+		self.sink = sink
 
 		# Read and store the version information.
 
@@ -143,20 +178,43 @@ class core( QObject ) :
 
 		self.debug = False
 
+		# Initialize the memory budget to be shared by the data
+		# archives (with, by default, no limit).
+
+		self.bdgt = cache_bdgt( mem_max=mem_max )
+
 		# Initialize and store the archive of Wind/FC ion spectra.
 
-		self.fc_arcv = fc_arcv( core=self )
+		# Note.  The dictionaries "arcv_fc" and "arcv_mfi" (if
+		#        provided) give the keywords with which the archives
+		#        are initialized.
+
+		if ( arcv_fc is None ) :
+			arcv_fc = { }
+
+		if ( arcv_mfi is None ) :
+			arcv_mfi = { }
+
+		self.fc_arcv = fc_arcv( core=self, bdgt=self.bdgt, **arcv_fc )
 		###self.fc_arcv = fc_arcv( core=self, use_idl=True,
 		###                        buf=-1.                  )
 
 		# Initialize and store the archive of Wind/MFI magnetic field
 		# data.
 
-		self.mfi_arcv = mfi_arcv( core=self )
+		self.mfi_arcv = mfi_arcv( core=self, bdgt=self.bdgt,
+		                          **arcv_mfi                  )
 		###self.mfi_arcv = mfi_arcv( core=self, use_k0=True,
 		###                          buf=-1., tol=90.         )
 		###self.mfi_arcv = mfi_arcv( core=self, use_idl=True,
 		###                          buf=-1., tol=90.         )
+		###self.mfi_arcv = mfi_arcv( core=self, use_h2=True,
+		###                          bdgt=self.bdgt           )
+
+		# Initialize the preparation of the Wind/MFI data (which is
+		# retained from one spectrum to the next).
+
+		self.mfi_prep = mfi_prep( )
 
 		# Initialize a log of the analysis results.
 
@@ -184,6 +242,17 @@ class core( QObject ) :
 
 			self.load_spec( time )
 
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR EMITTING AN EVENT TO THE EVENT SINK.
+	#-----------------------------------------------------------------------
+
+	def emit( self, sig, *args ) :
+
+		# If an event sink has been provided, pass the event to it.
+
+		if ( self.sink is not None ) :
+			self.sink( sig, *args )
+
 	#-----------------------------------------------------------------------
 	# INITIALIZE THE THE DATA AND ANALYSIS VARIABLES.
 	#-----------------------------------------------------------------------
@@ -202,31 +271,11 @@ class core( QObject ) :
 		               var_nln_sel=True, var_nln_res=True,
 		               var_dsp=True, var_dyn=True          )
 
-		# Define the data array with values for effective collecting
+		# Retrieve the data array with values for effective collecting
 		# area, "eff_area", as a function of inflow angle, "deg".
 
-		self.eff_deg  = arange( 0., 91., dtype=float )
-
-		self.eff_area = 1.e-5 * array( [
-		      3382000.0, 3383000.0, 3383000.0, 3382000.0, 3381000.0,
-		      3380000.0, 3378000.0, 3377000.0, 3376000.0, 3374000.0,
-		      3372000.0, 3369000.0, 3368000.0, 3364000.0, 3362000.0,
-		      3359000.0, 3355000.0, 3351000.0, 3347000.0, 3343000.0,
-		      3338700.0, 3334100.0, 3329300.0, 3324300.0, 3318200.0,
-		      3312800.0, 3306300.0, 3299600.0, 3292800.0, 3285900.0,
-		      3277800.0, 3270700.0, 3261600.0, 3253500.0, 3244500.0,
-		      3234600.0, 3224900.0, 3200100.0, 3161500.0, 3114000.0,
-		      3058820.0, 2997170.0, 2930000.0, 2857000.0, 2779000.0,
-		      2694000.0, 2586999.7, 2465000.0, 2329999.6, 2183000.0,
-		      2025999.6, 1859000.1, 1682999.6, 1497000.1, 1301999.6,
-		      1099000.1, 887799.56, 668500.16, 452099.62, 257500.16,
-		      96799.784, 539.96863, 0.0000000, 0.0000000, 0.0000000,
-		      0.0000000, 0.0000000, 0.0000000, 0.0000000, 0.0000000,
-		      0.0000000, 0.0000000, 0.0000000, 0.0000000, 0.0000000,
-		      0.0000000, 0.0000000, 0.0000000, 0.0000000, 0.0000000,
-		      0.0000000, 0.0000000, 0.0000000, 0.0000000, 0.0000000,
-		      0.0000000, 0.0000000, 0.0000000, 0.0000000, 0.0000000,
-		      0.0000000                                              ] )
+		self.eff_deg  = eff_deg
+		self.eff_area = eff_area
 
 		# Initialize the value of the indicator variable of whether the
 		# automatic analysis should be aborted.
@@ -241,6 +290,22 @@ class core( QObject ) :
 
 		self.stop_auto_run = False
 
+		# Initialize the variables for the continuation (i.e.,
+		# "warm-start") mode of the automatic analysis.
+
+		# Note.  While "self.auto_run" is running (with "self.nln_cont"
+		#        set to "True"), "self.nln_cont_prv" holds the time,
+		#        populations, and fit parameters of the last successful
+		#        non-linear fit (or "None"), and "self.nln_cont_cnt"
+		#        accumulates the number of fits (column 0) and of
+		#        evaluations of the model (column 1) and of its Jacobian
+		#        (column 2; i.e., the number of iterations) for those
+		#        fits initialized from the moments (row 0) and from the
+		#        previous fit (row 1).
+
+		self.nln_cont_prv = None
+		self.nln_cont_cnt = zeros( ( 2, 3 ), dtype=int )
+
 	#-----------------------------------------------------------------------
 	# RESET THE DATA AND ANALYSIS VARIABLES.
 	#-----------------------------------------------------------------------
@@ -483,6 +548,42 @@ class core( QObject ) :
 			self.nln_set_sel_vld[3] = True
 			self.nln_set_sel_vld[4] = True
 
+			# Note.  If "self.nln_vpro" is "True", the non-linear
+			#        analysis solves for the densities separately
+			#        (see "self.calc_nln_vpro").
+
+			self.nln_vpro = False
+
+			# Note.  The value of "self.nln_slvr" is the key of the
+			#        solver used by the non-linear analysis (see
+			#        "janus_nln_slvr").
+
+			self.nln_slvr = 'lm'
+
+			# Note.  If "self.nln_tab_use" is "True", the non-linear
+			#        fit is first run (to within the relative
+			#        tolerance "self.nln_tab_cnv") with the "erf"
+			#        factor of the response taken from a table (to
+			#        within an absolute error of "self.nln_tab_tol";
+			#        see "rsp_tab"), and then finished (and its
+			#        covariance computed) with the exact response.
+			#        The same table is used to compute the currents
+			#        from the initial guess.
+
+			self.nln_tab_use = False
+			self.nln_tab_tol = 1.e-6
+			self.nln_tab_cnv = 1.e-5
+			self.nln_tab     = None
+
+			# Note.  If "self.nln_cont" is "True", the automatic
+			#        analysis initializes each non-linear fit from
+			#        the results of that of the previous spectrum
+			#        (if that fit succeeded and the two spectra are
+			#        no more than "self.nln_cont_dt" seconds apart).
+
+			self.nln_cont    = False
+			self.nln_cont_dt = 150.
+
 		# If requested, (re-)initialize the variables associated with
 		# the initial guesses for the non-linear analysis.
 
@@ -500,6 +601,8 @@ class core( QObject ) :
 			self.nln_gss_pop = array( [ ] )
 			self.nln_gss_prm = array( [ ] )
 
+			self.nln_gss_cont = False
+
 			self.nln_gss_cur_tot = None
 			self.nln_gss_cur_ion = None
 
@@ -521,6 +624,10 @@ class core( QObject ) :
 			self.nln_res_plas = plas( enforce=False )
 
 			self.nln_res_sel = None
+			self.nln_res_prm = array( [ ] )
+
+			self.nln_res_nfev = 0
+			self.nln_res_njev = 0
 
 			self.nln_res_cur_tot = None
 			self.nln_res_cur_ion = None
@@ -550,7 +657,7 @@ class core( QObject ) :
 
 	def load_spec( self, time_req=None,
 	               get_prev=False, get_next=False,
-	               tmin=None, tmax=None            ) :
+	               tmin=None, tmax=None, spec_iter=None ) :
 
 
 		# Reset the variables that contain the Wind/FC ion spectrum's
@@ -561,7 +668,7 @@ class core( QObject ) :
 		#        "True" so as to retain the general settings (even
 		#        though a new spectrum is being loaded).
 
-		self.emit( SIGNAL('janus_rset') )
+		self.emit( 'janus_rset' )
 
 		self.rset_var( var_swe=True, var_mfi=True,
 		               var_mom_sel=True, var_mom_res=True,
@@ -573,15 +680,15 @@ class core( QObject ) :
 
 		if ( str( time_req ).lower( ) == 'iddqd' ) :
 
-			self.emit( SIGNAL('janus_chng_spc') )
+			self.emit( 'janus_chng_spc' )
 
 			if ( self.debug ) :
 				self.debug = False
-				self.emit( SIGNAL('janus_mesg'),
+				self.emit( 'janus_mesg',
 				           'core', 'end', 'debug' )
 			else :
 				self.debug = True
-				self.emit( SIGNAL('janus_mesg'),
+				self.emit( 'janus_mesg',
 				           'core', 'begin', 'debug' )
 
 			return
@@ -620,15 +727,15 @@ class core( QObject ) :
 
 				self.dsp = 'gsl'
 
-			self.emit( SIGNAL('janus_chng_dyn') )
-			self.emit( SIGNAL('janus_chng_dsp') )
+			self.emit( 'janus_chng_dyn' )
+			self.emit( 'janus_chng_dsp' )
 
 
 		# If no valid time was requested, alert the user and abort.
 
 		if ( not self.time_vld ) :
 
-			self.emit( SIGNAL('janus_mesg'),
+			self.emit( 'janus_mesg',
 			           'core', 'fail', 'time' )
 
 			return
@@ -637,32 +744,42 @@ class core( QObject ) :
 		# Message the user that a new Wind/FC ion spectrum is about to
 		# be loaded.
 
-		self.emit( SIGNAL('janus_mesg'), 'core', 'begin', 'fc' )
+		self.emit( 'janus_mesg', 'core', 'begin', 'fc' )
 
 
 		# Load the Wind/FC ion spectrum with a timestamp closest to that
-		# requested.
+		# requested.  However, if an iterator over spectra (see
+		# "fc_arcv.iter_spec") has been provided, instead take its next
+		# spectrum.
 
-		spec = self.fc_arcv.load_spec( self.time_txt,
-		                               get_prev=get_prev,
-		                               get_next=get_next,
-		                               tmin=tmin, tmax=tmax )
+		if ( spec_iter is None ) :
+			spec = self.fc_arcv.load_spec( self.time_txt,
+			                               get_prev=get_prev,
+			                               get_next=get_next,
+			                               tmin=tmin, tmax=tmax )
+		else :
+			spec = next( spec_iter, None )
 
 
 		# If no spectrum was found, abort.
 
 		if ( spec is None ) :
 
-			self.emit( SIGNAL('janus_chng_spc') )
+			self.emit( 'janus_chng_spc' )
 
 			return
 
 
 		# Extract the parameters of the loaded Wind/FC ion spectrum.
 
+		# Note.  The archive has already converted the spectrum's bins
+		#        from voltages to velocities and counted its valid bins
+		#        (see "janus_fc_prep").
+
 		( time_epc,
 		  cup1_azm  , cup2_azm  , cup1_c_vol, cup2_c_vol,
-		  cup1_d_vol, cup2_d_vol, cup1_cur  , cup2_cur    ) = spec
+		  cup1_d_vol, cup2_d_vol, cup1_cur  , cup2_cur  ,
+		  vel_cen   , vel_wid   , n_vel                   ) = spec
 
 
 		# Calculate and store the spectrum's properly formatted
@@ -674,65 +791,28 @@ class core( QObject ) :
 		self.time_vld = True
 
 
-		# Convert bin centers and widths from voltages [V] to velocities
-		# [km/s].
-
-		cup1_vol_a = cup1_c_vol - ( cup1_d_vol / 2. )
-		cup1_vol_b = cup1_c_vol + ( cup1_d_vol / 2. )
-
-		cup2_vol_a = cup2_c_vol - ( cup2_d_vol / 2. )
-		cup2_vol_b = cup2_c_vol + ( cup2_d_vol / 2. )
+		# Request that the archives prefetch (in the background) the
+		# data from the date adjacent to this spectrum in the direction
+		# of travel (i.e., the previous date if the previous spectrum
+		# was requested and the next date otherwise).
 
-		cup1_c_vel = 1E-3 * sqrt( 2 * const['q_p'] * cup1_c_vol /
-		                          const['m_p']                    )
-		cup1_vel_a = 1E-3 * sqrt( 2 * const['q_p'] * cup1_vol_a /
-		                          const['m_p']                    )
-		cup1_vel_b = 1E-3 * sqrt( 2 * const['q_p'] * cup1_vol_b /
-		                          const['m_p']                    )
-
-		cup2_c_vel = 1E-3 * sqrt( 2 * const['q_p'] * cup2_c_vol /
-		                          const['m_p']                    )
-		cup2_vel_a = 1E-3 * sqrt( 2 * const['q_p'] * cup2_vol_a /
-		                          const['m_p']                    )
-		cup2_vel_b = 1E-3 * sqrt( 2 * const['q_p'] * cup2_vol_b /
-		                          const['m_p']                    )
-
-		cup1_d_vel = cup1_vel_b - cup1_vel_a
-		cup2_d_vel = cup2_vel_b - cup2_vel_a
-
-
-		# Determine the number of valid speed windows by searching
-		# through the "c_vel_?" arrays and indentifying the first time
-		# that an element is immediately followed by an element with a
-		# smaller value.
-
-		# Note.  The velocity windows should be assending order, and
-		#        unused windows sould occur at the end of the "?_vel_?"
-		#        and be indicated by having their corresponding elements
-		#        in these arrays set to the instrument's minimum value
-		#        for that parameter.
-
-		n_vel = 1
+		if ( get_prev ) :
+			time_pref = self.time_val - 86400.
+		else :
+			time_pref = self.time_val + 86400.
 
-		while ( ( n_vel < len( cup1_c_vel ) ) and
-		        ( n_vel < len( cup2_c_vel ) )     ) :
+		date_pref = calc_time_str( time_pref )[0:10]
 
-			if ( ( cup1_c_vel[n_vel] < cup1_c_vel[n_vel-1] ) or
-			     ( cup2_c_vel[n_vel] < cup2_c_vel[n_vel-1] )    ) :
-				break
-			else :
-				n_vel += 1
+		self.fc_arcv.pref_date(  date_pref, self.time_val )
+		self.mfi_arcv.pref_date( date_pref, self.time_val )
 
 
 		# Truncate the arrays to remove fill data.
 
-		cup1_c_vel = cup1_c_vel[0:n_vel]
-		cup1_d_vel = cup1_d_vel[0:n_vel]
-		cup1_cur   = cup1_cur[:,0:n_vel]
-
-		cup2_c_vel = cup2_c_vel[0:n_vel]
-		cup2_d_vel = cup2_d_vel[0:n_vel]
-		cup2_cur   = cup2_cur[:,0:n_vel]
+		vel_cen  = vel_cen[0:n_vel]
+		vel_wid  = vel_wid[0:n_vel]
+		cup1_cur = cup1_cur[:,0:n_vel]
+		cup2_cur = cup2_cur[:,0:n_vel]
 
 
 		# Merge and store the arrays from the two cups.  As part of this
@@ -745,8 +825,8 @@ class core( QObject ) :
 
 		self.alt     = array( [ 15., -15. ] )           # deg
 		self.azm     = array( [ cup1_azm, cup2_azm ] )  # deg
-		self.vel_cen = cup1_c_vel                       # km/s
-		self.vel_wid = cup1_d_vel                       # km/s
+		self.vel_cen = vel_cen                          # km/s
+		self.vel_wid = vel_wid                          # km/s
 		self.cur     = array( [ cup1_cur, cup2_cur ] )  # pA
 
 
@@ -760,45 +840,8 @@ class core( QObject ) :
 		# Examine each measured current value and determine whether or
 		# not it's valid for use in the proceding analyses.
 
-		self.cur_vld = tile( True,
-		                     [ self.n_alt, self.n_azm, self.n_vel ] )
-
-		for t in range( self.n_alt ) :
-
-			if ( n_vel < 2 ) :
-				continue
-
-			for p in range( self.n_azm ) :
-
-				for v in range( self.n_vel ) :
-
-					if ( self.cur[t,p,v] < self.cur_min ) :
-						self.cur_vld[t,p,v] = False
-						continue
-
-					if ( v == 0 ) :
-						if ( self.cur[t,p,v] >
-						     ( self.cur_jmp *
-						       self.cur[t,p,v+1] ) ) :
-							self.cur_vld[t,p,v] = \
-							                   False
-							continue
-
-					if ( v == ( self.n_vel - 1 ) ) :
-						if ( self.cur[t,p,v] >
-						     ( self.cur_jmp *
-						       self.cur[t,p,v-1] ) ) :
-							self.cur_vld[t,p,v] = \
-							                   False
-							continue
-
-					if ( ( self.cur[t,p,v] >
-					       ( self.cur_jmp *
-					         self.cur[t,p,v-1] ) ) and
-					     ( self.cur[t,p,v] >
-					       ( self.cur_jmp *
-					         self.cur[t,p,v+1] ) )     ) :
-						self.cur_vld[t,p,v] = False
+		self.cur_vld = calc_cur_vld( self.cur, self.n_vel,
+		                             self.cur_min, self.cur_jmp )
 
 
 		# Estimate the duration of each spectrum and the mean time
@@ -814,13 +857,13 @@ class core( QObject ) :
 		# Message the user that a new Wind/FC ion spectrum has been
 		# loaded.
 
-		self.emit( SIGNAL('janus_mesg'), 'core', 'end', 'fc' )
+		self.emit( 'janus_mesg', 'core', 'end', 'fc' )
 
 
 		# Emit a signal that indicates that a new Wind/FC ion spectrum
 		# has now been loaded.
 
-		self.emit( SIGNAL('janus_chng_spc') )
+		self.emit( 'janus_chng_spc' )
 
 
 		# Load the associated Wind/MFI magnetic field data associated
@@ -894,7 +937,7 @@ class core( QObject ) :
 		# Message the user that new Wind/MFI data are about to be
 		# loaded.
 
-		self.emit( SIGNAL('janus_mesg'), 'core', 'begin', 'mfi' )
+		self.emit( 'janus_mesg', 'core', 'begin', 'mfi' )
 
 
 		# Load the Wind/MFI magnetic field data associated with this
@@ -914,34 +957,37 @@ class core( QObject ) :
 
 		if ( self.n_mfi == 0 ) :
 
-			self.emit( SIGNAL('janus_chng_mfi') )
+			self.emit( 'janus_chng_mfi' )
 
 			return
 
 
+		# Update the preparation of the Wind/MFI data (which processes
+		# only those data not shared with the previous spectrum; see
+		# "janus_mfi_prep").
+
+		self.mfi_prep.updt( mfi_t, mfi_b_x, mfi_b_y, mfi_b_z )
+
+
 		# Store the loaded data.  As part of this step, shift the data's
 		# timestamps to be relative to the start time of this Wind/FC
 		# ion spectrum.
 
-		self.mfi_t = array( [ ( t - self.time_epc ).total_seconds( )
-		                      for t in mfi_t                         ] )
+		self.mfi_t = mfi_t - self.time_val
 
 		self.mfi_b_x   = mfi_b_x
 		self.mfi_b_y   = mfi_b_y
 		self.mfi_b_z   = mfi_b_z
                 self.mfi_b_vec = [ self.mfi_b_x, self.mfi_b_y, self.mfi_b_z ]
 
-		# Compute the magnetic field magnitude.
+		# Store the magnetic field magnitude.
 
-		self.mfi_b = sqrt( self.mfi_b_x**2 + self.mfi_b_y**2
-		                                   + self.mfi_b_z**2 )
+		self.mfi_b = self.mfi_prep.b
 
 
-		# Compute the average magetic field.
+		# Compute the average magetic field (from the running sums).
 
-		self.mfi_avg_vec = array( [ mean( self.mfi_b_x ),
-		                            mean( self.mfi_b_y ),
-		                            mean( self.mfi_b_z ) ] )
+		self.mfi_avg_vec = self.mfi_prep.calc_avg_vec( )
 
 		self.mfi_avg_mag = sqrt( self.mfi_avg_vec[0]**2 +
 		                         self.mfi_avg_vec[1]**2 +
@@ -951,46 +997,53 @@ class core( QObject ) :
 
 
 		# Compute the dot product between the average, normalized
-		# magnetic field and each look direction.
-
-		self.mfi_hat_dir = array( [ [
-		          dot( self.calc_dir_look( self.alt[t], self.azm[t,p] ),
-		               self.mfi_avg_nrm )
-		          for p in range( self.n_azm ) ]
-		        for t in range( self.n_alt ) ] )
+		# magnetic field and each look direction (as a single product
+		# of the array of look directions with that vector).
 
-		# Compute the mfi angles.
+		self.mfi_hat_dir = dot( self.calc_dir_look(
+		                            self.alt[:,newaxis], self.azm ),
+		                        self.mfi_avg_nrm                     )
 
-		mfi_b_rho   = sqrt( mfi_b_x**2.0 + mfi_b_y**2.0 )
-		mfi_b_colat = arctan2( mfi_b_z, mfi_b_rho       )
-		mfi_b_lon   = arctan2( mfi_b_y, mfi_b_x         )
-		mfi_b_colat = rad2deg( mfi_b_colat              )
-		mfi_b_lon   = rad2deg( mfi_b_lon                )
+		# Store the mfi angles.
 
-		self.mfi_b_colat = mfi_b_colat
-		self.mfi_b_lon   = mfi_b_lon
+		self.mfi_b_colat = self.mfi_prep.colat
+		self.mfi_b_lon   = self.mfi_prep.lon
 
-		self.mfi_avg_mag_angles = array( [mean( self.mfi_b_colat ),
-		                                  mean( self.mfi_b_lon )] )
+		self.mfi_avg_mag_angles = self.mfi_prep.calc_avg_ang( )
 
 
 		# Use interpolation to estimate a magnetic-field vector for each
 		# velocity bin.
 
-		var_t = self.mag_t
+		# Note.  Any velocity bin beyond the range of the data takes the
+		#        value of the nearest datum.
+
+		self.mag_x = interp( self.mag_t, self.mfi_t, self.mfi_b_x )
+		self.mag_y = interp( self.mag_t, self.mfi_t, self.mfi_b_y )
+		self.mag_z = interp( self.mag_t, self.mfi_t, self.mfi_b_z )
+
+		# If the high-resolution ("h2") magnetic field data are being
+		# used, instead average the data within each velocity step
+		# (retaining the interpolated vector for any step without data).
 
-		tk_lo = where( var_t < amin( self.mfi_t ) )
-		tk_hi = where( var_t > amax( self.mfi_t ) )
+		if ( self.mfi_arcv.use_h2 ) :
 
-		var_t[tk_lo] = amin( self.mfi_t )
-		var_t[tk_hi] = amax( self.mfi_t )
+			stp = floor( self.mfi_t / self.rot_sec ).astype( int )
 
-		self.mag_x = interp1d( self.mfi_t, self.mfi_b_x,
-		                       bounds_error=False        )( var_t )
-		self.mag_y = interp1d( self.mfi_t, self.mfi_b_y,
-		                       bounds_error=False        )( var_t )
-		self.mag_z = interp1d( self.mfi_t, self.mfi_b_z,
-		                       bounds_error=False        )( var_t )
+			tk = where( ( stp >= 0 ) & ( stp < self.n_vel ) )[0]
+
+			n_stp = bincount( stp[tk], minlength=self.n_vel )
+
+			tk_stp = where( n_stp > 0 )[0]
+
+			for ( mag, b ) in [ ( self.mag_x, self.mfi_b_x ),
+			                    ( self.mag_y, self.mfi_b_y ),
+			                    ( self.mag_z, self.mfi_b_z )  ] :
+
+				sum_stp = bincount( stp[tk], weights=b[tk],
+				                    minlength=self.n_vel    )
+
+				mag[tk_stp] = sum_stp[tk_stp] / n_stp[tk_stp]
 
 		# Calculating the average angular deviation of magnetic field
 
@@ -1002,13 +1055,13 @@ class core( QObject ) :
 
 		# Message the user that new Wind/MFI data have been loaded.
 
-		self.emit( SIGNAL('janus_mesg'), 'core', 'end', 'mfi' )
+		self.emit( 'janus_mesg', 'core', 'end', 'mfi' )
 
 
 		# Emit a signal that indicates that a new Wind/MFI data have now
 		# been loaded.
 
-		self.emit( SIGNAL('janus_chng_mfi') )
+		self.emit( 'janus_chng_mfi' )
 
 
 	#-----------------------------------------------------------------------
@@ -1103,24 +1156,11 @@ class core( QObject ) :
 	def calc_dir_look( self, alt, azm ) :
 
 
-		# Convert altitude and azimuth the spherical coordinates.
-
-		the = - alt + 90.
-		phi = - azm
-
-
-		# Convert from spherical to rectangular coordinates and return
-		# the result.
+		# Note.  The conversion itself is carried out (for either
+		#        scalar or array arguments) by the response kernel in
+		#        "janus_fc_rsp".
 
-		ret = array( [
-		        sin( deg2rad( the ) ) * cos( deg2rad( phi ) ),
-		        sin( deg2rad( the ) ) * sin( deg2rad( phi ) ),
-		        cos( deg2rad( the ) )                          ] )
-
-		if ( ret.ndim > 1 ) :
-			return transpose( ret )
-		else :
-			return ret
+		return rsp_dir_look( alt, azm )
 
 
 	#-----------------------------------------------------------------------
@@ -1140,30 +1180,11 @@ class core( QObject ) :
 		#        square centimeters.
 
 
-		# Normalize the look direction and particle velocity.
-
-		dn = self.calc_arr_nrm( d )
-		vn = self.calc_arr_nrm( v )
-
-
-		# Calculate the particle inflow angle (in degrees) relative to
-		# the cup normal (i.e., the cup pointing direction).
-
-		psi = rad2deg( arccos( self.calc_arr_dot( dn, -vn ) ) )
-		psi = self.calc_arr_clp( psi, 0., 90. )
-
-
-		# Return the effective collecting area corresponding to "psi".
+		# Return the effective collecting area (for each pair of
+		# vectors if "d" and "v" are arrays of vectors).
 
-		if hasattr( psi, '__iter__' ) :
-
-			return array( [
-			            interp( p, self.eff_deg, self.eff_area )
-			            for p in psi                             ] )
-
-		else :
-
-			return interp( psi, self.eff_deg, self.eff_area )
+		return rsp_eff_area( array( d, dtype=float ),
+		                     array( v, dtype=float )  )
 
 
 	#-----------------------------------------------------------------------
@@ -1173,17 +1194,18 @@ class core( QObject ) :
 	def calc_cur_max( self,
 	                  vel_cen, vel_wid,
 	                  dir_alt, dir_azm,
-	                  prm_n, prm_v_x, prm_v_y, prm_v_z, prm_w ) :
+	                  prm_n, prm_v_x, prm_v_y, prm_v_z, prm_w,
+	                  tab=None                                 ) :
 
 
 		# Return the equivalent bi-Maxwellian response for equal
 		# perpendicular and parallel thermal speeds and a dummy
 		# magnetic field.
 
-		return self.calc_cur_bmx( vel_cen, vel_wid,
-		                          dir_alt, dir_azm, 1., 0., 0.,
-		                          prm_n, prm_v_x, prm_v_y, prm_v_z,
-		                          prm_w, prm_w                      )
+		return rsp_cur_max( vel_cen, vel_wid,
+		                    dir_alt, dir_azm,
+		                    prm_n, prm_v_x, prm_v_y, prm_v_z, prm_w,
+		                    tab=tab                                  )
 
 
 	#-----------------------------------------------------------------------
@@ -1195,7 +1217,7 @@ class core( QObject ) :
 	                  dir_alt, dir_azm,
 	                  mag_x, mag_y, mag_z,
 	                  prm_n, prm_v_x, prm_v_y, prm_v_z,
-	                  prm_w_per, prm_w_par              ) :
+	                  prm_w_per, prm_w_par, tab=None    ) :
 
 
 		# Note.  This function is based on Equation 2.34 from Maruca
@@ -1204,84 +1226,17 @@ class core( QObject ) :
 		#        automatically calibrated out of the Wind/FC data).
 
 
-		# Calcualte the vector bulk velocity.
-
-		prm_v = array( [ prm_v_x, prm_v_y, prm_v_z ] )
-
-		if ( prm_v.ndim > 1 ) :
-			prm_v = transpose( prm_v )
-
-
-		# Calculate the look direction as a cartesian unit vector.
+		# Calculate and return the expected current.  All arguments are
+		# broadcast against one another, so that a single call computes
+		# the current for every look direction and velocity window of a
+		# spectrum (see "janus_fc_rsp").  If a table "tab" is given,
+		# the current is approximated with it (see "rsp_tab").
 
-		dlk = self.calc_dir_look( dir_alt, dir_azm )
-
-
-		# Calculate the direction of the magnetic field as a cartesian
-		# unit vector.
-
-		mag = array( [ mag_x, mag_y, mag_z ] )
-
-		if ( mag.ndim > 1 ) :
-			mag = transpose( mag )
-
-		dmg = self.calc_arr_nrm( mag )
-
-
-		# Calculate the component of the magnetic field unit vector
-		# along that lies along the look direction.
-
-		dmg_dlk = self.calc_arr_dot( dmg, dlk )
-
-
-		# Compute the effective thermal speed along this look direction.
-
-
-		prm_w = sqrt( ( ( 1. - dmg_dlk**2 ) * prm_w_per**2 ) +
-		              (        dmg_dlk**2   * prm_w_par**2 )   )
-
-
-		# Calcuate the exponential terms of the current.
-
-		ret_exp_1 = 1.e3 * prm_w * sqrt( 2. / pi ) * exp(
-		            - ( ( vel_cen - ( vel_wid / 2. )
-		            - self.calc_arr_dot( dlk, -prm_v ) )
-		            / prm_w )**2 / 2. )
-		ret_exp_2 = 1.e3 * prm_w * sqrt( 2. / pi ) * exp(
-		            - ( ( vel_cen + ( vel_wid / 2. )
-		            - self.calc_arr_dot( dlk, -prm_v ) )
-		            / prm_w )**2 / 2. )
-
-
-		# Calculate the "erf" terms.
-
-		ret_erf_1 = 1.e3 * self.calc_arr_dot( dlk, -prm_v ) * erf(
-		            ( vel_cen - ( vel_wid / 2. )
-		            - self.calc_arr_dot( dlk, -prm_v ) )
-		            / ( sqrt(2.) * prm_w ) )
-		ret_erf_2 = 1.e3 * self.calc_arr_dot( dlk, -prm_v ) * erf(
-		            ( vel_cen + ( vel_wid / 2. )
-		            - self.calc_arr_dot( dlk, -prm_v ) )
-		            / ( sqrt(2.) * prm_w ) )
-
-
-		# Calculate the parenthetical expression.
-
-		ret_prn = ( ( ret_exp_2 + ret_erf_2 ) -
-		            ( ret_exp_1 + ret_erf_1 )   )
-
-
-		# Calculate the expected current.
-
-		ret = ( ( 1.e12 ) * ( 1. / 2. ) * ( const['q_p'] )
-		        * ( 1.e6 * prm_n )
-		        * ( 1.e-4 * self.calc_eff_area( dlk, prm_v ) )
-		        * ( ret_prn ) )
-
-
-		# Return the calculated value for the expected current.
-
-		return ret
+		return rsp_cur_bmx( vel_cen, vel_wid,
+		                    dir_alt, dir_azm,
+		                    mag_x, mag_y, mag_z,
+		                    prm_n, prm_v_x, prm_v_y, prm_v_z,
+		                    prm_w_per, prm_w_par, tab=tab     )
 
 
 	#-----------------------------------------------------------------------
@@ -1381,7 +1336,7 @@ class core( QObject ) :
 		# Emit a signal that indicates that the selection status of all
 		# data for the moments analysis has changed.
 
-		self.emit( SIGNAL('janus_chng_mom_sel_all') )
+		self.emit( 'janus_chng_mom_sel_all' )
 
 
 		# Validate the new data selection (i.e., make sure that the two
@@ -1417,68 +1372,20 @@ class core( QObject ) :
 		#           "self.vldt_mom_sel( )".
 
 
-		# Initially, deselect all look directions.
-
-		self.mom_sel_azm = tile( False, [ self.n_alt, self.n_azm ] )
-
-		self.mom_n_sel_azm = 0
-
-
-		# Initialize the "max_cur" and "mm_cur" arrays.
+		# Select, in each cup, the running, circular window of
+		# "self.mom_win_azm" look directions with the largest sum of
+		# the maximum (valid) currents.
 
-		# Note.  The former will be populated with the maximum current
-		#        seen in each velocity window.  The latter (the min-max
-		#        array) will be populated with the minimum value over a
-		#        running, circular "p"-window of "self.mom_win_azm"
-		#        elements from the "max_cur" array.
+		# Note.  The selection is carried out (for all look directions
+		#        at once) by "calc_sel_azm" (see "janus_mom_sel").
 
-		max_cur = zeros( [ self.n_alt, self.n_azm ] )
-		mm_cur  = zeros( [ self.n_alt, self.n_azm ] )
-
-
-		# Populate the "max_cur" array.
-
-		for t in range( self.n_alt ) :
-
-			for p in range( self.n_azm ) :
-
-				tk = where( self.cur_vld[t,p,:] )[0]
-
-				if ( len( tk ) > 0 ) :
-					max_cur[t,p] = max( self.cur[t,p,tk] )
-				else :
-					max_cur[t,p] = 0.
-
-
-		# Populate the "mm_cur" array.
-
-		for t in range( self.n_alt ) :
-
-			for p in range( self.n_azm ) :
-
-				for w in range( self.mom_win_azm ) :
-
-					mm_cur[t,p] += \
-					             max_cur[t,(p+w)%self.n_azm]
-
-
-		# Find the location of the maximum value of each row of the
-		# "mm_cur" array and use this location to update the
-		# corresponding row of "self.mom_sel_azm".
-
-		for t in range( self.n_alt ) :
-
-			p0 = where( mm_cur[t,:] ==
-			                 amax( mm_cur[t,:] ) )[0][0]
-
-			for p in range( p0, p0+self.mom_win_azm ) :
-
-				self.mom_sel_azm[t,p%self.n_azm] = True
+		self.mom_sel_azm = calc_sel_azm( self.cur, self.cur_vld,
+		                                 self.mom_win_azm        )
 
 
 		# Record the number of selected look directions.
 
-		self.mom_n_sel_azm = len( where( self.mom_sel_azm )[0] )
+		self.mom_n_sel_azm = int( sum( self.mom_sel_azm ) )
 
 
 	#-----------------------------------------------------------------------
@@ -1507,63 +1414,21 @@ class core( QObject ) :
 		#           immediately prior a call of this function.
 
 
-		# Initially, de-select all data.
-
-		self.mom_sel_cur = tile( False, [ self.n_alt, self.n_azm,
-		                                  self.n_vel              ] )
-
-		self.mom_n_sel_cur = tile( 0, [ self.n_alt, self.n_azm ] )
-
-
-		# Loop through all look directions.  For each that has been
-		# selected, select a portion of the data therefrom.
-
-		v_rng = arange( self.n_vel )
-
-		for t in range( self.n_alt ) :
-
-			for p in range( self.n_azm ) :
-
-				# If the current look direction was not
-				# selected, move on to the next one as clearly
-				# no data should be selected from this one.
-
-				if ( not self.mom_sel_azm[t,p] ) :
-					continue
-
-				# Consider all spans of "self.mom_win_cur"
-				# indices and select the data from the one with
-				# the highest total current.
-
-				v_0   = 0
-				cur_0 = 0.
-
-				for v in range( self.n_vel - self.mom_win_cur) :
-
-					tk = where( ( v_rng >= v           ) &
-					            ( v_rng < ( v +
-					                self.mom_win_cur ) ) &
-					            ( self.cur_vld[t,p,:]  )   )
-
-					if ( len( tk ) > 0 ) :
-						cur_v = sum( self.cur[t,p,tk] )
-					else :
-						cur_v = 0.
+		# For each selected look direction, select the data from the
+		# span of "self.mom_win_cur" velocity windows with the highest
+		# total current.
 
-					if ( cur_v > cur_0 ) :
-						v_0   = v
-						cur_0 = cur_v
+		# Note.  The selection is carried out (for all look directions
+		#        at once) by "calc_sel_cur" (see "janus_mom_sel").
 
-				self.mom_sel_cur[
-				          t,p,v_0:(v_0+self.mom_win_cur)] = True
+		self.mom_sel_cur = calc_sel_cur( self.cur, self.cur_vld,
+		                                 self.mom_sel_azm, self.n_vel,
+		                                 self.mom_win_cur              )
 
 
 		# Record the number of data selected in each look direction.
 
-		self.mom_n_sel_cur = array( [ [
-		                len( where( self.mom_sel_cur[t,p,:] )[0] )
-		                              for p in range( self.n_azm ) ]
-		                                for t in range( self.n_alt ) ] )
+		self.mom_n_sel_cur = sum( self.mom_sel_cur, axis=2 )
 
 
 	#-----------------------------------------------------------------------
@@ -1581,7 +1446,7 @@ class core( QObject ) :
 		# Emit a signal that indicates that the datum's selection status
 		# for the moments analysis has changed.
 
-		self.emit( SIGNAL('janus_chng_mom_sel_cur'), t, p, v )
+		self.emit( 'janus_chng_mom_sel_cur', t, p, v )
 
 
 		# Validate the new data selection (i.e., make sure that the two
@@ -1675,7 +1540,7 @@ class core( QObject ) :
 
 		for k in range( n_tk ) :
 
-			self.emit( SIGNAL('janus_chng_mom_sel_azm'),
+			self.emit( 'janus_chng_mom_sel_azm',
 			           tk_t[k], tk_p[k]                  )
 
 
@@ -1713,17 +1578,17 @@ class core( QObject ) :
 		     ( self.n_vel == 0                           ) or
 		     ( self.mom_n_sel_azm < self.mom_min_sel_azm )    ) :
 
-			self.emit( SIGNAL('janus_mesg'),
+			self.emit( 'janus_mesg',
 			           'core', 'norun', 'mom' )
 
-			self.emit( SIGNAL('janus_chng_mom_res') )
+			self.emit( 'janus_chng_mom_res' )
 
 			return
 
 
 		# Message the user that the moments analysis has begun.
 
-		self.emit( SIGNAL('janus_mesg'), 'core', 'begin', 'mom' )
+		self.emit( 'janus_mesg', 'core', 'begin', 'mom' )
 
 
 		# Extract the "t"- and "p"-indices of each selected pointing
@@ -1731,255 +1596,62 @@ class core( QObject ) :
 
 		( tk_t, tk_p ) = where( self.mom_sel_azm )
 
-
-		# Initialize the "eta_*" arrays.
-
-		# Note.  Only some of these arrays will ultimate be saved.
-
-		# Note.  The arrays "eta_?" define the density, inflow speed,
-		#        thermal speed, and temperature derived for each of the
-		#        analyzed look directions.
-
 		n_eta = self.mom_n_sel_azm
 
-		eta_phi = tile( 0., n_eta )
-		eta_the = tile( 0., n_eta )
-
-		eta_dlk = tile( 0., [ n_eta, 3 ] )  # Cartesian look direction
-
-		eta_eca = tile( 0., n_eta )         # effective collecting area
-
-		eta_n   = tile( 0., n_eta )         # number density
-		eta_v   = tile( 0., n_eta )         # inflow speed
-		eta_w   = tile( 0., n_eta )         # thermal speed
-		eta_t   = tile( 0., n_eta )         # temperature
-
-
-		# For each of the selected look directions, identify the
-		# selected data therefrom and calculate the estimator of the
-		# projected inflow speed along that direction.
-
-		# Note.  Equations 3.11, 3.13, and 3.15 of my dissertation
-		#        (Maruca, PhD thesis, 2012) contain an extra factor of
-		#        $2$ that is omitted below in the calculation of the
-		#        estimators.  This factor reflects the half-efficiency
-		#        that is inherent to the use of demodulation and has
-		#        already been taken into account in the calibration of
-		#        the current measurments.
-
-		for k in range( n_eta ) :
-
-			# Extract the "t"- and "p"-values for this direction.
-
-			t = tk_t[k]
-			p = tk_p[k]
-
-			# Store the $\theta$- and $\phi$-values for this look
-			# direction.
-
-			eta_the[k] = - self.alt[t] + 90.
-			eta_phi[k] = - self.azm[t,p]
-
-			# Convert the look direction from altitude-azimuth to a
-			# Cartesian unit vector.
-
-			eta_dlk[k,:] = self.calc_dir_look( self.alt[t],
-			                                   self.azm[t,p] )
-
-			# Extract the "v" values of the selected data from this
-			# look direction.
-
-			v = where( self.mom_sel_cur[t,p,:] )[0]
-
-			eta_v[k] = - sum( self.cur[t,p,v] ) / \
-			                sum( self.cur[t,p,v] / self.vel_cen[v] )
-
-
-		# Use singular value decomposition (in the form of least squares
-		# analysis) to calculate the best-fit bulk speed for the solar
-		# wind.
-
-		mom_v_vec = lstsq( eta_dlk, eta_v )[0]
 
-		mom_v = sqrt( mom_v_vec[0]**2 + mom_v_vec[1]**2
-		                              + mom_v_vec[2]**2 )
-
-
-		# For each of the selected look directions, use the derived
-		# value of "mom_v_vec" to estimate its effective collecting
-		# area, the number density, and the thermal speed.
-
-		for k in range( n_eta ) :
-
-			# Extract the "t"- and "p"-values for this direction.
-
-			t = tk_t[k]
-			p = tk_p[k]
-
-			# Calculate the effective collecting area for this look
-			# direction.
-
-			eta_eca[k] = self.calc_eff_area( eta_dlk[k,:],
-			                                 mom_v_vec     )
-
-			# Extract the "v" indices of the selected data from this
-			# look direction.
-
-			v = where( self.mom_sel_cur[t,p,:] )[0]
-
-			# Estimate the number density and thermal speed based on
-			# the selected data from this look direction.
-
-			eta_n[k] = 1e-6 * ( ( 1. / const['q_p'] )
-			           / ( 1.e-4 * eta_eca[k] )
-			           * sum( ( 1.e-12 * self.cur[t,p,v] ) /
-			                  ( 1.e3 * self.vel_cen[v]   )   ) )
-
-			eta_w[k] = 1e-3 * sqrt( max( [ 0.,
-			           ( ( 1. / const['q_p'] )
-			           / ( 1.e-4 * eta_eca[k] )
-			           / ( 1.e6 * eta_n[k] )
-			           * sum( ( 1.e-12 * self.cur[t,p,v] ) *
-			                  ( 1.e3 * self.vel_cen[v]   )   ) )
-			           - ( 1e3 * eta_v[k] )**2               ] ) )
-
-
-		# Compute the effective temperature for each of the analyzed
-		# look directions.
-
-		eta_t = ( 1.E-3 / const['k_b'] ) * \
-		        const['m_p'] * ( ( 1.E3 * eta_w )**2 )
-
-
-		# Calculate a net estimator of the number density.
-
-		# Note.  The total signal for a look direction is roughly
-		#        proportional to its effective collecting area.  Thus,
-		#        the reciprical of the effective collecting area can be
-		#        thought of a crude indicator of the uncertainty in the
-		#        number-density estimators from the corresponding look
-		#        direction.
-
-		mom_n = average( eta_n, weights=eta_eca**2 )
-
-
-		# Initialize the temporary variable the indicates whether or not
-		# the temperature anisotropy analysis has been successfully
-		# performed.  If there are some magnetic field data, at least
-		# attempt the analysis.  Otherewise, skip it.
+		# Carry out the moments analysis on this spectrum as a stack of
+		# one (see "janus_mom_bat").  If there are no magnetic field
+		# data, the anisotropy analysis is not attempted (and a dummy
+		# field direction is provided).
 
 		if ( self.n_mfi > 0 ) :
-			aniso = True
+			mfi_nrm = self.mfi_avg_nrm
 		else :
-			aniso = False
-
-
-		# If indicated, attempt to compute the components of thermal
-		# speed and temperature.  If this fails (or could not be
-		# attempted because of a lack of magnetic field data), simply
-		# compute the scalar values.
-
-		if ( aniso ) :
-
-			# Construct the "data" arrays that will be used to
-			# determine the components of the thermal speed.
-
-			# Note.  Assuming a bi-Maxwellian distribution, the
-			#        square of a look direction's thermal speed
-			#        should be a linear function of the square of
-			#        the dot product between the look direction and
-			#        the direction of the magnetic field.  See
-			#        Equation 2.32 by Maruca (PhD thesis, 2012).
-
-			dat_x = array( [ self.mfi_hat_dir[tk_t[k],tk_p[k]]
-			                 for k in range( n_eta )          ] )**2
-
-			dat_y = eta_w**2
-
-			# If the "x" data array has insufficient coverage for a
-			# reliable linear fit, abort the anisotropy analysis.
-
-			if ( amax( dat_x ) == amin( dat_x ) ) :
-				aniso = False
-
-		if ( aniso ) :
-
-			# Perform the linear fit.
+			mfi_nrm = array( [ 1., 0., 0. ] )
 
-			( f_slope, f_icept ) = polyfit( dat_x, dat_y, 1 )
+		mom = calc_bat_mom( self.alt,
+		                    array( [ self.azm         ] ),
+		                    array( [ self.vel_cen     ] ),
+		                    array( [ self.vel_wid     ] ),
+		                    array( [ self.cur         ] ),
+		                    array( [ self.mom_sel_azm ] ),
+		                    array( [ self.mom_sel_cur ] ),
+		                    array( [ mfi_nrm          ] ),
+		                    array( [ self.n_mfi > 0   ] )  )
 
-			# If the returned fit parameters are non-physical, abort
-			# the anisotropy analysis.
 
-			if ( (   f_icept             <= 0 ) or
-			     ( ( f_icept + f_slope ) <= 0 )    ) :
-				aniso = False
+		# Extract the results for this spectrum.  The "eta_*" arrays
+		# are extracted for the selected look directions only.
 
-		if ( aniso ) :
+		mom_n = mom['n'][0]
+		mom_v = mom['v'][0]
+		mom_w = mom['w'][0]
+		mom_t = mom['t'][0]
 
-			# Use the values returned for the fit parameters to
-			# calculate the components of thermal speed and
-			# temperature.
+		mom_v_vec = mom['v_vec'][0]
 
-			mom_w_per = sqrt( f_icept )
-			mom_w_par = sqrt( f_icept + f_slope )
+		if ( mom['aniso'][0] ) :
 
-			mom_t_per = ( 1.E-3 / const['k_b'] ) * \
-			            const['m_p'] * ( 1.E6 * f_icept )
-			mom_t_par = ( 1.E-3 / const['k_b'] ) * \
-			            const['m_p'] * \
-			            ( 1.E6 * ( f_icept + f_slope ) )
-
-			# Compute the scalar thermal speed and temperature.
-
-			mom_w = sqrt( ( (2./3.) *   f_icept             ) +
-			              ( (1./3.) * ( f_icept + f_slope ) )   )
-			mom_t = ( (2./3.) * mom_t_per ) + \
-			        ( (1./3.) * mom_t_par )
-
-			# Compute the estimate temperature anisotropy ratio.
-
-			mom_r = mom_t_per / mom_t_par
+			mom_r     = mom['r'][0]
+			mom_w_per = mom['w_per'][0]
+			mom_w_par = mom['w_par'][0]
+			mom_t_per = mom['t_per'][0]
+			mom_t_par = mom['t_par'][0]
 
 		else :
 
-			mom_w = mean( eta_w )
-			mom_t = ( 1.E-3 / const['k_b'] ) * \
-			        const['m_p'] * ( 1.E3 * mom_w )**2
-
+			mom_r     = None
 			mom_w_per = None
 			mom_w_par = None
 			mom_t_per = None
 			mom_t_par = None
-			mom_r     = None
 
+		eta_n = mom['eta_n'][0][tk_t,tk_p]
+		eta_v = mom['eta_v'][0][tk_t,tk_p]
+		eta_w = mom['eta_w'][0][tk_t,tk_p]
+		eta_t = mom['eta_t'][0][tk_t,tk_p]
 
-		# Calculate the expected currents based on the results of the
-		# (linear) moments analysis.
-
-		mom_cur = tile( 0., [ self.n_alt, self.n_azm, self.n_vel ] )
-
-		if ( aniso ) :
-			for t in range( self.n_alt ) :
-				for p in range( self.n_azm ) :
-					mom_cur[t,p,:] = self.calc_cur_bmx(
-					           self.vel_cen, self.vel_wid,
-					           self.alt[t], self.azm[t,p],
-					           self.mfi_avg_nrm[0],
-					           self.mfi_avg_nrm[1],
-					           self.mfi_avg_nrm[2],
-					           mom_n, mom_v_vec[0],
-					           mom_v_vec[1], mom_v_vec[2],
-					           mom_w_per, mom_w_par        )
-		else :
-			for t in range( self.n_alt ) :
-				for p in range( self.n_azm ) :
-					mom_cur[t,p,:] = self.calc_cur_max(
-					           self.vel_cen, self.vel_wid,
-					           self.alt[t], self.azm[t,p],
-					           mom_n, mom_v_vec[0],
-					           mom_v_vec[1], mom_v_vec[2],
-					           mom_w                       )
+		mom_cur = mom['cur'][0]
 
 
 		# Save the "mom_?" and "mom_?_???" values and select "eta_*"
@@ -2013,13 +1685,13 @@ class core( QObject ) :
 
 		# Message the user that the moments analysis has completed.
 
-		self.emit( SIGNAL('janus_mesg'), 'core', 'end', 'mom' )
+		self.emit( 'janus_mesg', 'core', 'end', 'mom' )
 
 
 		# Emit a signal that indicates that the results of the moments
 		# analysis have changed.
 
-		self.emit( SIGNAL('janus_chng_mom_res') )
+		self.emit( 'janus_chng_mom_res' )
 
 
 		# Update the initial guess for the non-linear analysis if
@@ -2147,7 +1819,7 @@ class core( QObject ) :
 					self.nln_pyon.arr_pop[i]['name'] = None
 					self.nln_pyon.arr_pop[i]['sym']  = None
 
-					self.emit( SIGNAL('janus_chng_nln_pop'), i )
+					self.emit( 'janus_chng_nln_pop', i )
 
 				try :
 					self.nln_pyon.arr_pop[i]['spec'] = \
@@ -2207,7 +1879,7 @@ class core( QObject ) :
 		# Emit a signal that indicates that the ion parameters for the
 		# non-linear analysis have changed.
 
-		self.emit( SIGNAL('janus_chng_nln_ion') )
+		self.emit( 'janus_chng_nln_ion' )
 
 		# If dynamic updating of the initial guess has been enabled, run
 		# the automated guess-generator.  Otherwise, skip directly to
@@ -2315,7 +1987,7 @@ class core( QObject ) :
 		# Emit a signal that indicates that the settings for the
 		# non-linear analysis have changed.
 
-		self.emit( SIGNAL('janus_chng_nln_set') )
+		self.emit( 'janus_chng_nln_set' )
 
 		# Regenerate the initial guess or data selection.
 
@@ -2352,6 +2024,18 @@ class core( QObject ) :
 
 		self.rset_var( var_nln_gss=True )
 
+		# If the automatic analysis is running in continuation mode,
+		# attempt to take the initial guess from the results of the
+		# previous spectrum's non-linear fit.  If this succeeds, run the
+		# "make_nln_gss" function and then return (i.e., without using
+		# the results of the moments analysis).
+
+		if ( self.cont_nln_gss( ) ) :
+
+			self.make_nln_gss( )
+
+			return
+
 		# If the moments analysis does not seem to have been run
 		# (sucessfully), run the "make_nln_gss" function (to update the
 		# "self.nln_gss_" arrays, widgets, etc.) and then abort.
@@ -2446,32 +2130,114 @@ class core( QObject ) :
 		self.make_nln_gss( )
 
 	#-----------------------------------------------------------------------
-	# DEFINE THE FUNCTION FOR CHANGING A GUESS VALUE FOR ONE NLN PARAMETER.
+	# DEFINE THE FUNCTION FOR CONTINUING THE NLN GUESS FROM THE LAST FIT.
 	#-----------------------------------------------------------------------
 
-	def chng_nln_gss( self, i, param, val ) :
+	def cont_nln_gss( self ) :
 
-		# Assume that, in calling this function, the user would like
-		# futher adjustments to the initial guess to be manual; i.e.,
-		# disable dynamic generation of an automatic initial-guess.
+		# Note.  This function is called by "self.auto_nln_gss".  It
+		#        returns "True" if it has set the initial guess (in
+		#        "self.nln_pyon") from "self.nln_cont_prv" (see
+		#        "self.auto_run") and "False" otherwise.
 
-		self.chng_dyn( 'gss', False, rerun=False )
+		# If continuation has not been requested, if there is no
+		# previous fit, or if the previous fit's spectrum is not
+		# adjacent to this one, abort.
 
-		# Ensure that the argument "p" is a valid population (unless
-		# the "param" argument indicates a velocity component, in which
-		# case "p" is irrelevant).
+		if ( ( not self.nln_cont           ) or
+		     ( self.nln_cont_prv is None   ) or
+		     ( self.time_val is None       )    ) :
+			return False
 
-		if ( ( param != 'v_x' ) and
-		     ( param != 'v_y' ) and ( param != 'v_z' ) ) :
+		( time_prv, pop, prm ) = self.nln_cont_prv
 
-			if ( ( i < 0 ) or ( i >= self.nln_n_pop ) ) :
-				return
+		if ( ( abs( self.time_val - time_prv ) > self.nln_cont_dt ) or
+		     ( not isfinite( prm ).all( )                       )    ) :
+			return False
 
-		# Change the requested parameter of the requested ion population
-		# to the requested value.
+		# If the populations that would now be analyzed differ from
+		# those of the previous fit, abort.
 
-		# Note.  Simply "pass"-ing in the event of an "except"-ion
-		#        should be sufficient.  If the "pyon" class raises an
+		pop_use = [ i for i in range( self.nln_n_pop )
+		            if ( ( self.nln_pop_use[i]     ) and
+		                 ( self.nln_pop_vld[i]     ) and
+		                 ( self.nln_set_gss_vld[i] )     ) ]
+
+		if ( list( pop ) != pop_use ) :
+			return False
+
+		# Extract the previous fit parameters of the bulk velocity and
+		# of each population (in the order of "self.make_nln_gss") and
+		# use them as the initial guess.  If any value is rejected,
+		# clear the initial guess and abort.
+
+		try :
+
+			self.nln_pyon['v0_x'] = prm[0]
+			self.nln_pyon['v0_y'] = prm[1]
+			self.nln_pyon['v0_z'] = prm[2]
+
+			c = 3
+
+			for i in pop :
+
+				self.nln_pyon.arr_pop[i]['n'] = prm[c]
+				c += 1
+
+				if ( self.nln_pyon.arr_pop[i]['drift'] ) :
+					self.nln_pyon.arr_pop[i]['dv'] = prm[c]
+					c += 1
+
+				if ( self.nln_pyon.arr_pop[i]['aniso'] ) :
+					self.nln_pyon.arr_pop[i]['w_per'] = \
+					                                prm[c  ]
+					self.nln_pyon.arr_pop[i]['w_par'] = \
+					                                prm[c+1]
+					c += 2
+				else :
+					self.nln_pyon.arr_pop[i]['w'] = prm[c]
+					c += 1
+
+		except :
+
+			self.rset_var( var_nln_gss=True )
+
+			return False
+
+		# Record that the initial guess was continued from the previous
+		# fit.
+
+		self.nln_gss_cont = True
+
+		return True
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR CHANGING A GUESS VALUE FOR ONE NLN PARAMETER.
+	#-----------------------------------------------------------------------
+
+	def chng_nln_gss( self, i, param, val ) :
+
+		# Assume that, in calling this function, the user would like
+		# futher adjustments to the initial guess to be manual; i.e.,
+		# disable dynamic generation of an automatic initial-guess.
+
+		self.chng_dyn( 'gss', False, rerun=False )
+
+		# Ensure that the argument "p" is a valid population (unless
+		# the "param" argument indicates a velocity component, in which
+		# case "p" is irrelevant).
+
+		if ( ( param != 'v_x' ) and
+		     ( param != 'v_y' ) and ( param != 'v_z' ) ) :
+
+			if ( ( i < 0 ) or ( i >= self.nln_n_pop ) ) :
+				return
+
+		# Change the requested parameter of the requested ion population
+		# to the requested value.
+
+		# Note.  Simply "pass"-ing in the event of an "except"-ion
+		#        should be sufficient.  If the "pyon" class raises an
 		#        "except"-ion during an assignment, it should set the
 		#        parameter in question equal to "None".
 
@@ -2581,7 +2347,7 @@ class core( QObject ) :
 		     ( None in self.nln_pyon['vec_v0'] ) or
 		     ( self.n_mfi == 0                 )    ) :
 
-			self.emit( SIGNAL('janus_chng_nln_gss') )
+			self.emit( 'janus_chng_nln_gss' )
 
 			return
 
@@ -2604,10 +2370,10 @@ class core( QObject ) :
 
 		self.nln_gss_prm = array( prm )
 
-		# Calculate the expected currents based on the initial geuss.
+		# Calculate the expected currents based on the initial geuss
+		# (with the tabulated response, if it has been requested).
 
-		# FIXME: This code (and that in "self.calc_nln_cur") may not be
-		#        especially efficient.
+		# FIXME: This code may not be especially efficient.
 
 		( tk_t, tk_p, tk_v ) = indices( ( self.n_alt, self.n_azm,
 		                                  self.n_vel              ) )
@@ -2627,10 +2393,12 @@ class core( QObject ) :
 		x = array( [ x_vel_cen, x_vel_wid, x_alt, x_azm,
 		             x_mag_x, x_mag_y, x_mag_z           ] )
 
+		tab = self.load_nln_tab( ) if ( self.nln_tab_use ) else None
+
 		self.nln_gss_cur_ion = reshape(
 		      self.calc_nln_cur( self.nln_gss_pop, x,
 		                         self.nln_gss_prm,
-		                         ret_comp=True        ),
+		                         ret_comp=True, tab=tab ),
 		      ( self.n_alt, self.n_azm, self.n_vel,
 		        len( self.nln_gss_pop )             )    )
 
@@ -2649,7 +2417,7 @@ class core( QObject ) :
 		# Emit a signal that indicates that the initial guess for the
 		# non-linear analysis has changed.
 
-		self.emit( SIGNAL('janus_chng_nln_gss') )
+		self.emit( 'janus_chng_nln_gss' )
 
 		# If warranted (based on the values of "self.dyn_???"), proceed
 		# with dynamic updates to the non-linear analysis.  Otherwise,
@@ -2827,9 +2595,9 @@ class core( QObject ) :
 		# non-linear analysis has changed.
 
 		if ( pnt is None ) :
-			self.emit( SIGNAL('janus_chng_nln_sel_all') )
+			self.emit( 'janus_chng_nln_sel_all' )
 		else :
-			self.emit( SIGNAL('janus_chng_nln_sel_cur'),
+			self.emit( 'janus_chng_nln_sel_cur',
 			           pnt[0], pnt[1], pnt[2]            )
 
 		# If dynamic updating of the non-linear fitting has been
@@ -2842,228 +2610,459 @@ class core( QObject ) :
 			self.chng_dsp( 'gsl' )
 
 	#-----------------------------------------------------------------------
-	# DEFINE THE FUNCTION FOR CALCULATING THE NLN MODEL CURRNET.
+	# DEFINE THE FUNCTION FOR COMPILING THE LAYOUT OF THE NLN MODEL.
 	#-----------------------------------------------------------------------
 
-	def calc_nln_cur( self, pop, x, prm, ret_comp=False ) :
+	def calc_nln_lay( self, pop, x ) :
+
+		# Note.  This function returns a dictionary that describes (for
+		#        the list of populations "pop" and the data "x") where
+		#        the parameters of each population lie in the array of
+		#        parameters (in the order of "self.make_nln_gss") along
+		#        with the data (e.g., the velocity windows rescaled for
+		#        each population's charge-to-mass ratio) arranged with
+		#        a final axis of one element per population.  It need
+		#        only be computed once per fit and can then be passed
+		#        to "self.calc_nln_cur", which thereby evaluates all of
+		#        the populations together.
+
+		# Note.  The index of the drift of each population that does
+		#        not drift is that of an extra element (of value zero)
+		#        appended to the array of parameters.  The isotropic
+		#        populations are given equal indices for their
+		#        perpendicular and parallel thermal speeds.
+
+		n_pop = len( pop )
+
+		i_n     = zeros( n_pop, dtype=int )
+		i_dv    = zeros( n_pop, dtype=int )
+		i_w_per = zeros( n_pop, dtype=int )
+		i_w_par = zeros( n_pop, dtype=int )
+
+		q   = zeros( n_pop )
+		sqm = zeros( n_pop )
+
+		drift = zeros( n_pop, dtype=bool )
+		aniso = zeros( n_pop, dtype=bool )
+
+		c = 3
+
+		for ( k, p ) in enumerate( pop ) :
 
-		# Extract the independent data variables (i.e., the
-		# specifications of the velocity windows and pointing
-		# directions).
+			i_n[k] = c
 
-		d_vel_cen = x[0]
-		d_vel_wid = x[1]
-		d_alt     = x[2]
-		d_azm     = x[3]
-		d_mag_x   = x[4]
-		d_mag_y   = x[5]
-		d_mag_z   = x[6]
+			c += 1
+
+			if ( self.nln_pyon.arr_pop[p]['drift'] ) :
+				drift[k] = True
+				i_dv[k]  = c
+				c += 1
+			else :
+				i_dv[k]  = -1
+
+			if ( self.nln_pyon.arr_pop[p]['aniso'] ) :
+				aniso[k]   = True
+				i_w_per[k] = c
+				i_w_par[k] = c + 1
+				c += 2
+			else :
+				i_w_per[k] = c
+				i_w_par[k] = c
+				c += 1
+
+			q[k]   = self.nln_pyon.arr_pop[p]['q']
+			sqm[k] = sqrt( q[k] / self.nln_pyon.arr_pop[p]['m'] )
+
+		i_dv[i_dv < 0] = c
 
 		# Compute the normalized magnetic field values.
 
-		d_mag = sqrt( d_mag_x**2 + d_mag_y**2 + d_mag_z**2 )
+		d_mag = sqrt( x[4]**2 + x[5]**2 + x[6]**2 )
+
+		d_nrm_x = ( x[4] / d_mag )[...,newaxis]
+		d_nrm_y = ( x[5] / d_mag )[...,newaxis]
+		d_nrm_z = ( x[6] / d_mag )[...,newaxis]
+
+		# Assemble and return the layout.  Each drift is directed along
+		# the magnetic field, and each isotropic population is given
+		# the dummy magnetic field of "self.calc_cur_max".
+
+		return { 'i_n'     : i_n,
+		         'i_dv'    : i_dv,
+		         'i_w_per' : i_w_per,
+		         'i_w_par' : i_w_par,
+		         'q'       : q,
+		         'vel_cen' : x[0][...,newaxis] * sqm,
+		         'vel_wid' : x[1][...,newaxis] * sqm,
+		         'alt'     : x[2][...,newaxis],
+		         'azm'     : x[3][...,newaxis],
+		         'drf_x'   : where( drift, d_nrm_x, 0. ),
+		         'drf_y'   : where( drift, d_nrm_y, 0. ),
+		         'drf_z'   : where( drift, d_nrm_z, 0. ),
+		         'mag_x'   : where( aniso, d_nrm_x, 1. ),
+		         'mag_y'   : where( aniso, d_nrm_y, 0. ),
+		         'mag_z'   : where( aniso, d_nrm_z, 0. )  }
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR CALCULATING THE NLN MODEL CURRNET.
+	#-----------------------------------------------------------------------
+
+	def calc_nln_cur( self, pop, x, prm, ret_comp=False, tab=None,
+	                  lay=None                                     ) :
+
+		# Note.  If the layout "lay" of the model (see
+		#        "self.calc_nln_lay") has already been computed for
+		#        "pop" and "x", it may be passed to avoid recomputing
+		#        it.  If a table "tab" is given, the response is
+		#        approximated with it (see "rsp_tab").
+
+		if ( lay is None ) :
+			lay = self.calc_nln_lay( pop, x )
+
+		# Extract the parameters of all of the ion species at once
+		# (appending a zero for the drift of each species that does not
+		# drift), and calculate the contribution of each to the total
+		# current.
+
+		prm = append( prm, 0. )
+
+		prm_dv = prm[lay['i_dv']]
+
+		prm_v_x = prm[0] + ( prm_dv * lay['drf_x'] )
+		prm_v_y = prm[1] + ( prm_dv * lay['drf_y'] )
+		prm_v_z = prm[2] + ( prm_dv * lay['drf_z'] )
+
+		prm_n     = prm[lay['i_n']]
+		prm_w_per = prm[lay['i_w_per']]
+		prm_w_par = prm[lay['i_w_par']]
 
-		d_nrm_x = d_mag_x / d_mag
-		d_nrm_y = d_mag_y / d_mag
-		d_nrm_z = d_mag_z / d_mag
+		cur = lay['q'] * self.calc_cur_bmx(
+		                    lay['vel_cen'], lay['vel_wid'],
+		                    lay['alt'], lay['azm'],
+		                    lay['mag_x'], lay['mag_y'], lay['mag_z'],
+		                    prm_n, prm_v_x, prm_v_y, prm_v_z,
+		                    prm_w_per, prm_w_par, tab=tab            )
 
-		# For each ion species, extract the passed parameters and
-		# calculate it's contribution to the total current.
+		# Return either the current from each modeled ion species or
+		# the total current from all of them.
 
-		if hasattr( x[0], '__iter__' ) :
-			cur = tile( 0., [ len( x[0] ), self.nln_n_pop ] )
+		if ( ret_comp ) :
+			return cur
 		else :
-			cur = tile( 0., self.nln_n_pop )
+			return sum( cur, axis=-1 )
 
-		prm_v0_x = prm[0]
-		prm_v0_y = prm[1]
-		prm_v0_z = prm[2]
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR CALCULATING THE NLN MODEL JACOBIAN.
+	#-----------------------------------------------------------------------
 
-		c = 3
+	def calc_nln_jac( self, pop, x, prm, ret_cur=False, tab=None,
+	                  lay=None                                    ) :
 
-		for p in pop :
+		# Note.  This function returns the (analytic) partial
+		#        derivatives of the total current computed by
+		#        "self.calc_nln_cur" with respect to each of the
+		#        parameters in "prm".  Each element of "x" is expected
+		#        to be an array of data points, and the returned array
+		#        has the same shape with an added, final axis of one
+		#        element per parameter.  If "ret_cur" is "True", the
+		#        total current is also returned (i.e., before the
+		#        Jacobian).  If a table "tab" is given, the response
+		#        is approximated with it (see "rsp_tab").  As in
+		#        "self.calc_nln_cur", the layout "lay" may be passed to
+		#        avoid recomputing it.
 
-			# Extract the density of population "p".
+		# Note.  Several spectra may be handled at once: if each
+		#        element of "x" has the shape "( N, M )" (i.e., "M"
+		#        points from each of "N" spectra), "prm" should have
+		#        the shape "( N, P )".
 
-			prm_n = prm[c]
+		if ( lay is None ) :
+			lay = self.calc_nln_lay( pop, x )
 
-			c += 1
+		# Extract the parameters of all of the ion species at once
+		# (appending a zero for the drift of each species that does not
+		# drift).  Each is given an axis for the data points so that it
+		# broadcasts against them (and their final, population axis).
 
-			# Determine the bulk velocity of population "p",
-			# extracting (if necessary) the population's drift.
+		prm = array( prm, dtype=float )
 
-			if ( self.nln_pyon.arr_pop[p]['drift'] ) :
+		n_prm = prm.shape[-1]
 
-				prm_dv = prm[c]
+		prm = append( prm, zeros( prm.shape[:-1] + ( 1, ) ),
+		              axis=-1                               )
 
-				c += 1
+		prm = prm[...,newaxis,:]
 
-				prm_v_x = prm_v0_x + ( prm_dv * d_nrm_x )
-				prm_v_y = prm_v0_y + ( prm_dv * d_nrm_y )
-				prm_v_z = prm_v0_z + ( prm_dv * d_nrm_z )
+		prm_dv = prm[...,lay['i_dv']]
 
-			else :
+		prm_v_x = prm[...,0,newaxis] + ( prm_dv * lay['drf_x'] )
+		prm_v_y = prm[...,1,newaxis] + ( prm_dv * lay['drf_y'] )
+		prm_v_z = prm[...,2,newaxis] + ( prm_dv * lay['drf_z'] )
 
-				prm_v_x = prm_v0_x
-				prm_v_y = prm_v0_y
-				prm_v_z = prm_v0_z
+		# Calculate the current (and its derivatives) from each ion
+		# species.
 
-			# Extract the thermal speed(s).
+		# Note.  Each isotropic species is modeled (as in
+		#        "self.calc_nln_cur") as a bi-Maxwellian with equal
+		#        thermal speeds, so the derivative with respect to its
+		#        thermal speed is the sum of those with respect to the
+		#        two.
 
-			if ( self.nln_pyon.arr_pop[p]['aniso'] ) :
+		( cur, jac_p ) = rsp_cur_bmx_jac(
+		                    lay['vel_cen'], lay['vel_wid'],
+		                    lay['alt'], lay['azm'],
+		                    lay['mag_x'], lay['mag_y'], lay['mag_z'],
+		                    prm[...,lay['i_n']],
+		                    prm_v_x, prm_v_y, prm_v_z,
+		                    prm[...,lay['i_w_per']],
+		                    prm[...,lay['i_w_par']], tab=tab         )
 
-				prm_w_per = prm[c  ]
-				prm_w_par = prm[c+1]
+		cur   = sum( lay['q'] * cur, axis=-1 )
+		jac_p = lay['q'][:,newaxis] * jac_p
 
-				c += 2
+		# Assemble the Jacobian (with an extra element for the drifts
+		# of the species that do not drift).  The bulk velocity of each
+		# species depends on the common "v0" and (if it drifts) on "dv"
+		# along the magnetic field.
 
-			else :
+		jac = zeros( cur.shape + ( n_prm + 1, ) )
 
-				prm_w = prm[c]
+		jac[...,0:3] = sum( jac_p[...,1:4], axis=-2 )
 
-				c += 1
+		jac[...,lay['i_n']] = jac_p[...,0]
 
-			# Add the contribution of this ion species to
-			# the total current.
+		jac[...,lay['i_dv']] = ( jac_p[...,1] * lay['drf_x'] +
+		                         jac_p[...,2] * lay['drf_y'] +
+		                         jac_p[...,3] * lay['drf_z']   )
 
-			sqm = sqrt( self.nln_pyon.arr_pop[p]['q'] /
-			            self.nln_pyon.arr_pop[p]['m']   )
+		jac[...,lay['i_w_par']]  = jac_p[...,5]
+		jac[...,lay['i_w_per']] += jac_p[...,4]
 
-			if ( self.nln_pyon.arr_pop[p]['aniso'] ) :
-				cur_p = self.nln_pyon.arr_pop[p]['q'] * \
-				        self.calc_cur_bmx(
-					            d_vel_cen * sqm,
-					            d_vel_wid * sqm,
-				                    d_alt, d_azm,
-					            d_nrm_x, d_nrm_y, d_nrm_z,
-				                    prm_n, prm_v_x,
-				                    prm_v_y, prm_v_z,
-				                    prm_w_per, prm_w_par       )
-			else :
-				cur_p = self.nln_pyon.arr_pop[p]['q'] * \
-				        self.calc_cur_max( d_vel_cen * sqm,
-					                   d_vel_wid * sqm,
-				                           d_alt, d_azm,
-				                           prm_n, prm_v_x,
-				                           prm_v_y, prm_v_z,
-				                           prm_w             )
-
-			if hasattr( x[0], '__iter__' ) :
-				cur[:,p] = cur_p
-			else :
-				cur[p] = cur_p
+		jac = jac[...,0:n_prm]
 
-		# Return the total current from all modeled ion species.
+		# Return the Jacobian (and, if requested, the current).
 
-		if hasattr( x[0], '__iter__' ) :
-			if ( ret_comp ) :
-				return cur[:,pop]
-			else :
-				return sum( cur, axis=1 )
+		if ( ret_cur ) :
+			return ( cur, jac )
 		else :
-			if ( ret_comp ) :
-				return cur[pop]
-			else :
-				return sum( cur, axis=0 )
+			return jac
 
 	#-----------------------------------------------------------------------
-	# DEFINE THE FUNCTION FOR RUNNING THE NON-LINEAR ANALYSIS.
+	# DEFINE THE FUNCTION FOR THE SEPARABLE (VAR.-PROJ.) NON-LINEAR FIT.
 	#-----------------------------------------------------------------------
 
-	def anls_nln( self ) :
+	def calc_nln_vpro( self, pop, x, y, sigma, gss, slvr, bnd,
+	                   tab=None, tol=None, lay=None            ) :
+
+		# Note.  The current from each population is proportional to
+		#        its density.  This function therefore fits only the
+		#        other parameters (i.e., "v0", "dv", and the thermal
+		#        speeds) with the solver, and for each trial of these
+		#        solves for the densities exactly via linear least
+		#        squares (i.e., "variable projection" with Kaufman's
+		#        approximation of the Jacobian).  The returned values
+		#        match those of "calc_nln_slvr": the full array of fit
+		#        parameters (in the same order as "gss"), their
+		#        covariance matrix (which accounts for the densities),
+		#        and the solver's numbers of evaluations and iterations
+		#        and its run time.  The reduced fit is performed by the
+		#        solver "slvr" (see "janus_nln_slvr") within the
+		#        corresponding elements of the bounds "bnd" (see
+		#        "self.calc_nln_bnd") to within the relative tolerance
+		#        "tol" (if given) and with the response approximated by
+		#        the table "tab" (if given; see "rsp_tab").  The layout
+		#        "lay" of the model (see "self.calc_nln_lay") may be
+		#        passed if it has already been computed.
+
+		# Note.  If the solver keeps the parameters within the bounds
+		#        (see "janus_nln_slvr.nln_slvr_bnd"), the densities are
+		#        also kept above their (finite) lower bounds by solving
+		#        for them through non-negative least squares.  Their
+		#        upper bounds are ignored.
+
+		# Compile (if necessary) the layout of the model, and determine
+		# from it which of the parameters are the densities (i.e., the
+		# linear parameters) and which are not.
+
+		if ( lay is None ) :
+			lay = self.calc_nln_lay( pop, x )
+
+		i_n = lay['i_n']
+		i_t = array( [ i for i in range( len( gss ) )
+		                 if ( i not in i_n )          ] )
+
+		lb_n = bnd[0][i_n]
+
+		use_nnls = ( ( slvr in nln_slvr_bnd ) and
+		             ( isfinite( lb_n ).all( ) )  )
+
+		# Define the function that, for the non-linear parameters "t",
+		# computes the (weighted) current from each population per unit
+		# density and then solves for the densities.  As the solver
+		# evaluates the residuals and their Jacobian at the same "t",
+		# the most recent result is retained.
+
+		lst = { }
+
+		def calc_prm( t ) :
+
+			if ( ( 't' in lst ) and ( all( lst['t'] == t ) ) ) :
+				return lst['ret']
+
+			prm = array( gss, dtype=float )
+
+			prm[i_t] = t
+			prm[i_n] = 1.
+
+			phi = self.calc_nln_cur( pop, x, prm, ret_comp=True,
+			                         tab=tab, lay=lay            )
+
+			phi = transpose( transpose( phi ) / sigma )
+
+			if ( use_nnls ) :
+				res_n = ( y / sigma ) - dot( phi, lb_n )
+				prm[i_n] = lb_n + nnls( phi, res_n )[0]
+			else :
+				prm[i_n] = lstsq( phi, y / sigma, rcond=-1 )[0]
 
-		# Re-initialize the output of the non-linear analysis.
+			lst['t']   = array( t )
+			lst['ret'] = ( prm, phi )
 
-		self.rset_var( var_nln_res=True )
+			return ( prm, phi )
 
-		# Load the list of ion populations to be analyzed and the intial
-		# guess of their parameters.
+		# Define the functions for the (weighted) residuals and for
+		# their Jacobian with respect to "t".  The latter is the
+		# Jacobian of the model projected onto the orthogonal
+		# complement of the span of the columns of "phi" (omitting
+		# those of any densities held at their lower bounds, which do
+		# not vary with "t").
 
-		pop = self.nln_gss_pop
-		gss = self.nln_gss_prm
+		def resid( t ) :
 
-		# If any of the following conditions are met, emit a signal that
-		# indicates that the results of the non-linear analysis have
-		# change, and abort.
-		#   -- No ion spectrum has been loaded.
-		#   -- No ion population is available for analysis.
-		#   -- The primary ion species is not available for analysis.
-		#   -- No initial guess has been generated.
-		#   -- Insufficient data have been selected.
+			( prm, phi ) = calc_prm( t )
 
-		if ( ( self.n_vel == 0                   ) or
-		     ( self.n_mfi == 0                   ) or
-		     ( len( pop ) == 0                   ) or
-		     ( 0 not in pop                      ) or
-		     ( len( gss ) == 0                   ) or
-		     ( self.nln_n_sel < self.nln_min_sel )    ) :
+			return ( y / sigma ) - dot( phi, prm[i_n] )
 
-			self.emit( SIGNAL('janus_mesg'),
-			           'core', 'norun', 'nln' )
+		def resid_jac( t ) :
 
-			self.emit( SIGNAL('janus_chng_nln_res') )
+			( prm, phi ) = calc_prm( t )
 
-			return
+			jac = self.calc_nln_jac( pop, x, prm, tab=tab,
+			                         lay=lay               )[:,i_t]
 
-		# Message the user that the non-linear analysis has begun.
+			jac = transpose( transpose( jac ) / sigma )
 
-		self.emit( SIGNAL('janus_mesg'), 'core', 'begin', 'nln' )
+			if ( use_nnls ) :
+				phi = phi[:,where( prm[i_n] > lb_n )[0]]
 
-		# Define the function for evaluating the modeled current.
+			if ( phi.shape[1] == 0 ) :
+				return - jac
 
-		def model( x, *p ) :
+			q = qr( phi )[0]
 
-			return self.calc_nln_cur( pop, x, array( p ) )
+			return - ( jac - dot( q, dot( transpose( q ), jac ) ) )
 
-		# Save the data selection and then use it to generate data
-		# arrays for the non-linear fit.
+		# Perform the (reduced) non-linear fit.  If it fails, the solver
+		# raises an exception.
 
-		self.nln_res_sel = self.nln_sel.copy( )
+		( t, cov_t, n_evl, n_itr, t_slvr ) = calc_nln_slvr(
+		                       slvr, resid, resid_jac, gss[i_t],
+		                       ( bnd[0][i_t], bnd[1][i_t] ), tol=tol )
 
-		( tk_t, tk_p, tk_v ) = where( self.nln_res_sel )
+		# Compute the full array of fit parameters and the covariance
+		# matrix of all parameters (scaled, as by "curve_fit", by the
+		# reduced chi-squared).
 
-		x_vel_cen = self.vel_cen[ tk_v ]
-		x_vel_wid = self.vel_wid[ tk_v ]
-		x_alt     = self.alt[ tk_t ]
-		x_azm     = self.azm[ tk_t, tk_p ]
-		x_mag_x   = self.mag_x[ tk_v ]
-		x_mag_y   = self.mag_y[ tk_v ]
-		x_mag_z   = self.mag_z[ tk_v ]
+		( fit, phi ) = calc_prm( t )
 
-		x = array( [ x_vel_cen, x_vel_wid, x_alt, x_azm,
-		             x_mag_x, x_mag_y, x_mag_z           ] )
+		jac = self.calc_nln_jac( pop, x, fit, lay=lay )
 
-		y = self.cur[ tk_t, tk_p, tk_v ]
+		jac = transpose( transpose( jac ) / sigma )
 
-		# Attempt to perform the non-linear fit.  If this fails, reset
-		# the associated variables and abort.
+		res = ( y / sigma ) - dot( phi, fit[i_n] )
 
-		try :
+		covar = calc_slvr_covar( res, jac )
 
-			( fit, covar ) = curve_fit( model, x, y, gss,
-			                            sigma=sqrt(y)     )
+		# Return the fit parameters, their covariance, and the solver's
+		# statistics.
 
-			sigma = sqrt( diag( covar ) )
+		return ( fit, covar, n_evl, n_itr, t_slvr )
 
-		except :
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR THE BOUNDS OF THE NON-LINEAR FIT PARAMETERS.
+	#-----------------------------------------------------------------------
 
-			self.emit( SIGNAL('janus_mesg'), 'core', 'fail', 'nln' )
+	def calc_nln_bnd( self, pop, n_prm ) :
 
-			self.rset_var( var_nln_res=True )
+		# Note.  This function returns the tuple "( lb, ub )" of the
+		#        lower and upper bounds of the "n_prm" fit parameters
+		#        for the list of populations "pop" (in the order of
+		#        "self.make_nln_gss").  The densities and thermal speeds
+		#        are bounded to be non-negative; the velocities are
+		#        unbounded.
 
-			self.emit( SIGNAL('janus_chng_nln_res') )
+		lb = tile( -inf, n_prm )
+		ub = tile(  inf, n_prm )
 
-			return
+		c = 3
 
-		# Calculate the expected currents based on the results of the
-		# non-linear analysis.
+		for p in pop :
 
-		( tk_t, tk_p, tk_v ) = indices( ( self.n_alt, self.n_azm,
-		                                  self.n_vel              ) )
+			lb[c] = 0.
 
-		tk_t = tk_t.flatten( )
-		tk_p = tk_p.flatten( )
-		tk_v = tk_v.flatten( )
+			c += 1
+
+			if ( self.nln_pyon.arr_pop[p]['drift'] ) :
+				c += 1
+
+			if ( self.nln_pyon.arr_pop[p]['aniso'] ) :
+				lb[c:c+2] = 0.
+				c += 2
+			else :
+				lb[c] = 0.
+				c += 1
+
+		return ( lb, ub )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR ASSEMBLING THE NON-LINEAR FITTING PROBLEM.
+	#-----------------------------------------------------------------------
+
+	def calc_nln_prob( self ) :
+
+		# Note.  This function returns the non-linear fitting problem
+		#        posed by the current spectrum as the tuple "( time,
+		#        b0, pop, x, y, gss )" (i.e., the timestamp, the average
+		#        magnetic field, the list of populations, the data
+		#        arrays, and the initial guess), or "None" if the
+		#        analysis cannot be run.
+
+		# Load the list of ion populations to be analyzed and the intial
+		# guess of their parameters.
+
+		pop = self.nln_gss_pop
+		gss = self.nln_gss_prm
+
+		# If any of the following conditions are met, abort.
+		#   -- No ion spectrum has been loaded.
+		#   -- No ion population is available for analysis.
+		#   -- The primary ion species is not available for analysis.
+		#   -- No initial guess has been generated.
+		#   -- Insufficient data have been selected.
+
+		if ( ( self.n_vel == 0                   ) or
+		     ( self.n_mfi == 0                   ) or
+		     ( len( pop ) == 0                   ) or
+		     ( 0 not in pop                      ) or
+		     ( len( gss ) == 0                   ) or
+		     ( self.nln_n_sel < self.nln_min_sel )    ) :
+
+			return None
+
+		# Use the data selection to generate data arrays for the
+		# non-linear fit.
+
+		( tk_t, tk_p, tk_v ) = where( self.nln_sel )
 
 		x_vel_cen = self.vel_cen[ tk_v ]
 		x_vel_wid = self.vel_wid[ tk_v ]
@@ -3076,29 +3075,42 @@ class core( QObject ) :
 		x = array( [ x_vel_cen, x_vel_wid, x_alt, x_azm,
 		             x_mag_x, x_mag_y, x_mag_z           ] )
 
-		self.nln_res_cur_ion = \
-		   reshape( self.calc_nln_cur( pop, x, fit, ret_comp=True ),
-		            ( self.n_alt, self.n_azm, self.n_vel, len( pop ) ) )
+		y = self.cur[ tk_t, tk_p, tk_v ]
 
-		self.nln_res_cur_tot = sum( self.nln_res_cur_ion, axis=3 )
+		# Return the fitting problem.
+
+		return ( self.time_epc, array( self.mfi_avg_vec ),
+		         array( pop ), x, y, array( gss )         )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR ASSEMBLING THE RESULTS OF A NON-LINEAR FIT.
+	#-----------------------------------------------------------------------
+
+	def calc_nln_plas( self, pop, fit, covar, time, b0 ) :
+
+		# Initialize the "plas" object of results.
+
+		ret = plas( enforce=False )
+
+		sigma = sqrt( diag( covar ) )
 
 		# Save the properties and fit parameters for each ion species
 		# used in this analysis.
 
-		self.nln_res_plas.covar = covar.copy( )
+		ret.covar = covar.copy( )
 
-		self.nln_res_plas['time'] = self.time_epc
+		ret['time'] = time
 
-		self.nln_res_plas['b0_x'] = self.mfi_avg_vec[0]
-		self.nln_res_plas['b0_y'] = self.mfi_avg_vec[1]
-		self.nln_res_plas['b0_z'] = self.mfi_avg_vec[2]
+		ret['b0_x'] = b0[0]
+		ret['b0_y'] = b0[1]
+		ret['b0_z'] = b0[2]
 
-		self.nln_res_plas['v0_x'] = fit[0]
-		self.nln_res_plas['v0_y'] = fit[1]
-		self.nln_res_plas['v0_z'] = fit[2]
-		self.nln_res_plas['sig_v0_x'] = sigma[0]
-		self.nln_res_plas['sig_v0_y'] = sigma[1]
-		self.nln_res_plas['sig_v0_z'] = sigma[2]
+		ret['v0_x'] = fit[0]
+		ret['v0_y'] = fit[1]
+		ret['v0_z'] = fit[2]
+		ret['sig_v0_x'] = sigma[0]
+		ret['sig_v0_y'] = sigma[1]
+		ret['sig_v0_z'] = sigma[2]
 		c = 3
 
 		for i in pop :
@@ -3108,7 +3120,7 @@ class core( QObject ) :
 
 			spc_name = self.nln_pyon.arr_pop[i].my_spec['name']
 
-			if ( self.nln_res_plas.get_spec( spc_name ) is None ) :
+			if ( ret.get_spec( spc_name ) is None ) :
 
 				spc_sym = \
 				         self.nln_pyon.arr_pop[i].my_spec['sym']
@@ -3117,9 +3129,8 @@ class core( QObject ) :
 				spc_q   = \
 				         self.nln_pyon.arr_pop[i].my_spec['q'  ]
 
-				self.nln_res_plas.add_spec(
-				                   name=spc_name, sym=spc_sym,
-				                   m=spc_m, q=spc_q            )
+				ret.add_spec( name=spc_name, sym=spc_sym,
+				              m=spc_m, q=spc_q            )
 
 			# Add the population itself to the results.
 
@@ -3157,13 +3168,218 @@ class core( QObject ) :
 				pop_sig_w_par = None
 				c += 1
 
-			self.nln_res_plas.add_pop(
+			ret.add_pop(
 			       spc=spc_name, drift=pop_drift, aniso=pop_aniso,
 			       name=pop_name, sym=pop_sym, n=pop_n, dv=pop_dv,
 			       w=pop_w, w_per=pop_w_per, w_par=pop_w_par,
 			       sig_n=pop_sig_n, sig_dv=pop_sig_dv, sig_w=pop_sig_w,
 			       sig_w_per=pop_sig_w_per, sig_w_par=pop_sig_w_par        )
 
+		# Return the results.
+
+		return ret
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR LOADING THE TABLE OF THE NLN RESPONSE.
+	#-----------------------------------------------------------------------
+
+	def load_nln_tab( self ) :
+
+		# If no table of the response has yet been computed (or it was
+		# computed for a different tolerance), compute it.  Return the
+		# table.
+
+		if ( ( self.nln_tab is None                    ) or
+		     ( self.nln_tab.tol != self.nln_tab_tol )    ) :
+
+			self.nln_tab = rsp_tab( tol=self.nln_tab_tol )
+
+		return self.nln_tab
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR PERFORMING THE NON-LINEAR FIT.
+	#-----------------------------------------------------------------------
+
+	def calc_nln_fit( self, pop, x, y, gss, bnd, tab=None, tol=None ) :
+
+		# Note.  This function fits the model currents of the
+		#        populations "pop" to the measured currents "y" from
+		#        the initial guess "gss" (subject to the bounds "bnd")
+		#        using the solver "self.nln_slvr" and returns the tuple
+		#        "( fit, covar, n_evl, n_itr, t_slvr )" (see
+		#        "calc_nln_slvr") to within the relative tolerance
+		#        "tol" (if given).  If a table "tab" is given, the
+		#        response is approximated with it (see "rsp_tab").
+
+		# Compile (once) the layout of the model, and define the
+		# function for evaluating the (weighted) residuals of the
+		# modeled current.
+
+		lay = self.calc_nln_lay( pop, x )
+
+		sigma = sqrt( y )
+
+		def resid( p ) :
+
+			cur = self.calc_nln_cur( pop, x, p, tab=tab, lay=lay )
+
+			return ( cur - y ) / sigma
+
+		# Define the function for evaluating their (analytic) Jacobian,
+		# which spares the solver from estimating it through finite
+		# differences.
+
+		def resid_jac( p ) :
+
+			jac = self.calc_nln_jac( pop, x, p, tab=tab,
+			                         lay=lay            )
+
+			return transpose( transpose( jac ) / sigma )
+
+		# Perform the fit (either directly or through the variable
+		# projection) and return its results.
+
+		if ( self.nln_vpro ) :
+			return self.calc_nln_vpro( pop, x, y, sigma, gss,
+			                           self.nln_slvr, bnd,
+			                           tab=tab, tol=tol, lay=lay )
+		else :
+			return calc_nln_slvr( self.nln_slvr, resid, resid_jac,
+			                      gss, bnd, tol=tol                )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR RUNNING THE NON-LINEAR ANALYSIS.
+	#-----------------------------------------------------------------------
+
+	def anls_nln( self ) :
+
+		# Re-initialize the output of the non-linear analysis.
+
+		self.rset_var( var_nln_res=True )
+
+		# Assemble the fitting problem posed by this spectrum.  If this
+		# fails (e.g., because no ion spectrum has been loaded or
+		# insufficient data have been selected), emit a signal that
+		# indicates that the results of the non-linear analysis have
+		# change, and abort.
+
+		prob = self.calc_nln_prob( )
+
+		if ( prob is None ) :
+
+			self.emit( 'janus_mesg',
+			           'core', 'norun', 'nln' )
+
+			self.emit( 'janus_chng_nln_res' )
+
+			return
+
+		( time, b0, pop, x, y, gss ) = prob
+
+		# Message the user that the non-linear analysis has begun.
+
+		self.emit( 'janus_mesg', 'core', 'begin', 'nln' )
+
+		# Determine the bounds of the fit parameters.
+
+		bnd = self.calc_nln_bnd( pop, len( gss ) )
+
+		# Save the data selection.
+
+		self.nln_res_sel = self.nln_sel.copy( )
+
+		# If requested, first run the non-linear fit with the tabulated
+		# response, and use its result as the initial guess for the
+		# exact fit.  Should the tabulated fit fail, simply run the
+		# exact fit from the original initial guess.
+
+		n_evl_tab  = 0
+		n_itr_tab  = 0
+		t_slvr_tab = 0.
+
+		if ( self.nln_tab_use ) :
+
+			try :
+
+				tab = self.load_nln_tab( )
+
+				tol = self.nln_tab_cnv
+
+				( fit, covar, n_evl_tab, n_itr_tab,
+				  t_slvr_tab                        ) = \
+				        self.calc_nln_fit( pop, x, y, gss, bnd,
+				                           tab=tab, tol=tol )
+
+				if ( isfinite( fit ).all( ) ) :
+					gss = fit
+
+			except :
+
+				n_evl_tab  = 0
+				n_itr_tab  = 0
+				t_slvr_tab = 0.
+
+		# Attempt to perform the (exact) non-linear fit.  If this fails,
+		# reset the associated variables and abort.
+
+		try :
+
+			( fit, covar, n_evl, n_itr, t_slvr ) = \
+			                self.calc_nln_fit( pop, x, y, gss, bnd )
+
+			n_evl  += n_evl_tab
+			n_itr  += n_itr_tab
+			t_slvr += t_slvr_tab
+
+			self.nln_res_plas = self.calc_nln_plas(
+			                         pop, fit, covar, time, b0 )
+
+			self.nln_res_plas.slvr   = self.nln_slvr
+			self.nln_res_plas.n_evl  = n_evl
+			self.nln_res_plas.n_itr  = n_itr
+			self.nln_res_plas.t_slvr = t_slvr
+
+			self.nln_res_prm  = fit
+			self.nln_res_nfev = n_evl
+			self.nln_res_njev = n_itr
+
+		except :
+
+			self.emit( 'janus_mesg', 'core', 'fail', 'nln' )
+
+			self.rset_var( var_nln_res=True )
+
+			self.emit( 'janus_chng_nln_res' )
+
+			return
+
+		# Calculate the expected currents based on the results of the
+		# non-linear analysis.
+
+		( tk_t, tk_p, tk_v ) = indices( ( self.n_alt, self.n_azm,
+		                                  self.n_vel              ) )
+
+		tk_t = tk_t.flatten( )
+		tk_p = tk_p.flatten( )
+		tk_v = tk_v.flatten( )
+
+		x_vel_cen = self.vel_cen[ tk_v ]
+		x_vel_wid = self.vel_wid[ tk_v ]
+		x_alt     = self.alt[ tk_t ]
+		x_azm     = self.azm[ tk_t, tk_p ]
+		x_mag_x   = self.mag_x[ tk_v ]
+		x_mag_y   = self.mag_y[ tk_v ]
+		x_mag_z   = self.mag_z[ tk_v ]
+
+		x = array( [ x_vel_cen, x_vel_wid, x_alt, x_azm,
+		             x_mag_x, x_mag_y, x_mag_z           ] )
+
+		self.nln_res_cur_ion = \
+		   reshape( self.calc_nln_cur( pop, x, fit, ret_comp=True ),
+		            ( self.n_alt, self.n_azm, self.n_vel, len( pop ) ) )
+
+		self.nln_res_cur_tot = sum( self.nln_res_cur_ion, axis=3 )
+
 		# Save the results of the this non-linear analysis to the
 		# results log.
 
@@ -3171,12 +3387,151 @@ class core( QObject ) :
 
 		# Message the user that the non-linear analysis has finished.
 
-		self.emit( SIGNAL('janus_mesg'), 'core', 'end', 'nln' )
+		self.emit( 'janus_mesg', 'core', 'end', 'nln' )
 
 		# Emit a signal that indicates that the results of the
 		# non-linear analysis have changed.
 
-		self.emit( SIGNAL('janus_chng_nln_res') )
+		self.emit( 'janus_chng_nln_res' )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR RUNNING THE NON-LINEAR ANALYSIS IN BATCH.
+	#-----------------------------------------------------------------------
+
+	def anls_nln_bat( self, prob ) :
+
+		# Note.  The argument "prob" is a list of fitting problems (each
+		#        as returned by "self.calc_nln_prob", or "None"), which
+		#        may come from many spectra.  The problems that share
+		#        the same list of populations (and thus the same
+		#        parameters) are fit together via "calc_bat_lm".  A list
+		#        is returned of the corresponding "plas" objects of
+		#        results (with "None" for each fit that failed), each
+		#        with the same content as from "self.anls_nln".  The
+		#        state of the core itself (e.g., "self.series") is not
+		#        changed.
+
+		# Note.  The stacked fit is the (unbounded) Levenberg-Marquardt
+		#        algorithm, so, as with the "lm" solver (see
+		#        "janus_nln_slvr.slvr_lm"), the bounds of the parameters
+		#        are not applied.  If another solver or the variable
+		#        projection has been requested, an exception is raised.
+		#        If the tabulated response has been requested (see
+		#        "self.load_nln_tab"), each group of problems is first
+		#        fit with it (as in "self.anls_nln").  The solver
+		#        time reported for each problem is its share of that of
+		#        its group.
+
+		if ( self.nln_slvr != 'lm' ) :
+			raise ValueError( 'The batch fit requires the "lm" ' +
+			                  'solver.'                            )
+
+		if ( self.nln_vpro ) :
+			raise ValueError( 'The batch fit does not support ' +
+			                  'the variable projection.'          )
+
+		ret = [ None for p in prob ]
+
+		# Group the problems by their lists of populations.
+
+		grp = { }
+
+		for ( k, p ) in enumerate( prob ) :
+			if ( p is not None ) :
+				grp.setdefault( tuple( p[2] ), [ ] ).append( k )
+
+		# Fit each group of problems.
+
+		for ( pop, tk ) in grp.items( ) :
+
+			pop = list( pop )
+
+			# Stack the data arrays of the problems, padding each
+			# one (with copies of its first point, which are given
+			# zero weight) to the length of the longest.
+
+			n_pnt = max( [ len( prob[k][4] ) for k in tk ] )
+
+			x   = zeros( ( 7, len( tk ), n_pnt ) )
+			y   = zeros( ( len( tk ), n_pnt ) )
+			wgt = zeros( ( len( tk ), n_pnt ) )
+
+			for ( j, k ) in enumerate( tk ) :
+
+				n = len( prob[k][4] )
+
+				x[:,j,:]  = prob[k][3][:,0:1]
+				x[:,j,:n] = prob[k][3]
+
+				y[j,:n]   = prob[k][4]
+				y[j,n:]   = prob[k][4][0]
+
+				wgt[j,:n] = 1. / sqrt( prob[k][4] )
+
+			gss = array( [ prob[k][5] for k in tk ] )
+
+			t_0 = time( )
+
+			# If requested, first fit all of the problems in this
+			# group with the tabulated response, and use each
+			# converged result as the initial guess for the exact
+			# fit.
+
+			n_evl_tab = zeros( len( tk ), dtype=int )
+			n_itr_tab = zeros( len( tk ), dtype=int )
+
+			if ( self.nln_tab_use ) :
+
+				tab = self.load_nln_tab( )
+				tol = self.nln_tab_cnv
+
+				def func( x, prm ) :
+					return self.calc_nln_jac(
+					                pop, x, prm,
+					                ret_cur=True, tab=tab )
+
+				( fit, covar, cnv, n_evl_tab, n_itr_tab ) = \
+				        calc_bat_lm( func, x, y, wgt, gss,
+				                     tol_chi=tol, tol_prm=tol )
+
+				use = cnv & isfinite( fit ).all( axis=1 )
+
+				gss[use] = fit[use]
+
+			# Fit all of the problems in this group together.
+
+			def func( x, prm ) :
+				return self.calc_nln_jac( pop, x, prm,
+				                          ret_cur=True )
+
+			( fit, covar, cnv, n_evl, n_itr ) = calc_bat_lm(
+			                             func, x, y, wgt, gss )
+
+			n_evl  = n_evl + n_evl_tab
+			n_itr  = n_itr + n_itr_tab
+			t_slvr = ( time( ) - t_0 ) / len( tk )
+
+			# Assemble the results of each successful fit.
+
+			for ( j, k ) in enumerate( tk ) :
+
+				if ( ( not cnv[j]                     ) or
+				     ( not isfinite( fit[j] ).all( ) )    ) :
+					continue
+
+				ret[k] = self.calc_nln_plas( pop, fit[j],
+				                             covar[j],
+				                             prob[k][0],
+				                             prob[k][1]   )
+
+				ret[k].slvr   = self.nln_slvr
+				ret[k].n_evl  = int( n_evl[j] )
+				ret[k].n_itr  = int( n_itr[j] )
+				ret[k].t_slvr = t_slvr
+
+		# Return the list of results.
+
+		return ret
 
 	#-----------------------------------------------------------------------
 	# DEFINE THE FUNCTION FOR CHANGING THE DISPLAYED ANALYSIS.
@@ -3206,7 +3561,7 @@ class core( QObject ) :
 		# Emit a signal that indicates that the "display" setting has
 		# changed.
 
-		self.emit( SIGNAL('janus_chng_dsp') )
+		self.emit( 'janus_chng_dsp' )
 
 	#-----------------------------------------------------------------------
 	# DEFINE THE FUNCTION FOR CHANGING IF AN ANALYSIS UPDATES DYNAMICALLY.
@@ -3257,7 +3612,7 @@ class core( QObject ) :
 		# Emit a signal that indicates that the "dynamic" settings have
 		# changed.
 
-		self.emit( SIGNAL('janus_chng_dyn') )
+		self.emit( 'janus_chng_dyn' )
 
 		# If dynamic updates has been turned on for the specified
 		# analysis "anal", and the user hasn't requested otherwise,
@@ -3301,6 +3656,33 @@ class core( QObject ) :
 
 				self.chng_dsp( 'nln' )
 
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR DOWNLOADING THE DATA FILES FOR A RANGE.
+	#-----------------------------------------------------------------------
+
+	def dnld_rang( self, time_strt, time_stop ) :
+
+		# For each archive, construct a list of the dates with data
+		# that could be needed for the range of timestamps (including
+		# the archive's buffer), and request that any missing files for
+		# those dates be downloaded.
+
+		for arcv in [ self.fc_arcv, self.mfi_arcv ] :
+
+			time_i = calc_time_val( time_strt ) - arcv.buf
+			time_f = calc_time_val( time_stop ) + arcv.buf
+
+			date_lst = [ ]
+
+			while ( time_i < time_f ) :
+				date_lst.append( calc_time_str( time_i )[0:10] )
+				time_i += 86400.
+
+			if ( calc_time_str( time_f )[0:10] not in date_lst ) :
+				date_lst.append( calc_time_str( time_f )[0:10] )
+
+			arcv.dnld_date( date_lst )
+
 	#-----------------------------------------------------------------------
 	# DEFINE THE FUNCTION FOR AUTOMATICALLY RUNNING A RANGE OF SPECTRA.
 	#-----------------------------------------------------------------------
@@ -3317,7 +3699,7 @@ class core( QObject ) :
 		# Message the user that the automated analysis is about to
 		# begin.
 
-		self.emit( SIGNAL('janus_mesg'), 'core', 'begin', 'auto' )
+		self.emit( 'janus_mesg', 'core', 'begin', 'auto' )
 
 		# Attempt to convert the start and stop timestamps to epoch
 		# times.  If one or more fails, or if the start time does not
@@ -3331,25 +3713,35 @@ class core( QObject ) :
 		elif ( time_strt >= time_stop ) :
 			return
 
+		# Download (concurrently) any missing data files for the range
+		# of timestamps.
+
+		self.dnld_rang( time_strt, time_stop )
+
 		# Begin with the start time stamp.  Load and process spectra,
 		# one by one, until the stop timestamp is reached (or a
 		# premature stop has been requested).
 
-		first_pass = True
+		# Note.  The spectra are streamed from the Wind/FC archive by
+		#        an iterator (which is equivalent to requesting each
+		#        next spectrum from "self.fc_arcv.load_spec" but does
+		#        not need to search every loaded spectrum each time).
+
+		spec_iter = self.fc_arcv.iter_spec( time_strt,
+		                                    get_next=get_next )
+
 		self.stop_auto_run = False
 
+		self.nln_cont_prv = None
+		self.nln_cont_cnt = zeros( ( 2, 3 ), dtype=int )
+
 		while ( not self.stop_auto_run ) :
 
 			# Load and analyze (according to the "self.dyn_???"
 			# parameters) the first/next spectrum.
 
-			if ( first_pass ) :
-				first_pass = False
-				self.load_spec( time_req=time_strt,
-				                get_next=get_next   )
-			else :
-				self.load_spec( time_req=self.time_epc,
-				                get_next=True           )
+			self.load_spec( time_req=time_strt,
+			                spec_iter=spec_iter )
 
 			# If no spectrum was able to be loaded, abort.
 
@@ -3357,6 +3749,30 @@ class core( QObject ) :
 				self.stop_auto_run = True
 				break
 
+			# If the analysis is running in continuation mode,
+			# record the cost of this spectrum's non-linear fit, and
+			# retain its results (if it succeeded) for initializing
+			# the next fit.
+
+			if ( self.nln_cont ) :
+
+				if ( self.nln_res_plas.time is None ) :
+
+					self.nln_cont_prv = None
+
+				else :
+
+					k = 1 if ( self.nln_gss_cont ) else 0
+
+					self.nln_cont_cnt[k,:] += [ 1,
+					                  self.nln_res_nfev,
+					                  self.nln_res_njev  ]
+
+					self.nln_cont_prv = (
+					            self.time_val,
+					            array( self.nln_gss_pop ),
+					            self.nln_res_prm           )
+
 			# If requested by the user, check for errors from the
 			# analyses that were run.  If any are found, abort.
 
@@ -3368,8 +3784,8 @@ class core( QObject ) :
 				     ( self.mom_n is None )     ) :
 					self.stop_auto_run = True
 					break
-				if ( ( self.dyn_nln               ) and
-				     ( self.nln_res_ion_n is None )     ) :
+				if ( ( self.dyn_nln                   ) and
+				     ( self.nln_res_plas.time is None )     ) :
 					self.stop_auto_run = True
 					break
 
@@ -3388,19 +3804,299 @@ class core( QObject ) :
 			else :
 				sleep( pause )
 
+		# Discard the results retained for the continuation mode (so
+		# that they do not affect any later analysis), and report the
+		# savings from that mode.
+
+		self.nln_cont_prv = None
+
+		if ( self.nln_cont ) :
+			self.mesg_nln_cont( self.nln_cont_cnt )
+
 		# Message the user that the automated analysis has finished.
 
 		if ( self.stop_auto_run ) :
-			self.emit( SIGNAL('janus_mesg'),
+			self.emit( 'janus_mesg',
 			           'core', 'abort', 'auto' )
 		else :
-			self.emit( SIGNAL('janus_mesg'),
+			self.emit( 'janus_mesg',
 			           'core', 'end'  , 'auto' )
 
 		# Emit a signal that indicates that the automated analysis has
 		# ended.
 
-		self.emit( SIGNAL('janus_done_auto_run') )
+		self.emit( 'janus_done_auto_run' )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR AUTO-RUNNING A RANGE OF SPECTRA IN PARALLEL.
+	#-----------------------------------------------------------------------
+
+	def auto_run_pool( self, t_strt, t_stop,
+	                         get_next=None, err_halt=None, n_proc=None ) :
+
+		# Note.  This function is equivalent to "self.auto_run" except
+		#        that the range of timestamps is split into (at most)
+		#        day-long shards, each of which is analyzed by a
+		#        separate worker process (with its own core and data
+		#        archives).  The results from the shards are merged into
+		#        "self.series".  Spectra are not loaded into this core
+		#        itself, so only the "janus_mesg",
+		#        "janus_prog_auto_run", and "janus_done_auto_run" events
+		#        are emitted.
+
+		# Note.  Just as "self.auto_run" stops at the first spectrum
+		#        that cannot be loaded (e.g., at a gap in the data
+		#        longer than "self.fc_arcv.tol") or, if "err_halt" is
+		#        set, that has an error, a shard that stops before its
+		#        stop time ends the run: its results are kept, but those
+		#        of all later shards are discarded.
+
+		# Note.  This function does not return until the shards have
+		#        been completed, and it checks on them (every 0.1
+		#        seconds) by polling.  Thus, the run can only be aborted
+		#        by some other thread (e.g., that of a user interface)
+		#        setting "self.stop_auto_run", whereupon the workers are
+		#        terminated and only the results from the leading run of
+		#        completed shards are kept.
+
+		# Supply values for any missing keywords.
+
+		get_next = False        if ( get_next is None ) else get_next
+		err_halt = False        if ( err_halt is None ) else err_halt
+		n_proc   = cpu_count( ) if ( n_proc   is None ) else n_proc
+
+		# Message the user that the automated analysis is about to
+		# begin.
+
+		self.emit( 'janus_mesg', 'core', 'begin', 'auto' )
+
+		# Attempt to convert the start and stop timestamps to epoch
+		# times.  If one or more fails, or if the start time does not
+		# strictly precede the stop time, abort.
+
+		time_strt = calc_time_epc( t_strt )
+		time_stop = calc_time_epc( t_stop )
+
+		if ( ( time_strt is None ) or ( time_stop is None ) ) :
+			return
+		elif ( time_strt >= time_stop ) :
+			return
+
+		# Download (concurrently) any missing data files for the range
+		# of timestamps.
+
+		self.dnld_rang( time_strt, time_stop )
+
+		# Split the range of timestamps into shards at each midnight.
+
+		shrd = [ ]
+
+		shrd_strt = time_strt
+
+		while ( True ) :
+
+			shrd_stop = datetime( shrd_strt.year, shrd_strt.month,
+			                      shrd_strt.day ) + timedelta( 1 )
+
+			if ( shrd_stop >= time_stop ) :
+				shrd.append( ( shrd_strt, time_stop ) )
+				break
+
+			shrd.append( ( shrd_strt, shrd_stop ) )
+
+			shrd_strt = shrd_stop
+
+		n_shrd = len( shrd )
+
+		# Collect the settings of this core and of its archives so that
+		# they can be applied to the core of each worker process.
+
+		# Note.  Prefetching is disabled in the workers' archives since
+		#        each worker only analyzes (at most) a single day.
+
+		# Note.  The workers' archives never delete data files (as one
+		#        worker could otherwise delete a file that another is
+		#        reading), and their indices of the data files are
+		#        read-only (see "auto_run_shard").  Instead, once the
+		#        pool has finished, any files that the workers
+		#        downloaded are indexed, and the limits on the data
+		#        directories are enforced, by this core's archives.
+
+		var = dict( [ ( key, getattr( self, key ) ) for key in [
+		        'dyn_mom', 'dyn_gss', 'dyn_sel', 'dyn_nln',
+		        'mom_win_azm_req', 'mom_win_cur_req',
+		        'mom_min_sel_azm', 'mom_min_sel_cur',
+		        'nln_n_spc', 'nln_n_pop', 'nln_pyon',
+		        'nln_pop_use', 'nln_pop_vld',
+		        'nln_set_gss_n', 'nln_set_gss_d', 'nln_set_gss_w',
+		        'nln_set_gss_vld', 'nln_set_sel_a', 'nln_set_sel_b',
+		        'nln_set_sel_vld', 'nln_min_sel', 'nln_vpro',
+		        'nln_slvr', 'nln_cont', 'nln_cont_dt',
+		        'nln_tab_use', 'nln_tab_tol', 'nln_tab_cnv'        ] ] )
+
+		arcv_fc = dict( buf=self.fc_arcv.buf, tol=self.fc_arcv.tol,
+		                n_file_max=float( 'infinity' ),
+		                n_date_max=self.fc_arcv.n_date_max,
+		                n_byte_max=float( 'infinity' ),
+		                use_idl=self.fc_arcv.use_idl,
+		                use_cache=self.fc_arcv.use_cache,
+		                use_pref=False, src=self.fc_arcv.dnld.src,
+		                path=self.fc_arcv.path, verbose=False     )
+
+		arcv_mfi = dict( buf=self.mfi_arcv.buf, tol=self.mfi_arcv.tol,
+		                 use_idl=self.mfi_arcv.use_idl,
+		                 use_k0=self.mfi_arcv.use_k0,
+		                 use_h2=self.mfi_arcv.use_h2,
+		                 n_file_max=float( 'infinity' ),
+		                 n_date_max=self.mfi_arcv.n_date_max,
+		                 n_byte_max=float( 'infinity' ),
+		                 use_cache=self.mfi_arcv.use_cache,
+		                 use_win=self.mfi_arcv.use_win,
+		                 win_dur=self.mfi_arcv.win_dur,
+		                 use_pref=False, src=self.mfi_arcv.dnld.src,
+		                 path=self.mfi_arcv.path, verbose=False     )
+
+		# Submit each shard to the pool of worker processes.
+
+		# Note.  Only the first shard honors the "get_next" keyword, and
+		#        only the last shard retains a spectrum beyond its stop
+		#        time (just as "self.auto_run" does).
+
+		self.stop_auto_run = False
+
+		pool = Pool( processes=n_proc )
+
+		res = [ pool.apply_async( auto_run_shard, ( (
+		             shrd[k][0], shrd[k][1],
+		             ( get_next and ( k == 0 ) ), err_halt,
+		             ( k == 0 ), ( k == ( n_shrd - 1 ) ),
+		             var, arcv_fc, arcv_mfi,
+		             self.bdgt.mem_max                     ), ) )
+		        for k in range( n_shrd )                           ]
+
+		# Wait for the shards to be completed.  If a shard stops short
+		# of its stop time, the results of all later shards are
+		# discarded, so only the earlier shards need to be waited for.
+		# If a request to abort comes from some source other than this
+		# function (e.g., a user), stop waiting.
+
+		ret = [ None ] * n_shrd
+
+		n_done = 0
+		n_need = n_shrd
+
+		try :
+
+			while ( not self.stop_auto_run ) :
+
+				for k in range( n_need ) :
+
+					if ( ( ret[k] is not None ) or
+					     ( not res[k].ready( ) )    ) :
+						continue
+
+					# Note.  If the worker process raised an
+					#        exception, the shard is treated
+					#        as having halted (with no
+					#        results).
+
+					try :
+						ret[k] = res[k].get( )
+					except Exception :
+						ret[k] = ( [ ], True,
+						           zeros( ( 2, 3 ),
+						                  dtype=int ) )
+
+					n_done += 1
+
+					self.emit( 'janus_prog_auto_run',
+					           n_done, n_shrd        )
+
+					if ( ret[k][1] ) :
+						n_need = min( n_need, k + 1 )
+
+				if ( None not in ret[0:n_need] ) :
+					break
+
+				sleep( 0.1 )
+
+		finally :
+
+			pool.terminate( )
+			pool.join( )
+
+			for arcv in [ self.fc_arcv, self.mfi_arcv ] :
+				if ( arcv.indx is not None ) :
+					arcv.indx.scan_indx( )
+				arcv.cleanup_file( )
+
+		# Merge the results from the leading run of completed shards
+		# into the results log (in time order), up to and including the
+		# first that stopped short of its stop time.  The results from
+		# any later shards are discarded (so that, as with
+		# "self.auto_run", the results are always a contiguous run of
+		# spectra).
+
+		n_merg = 0
+
+		while ( ( n_merg < n_need ) and ( ret[n_merg] is not None ) ) :
+			self.series.add_arr( ret[n_merg][0] )
+			n_merg += 1
+
+		if ( ( n_merg < n_shrd ) or ( ret[n_shrd-1][1] ) ) :
+			self.stop_auto_run = True
+
+		# Report the savings from the continuation mode (summed over
+		# the completed shards).
+
+		if ( self.nln_cont ) :
+
+			cnt = zeros( ( 2, 3 ), dtype=int )
+
+			for k in range( n_merg ) :
+				cnt += ret[k][2]
+
+			self.mesg_nln_cont( cnt )
+
+		# Message the user that the automated analysis has finished.
+
+		if ( self.stop_auto_run ) :
+			self.emit( 'janus_mesg', 'core', 'abort', 'auto' )
+		else :
+			self.emit( 'janus_mesg', 'core', 'end'  , 'auto' )
+
+		# Emit a signal that indicates that the automated analysis has
+		# ended.
+
+		self.emit( 'janus_done_auto_run' )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR REPORTING THE SAVINGS OF CONTINUATION MODE.
+	#-----------------------------------------------------------------------
+
+	def mesg_nln_cont( self, cnt ) :
+
+		# Note.  The argument "cnt" has the format of
+		#        "self.nln_cont_cnt".  The savings are estimated by
+		#        comparing the average cost of the fits initialized
+		#        from the previous fit with that of those initialized
+		#        from the moments.
+
+		( n_cold, n_warm ) = ( int( cnt[0,0] ), int( cnt[1,0] ) )
+
+		txt = 'NLN warm starts: {:d} of {:d} fits'.format(
+		                                      n_warm, n_cold + n_warm )
+
+		if ( ( n_cold > 0 ) and ( n_warm > 0 ) ) :
+
+			sav_itr = n_warm * cnt[0,2] / float( n_cold ) - cnt[1,2]
+			sav_evl = n_warm * cnt[0,1] / float( n_cold ) - cnt[1,1]
+
+			txt += ( '; est. savings: {:.0f} iter., ' +
+			         '{:.0f} eval.'                     ).format(
+			                                     sav_itr, sav_evl )
+
+		self.emit( 'janus_mesg', 'core', 'cont', txt )
 
 	#-----------------------------------------------------------------------
 	# DEFINE THE FUNCTION FOR SAVING THE RESULTS LOG TO A FILE.
@@ -3410,7 +4106,7 @@ class core( QObject ) :
 
 		# Message the user that a save is about to begin.
 
-		self.emit( SIGNAL('janus_mesg'), 'core', 'begin', 'save' )
+		self.emit( 'janus_mesg', 'core', 'begin', 'save' )
 
 		# Try to create a new output file to hold the log of analysis
 		# results.  If this fails, message the user and abort.
@@ -3418,7 +4114,7 @@ class core( QObject ) :
 		try :
 			fl = open( nm_fl, 'wb' )
 		except :
-			self.emit( SIGNAL('janus_mesg'),
+			self.emit( 'janus_mesg',
 			           'core', 'fail', 'save' )
 
 		# Save the results log to the output file.
@@ -3431,12 +4127,12 @@ class core( QObject ) :
 
 		# Message the user that the save was successful.
 
-		self.emit( SIGNAL('janus_mesg'), 'core', 'end', 'save' )
+		self.emit( 'janus_mesg', 'core', 'end', 'save' )
 
 		# If requested, exit the application.
 
 		if ( exit ) :
-			self.emit( SIGNAL('janus_exit') )
+			self.emit( 'janus_exit' )
 
 	#-----------------------------------------------------------------------
 	# DEFINE THE FUNCTION FOR EXPORTING THE RESULTS TO A TEXT FILE.
@@ -3446,7 +4142,7 @@ class core( QObject ) :
 
 		# Message the user that an export is about to begin.
 
-		self.emit( SIGNAL('janus_mesg'), 'core', 'begin', 'xprt' )
+		self.emit( 'janus_mesg', 'core', 'begin', 'xprt' )
 
 		# Try to create a new output file to hold the log of analysis
 		# results in plain text.  If this fails, message the user and
@@ -3455,7 +4151,7 @@ class core( QObject ) :
 		try :
 			fl = open( nm_fl, 'w' )
 		except :
-			self.emit( SIGNAL('janus_mesg'),
+			self.emit( 'janus_mesg',
 			           'core', 'fail', 'xprt' )
 
 		# Define the format for numerical quantities.
@@ -3654,9 +4350,70 @@ class core( QObject ) :
 
 		# Message the user that the export was successful.
 
-		self.emit( SIGNAL('janus_mesg'), 'core', 'end', 'xprt' )
+		self.emit( 'janus_mesg', 'core', 'end', 'xprt' )
 
 		# If requested, exit the application.
 
 		if ( exit ) :
-			self.emit( SIGNAL('janus_exit') )
+			self.emit( 'janus_exit' )
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR AUTO-RUNNING A SHARD IN A WORKER PROCESS.
+################################################################################
+
+def auto_run_shard( arg ) :
+
+	# Note.  This function is run by each worker process of
+	#        "core.auto_run_pool".  It is defined at the module level so
+	#        that it can be passed to those processes.
+
+	# Extract the shard's timestamps, keywords, and settings.
+
+	( time_strt, time_stop, get_next, err_halt,
+	  keep_strt, keep_stop, var, arcv_fc, arcv_mfi, mem_max ) = arg
+
+	# Initialize a core (with no event sink) with data archives that have
+	# the settings of the parent core's (but whose indices of the data
+	# files are read-only; see "core.auto_run_pool"), and apply the
+	# parent core's other settings.
+
+	# Note.  The memory budget applies to each worker process
+	#        separately.
+
+	cr = core( mem_max=mem_max, arcv_fc=arcv_fc, arcv_mfi=arcv_mfi )
+
+	for arcv in [ cr.fc_arcv, cr.mfi_arcv ] :
+		if ( arcv.indx is not None ) :
+			arcv.indx.rd_only = True
+
+	for ( key, val ) in var.items( ) :
+		setattr( cr, key, val )
+
+	# Run the automated analysis on the shard.
+
+	cr.auto_run( time_strt, time_stop,
+	             get_next=get_next, err_halt=err_halt, pause=0 )
+
+	# Determine whether the analysis stopped before reaching the shard's
+	# stop time, either on an error or since a spectrum could not be
+	# loaded (e.g., at a gap in the data, or at the end of the data).
+
+	# Note.  Since "self.auto_run" would stop there as well, the run
+	#        ends with this shard (see "core.auto_run_pool").
+
+	halt = cr.stop_auto_run
+
+	# Return the results from the spectra that belong to this shard, the
+	# indicator of a stop, and the costs of the non-linear fits (see
+	# "core.auto_run").
+
+	# Note.  The first spectrum analyzed may precede the shard's start
+	#        time, and the last may follow its stop time.  Such spectra
+	#        are instead retained by the neighboring shards.
+
+	ret = [ p for p in cr.series.arr
+	        if ( ( ( keep_strt ) or ( p.time >= time_strt ) ) and
+	             ( ( keep_stop ) or ( p.time <  time_stop ) )     ) ]
+
+	return ( ret, halt, cr.nln_cont_cnt )
@@ -0,0 +1,350 @@
+################################################################################
+##
+## Janus -- GUI Software for Processing Thermal-Ion Measurements from the
+##          Wind Spacecraft's Faraday Cups
+##
+## Copyright (C) 2016 Bennett A. Maruca (bmaruca@udel.edu)
+##
+## This program is free software: you can redistribute it and/or modify it under
+## the terms of the GNU General Public License as published by the Free Software
+## Foundation, either version 3 of the License, or (at your option) any later
+## version.
+##
+## This program is distributed in the hope that it will be useful, but WITHOUT
+## ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+## FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+## details.
+##
+## You should have received a copy of the GNU General Public License along with
+## this program.  If not, see http://www.gnu.org/licenses/.
+##
+################################################################################
+
+
+
+################################################################################
+## LOAD THE NECESSARY MODULES.
+################################################################################
+
+# Load the modules necessary for file I/O (including FTP).
+
+import os
+
+from fnmatch import fnmatch
+
+from ftplib import FTP
+
+from shutil import copyfile
+
+# Load the modules necessary for running concurrent downloads.
+
+from threading import Lock, Thread, current_thread
+
+from time import sleep
+
+
+################################################################################
+## DEFINE THE "dnld_mngr" CLASS FOR DOWNLOADING DATA FILES.
+################################################################################
+
+## +----------+----------------------------------------------------------------+
+## |          |                                                                |
+## | Argument | Comments                                                       |
+## |          |                                                                |
+## +----------+----------------------------------------------------------------+
+## |          |                                                                |
+## | src      | Source of the data files: either an FTP server (given as       |
+## |          | "ftp://host" or "ftp://host:port") or a local directory that   |
+## |          | mirrors the server's directory tree                            |
+## |          |                                                                |
+## | n_conn   | Maximum number of concurrent downloads (and thus of pooled FTP |
+## |          | connections)                                                   |
+## |          |                                                                |
+## | n_try    | Number of attempts made to download each file                  |
+## |          |                                                                |
+## | wait     | Wait [s] before the first retry (which doubles for each        |
+## |          | subsequent retry)                                              |
+## |          |                                                                |
+## | rdir     | Directory on the source (e.g.,                                 |
+## |          | "pub/data/wind/mfi/mfi_h0/2001")                               |
+## |          |                                                                |
+## | pat      | File-name pattern (e.g., "wi_h0_mfi_20010304_v??.cdf"); if     |
+## |          | several files match, the last (i.e., latest version) is used   |
+## |          |                                                                |
+## | path     | Local directory into which the file is downloaded              |
+## |          |                                                                |
+## +----------+----------------------------------------------------------------+
+
+class dnld_mngr( object ) :
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE INITIALIZATION FUNCTION.
+	#-----------------------------------------------------------------------
+
+	def __init__( self, src=None, n_conn=4, n_try=3, wait=1. ) :
+
+		# Save the arguments for later use.  If no source has been
+		# specified, use CDAWeb.
+
+		if ( src is None ) :
+			self.src = 'ftp://cdaweb.gsfc.nasa.gov'
+		else :
+			self.src = src
+
+		self.n_conn = n_conn
+		self.n_try  = n_try
+		self.wait   = wait
+
+		# Initialize the pool of idle FTP connections and the dictionary
+		# of directory listings (which are requested from the source
+		# only once).
+
+		# Note.  Both are shared by the threads of "self.get_rang" and
+		#        so are only accessed while holding "self.lock".
+
+		self.lock = Lock( )
+
+		self.conn = [ ]
+		self.lst  = { }
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR TAKING AN FTP CONNECTION FROM THE POOL.
+	#-----------------------------------------------------------------------
+
+	def open_conn( self ) :
+
+		# If an idle connection is available, return it.
+
+		with self.lock :
+			if ( len( self.conn ) > 0 ) :
+				return self.conn.pop( )
+
+		# Otherwise, open (and return) a new connection.
+
+		host = self.src[6:].split( '/' )[0]
+
+		if ( ':' in host ) :
+			( host, port ) = host.split( ':' )
+			port = int( port )
+		else :
+			port = 21
+
+		ftp = FTP( )
+
+		ftp.connect( host, port )
+		ftp.login( )
+
+		return ftp
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR RETURNING AN FTP CONNECTION TO THE POOL.
+	#-----------------------------------------------------------------------
+
+	def free_conn( self, ftp, fail=False ) :
+
+		# If the connection failed or if the pool is already full, close
+		# the connection; otherwise, add it to the pool.
+
+		if ( not fail ) :
+			with self.lock :
+				if ( len( self.conn ) < self.n_conn ) :
+					self.conn.append( ftp )
+					return
+
+		try :
+			ftp.close( )
+		except :
+			pass
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR LISTING A DIRECTORY ON THE SOURCE.
+	#-----------------------------------------------------------------------
+
+	def list_dir( self, rdir ) :
+
+		# If the directory has already been listed, return that listing.
+
+		with self.lock :
+			if ( rdir in self.lst ) :
+				return self.lst[rdir]
+
+		# List the directory (either locally or via FTP).
+
+		if ( not self.src.startswith( 'ftp://' ) ) :
+
+			lst = os.listdir( os.path.join( self.src, rdir ) )
+
+		else :
+
+			ftp = self.open_conn( )
+
+			try :
+				ftp.cwd( '/' + rdir )
+				lst = ftp.nlst( )
+			except :
+				self.free_conn( ftp, fail=True )
+				raise
+
+			self.free_conn( ftp )
+
+		# Save and return the (sorted) listing.
+
+		lst = sorted( [ os.path.basename( fl ) for fl in lst ] )
+
+		with self.lock :
+			self.lst[rdir] = lst
+
+		return lst
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR COPYING A FILE FROM THE SOURCE.
+	#-----------------------------------------------------------------------
+
+	def copy_file( self, rdir, fl, fl_path ) :
+
+		# Copy the file (either locally or via FTP) to "fl_path".
+
+		if ( not self.src.startswith( 'ftp://' ) ) :
+
+			copyfile( os.path.join( self.src, rdir, fl ), fl_path )
+
+		else :
+
+			ftp = self.open_conn( )
+
+			try :
+				ftp.cwd( '/' + rdir )
+				with open( fl_path, 'wb' ) as fl_obj :
+					ftp.retrbinary( 'RETR ' + fl,
+					                fl_obj.write  )
+			except :
+				self.free_conn( ftp, fail=True )
+				raise
+
+			self.free_conn( ftp )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR DOWNLOADING A SINGLE FILE.
+	#-----------------------------------------------------------------------
+
+	def get_file( self, rdir, pat, path ) :
+
+		# Note.  The file is first written to a temporary (hidden) file,
+		#        which is then renamed.  Thus, a partially downloaded
+		#        file is never read (or matched by the archives'
+		#        "glob" patterns).
+
+		# Make (at most "self.n_try") attempts to download the file,
+		# waiting progressively longer between them.  Return the path of
+		# the downloaded file or, if every attempt fails, "None".
+
+		for i in range( self.n_try ) :
+
+			if ( i > 0 ) :
+				sleep( self.wait * ( 2. ** ( i - 1 ) ) )
+
+			tmp_path = None
+
+			try :
+
+				# Find the (latest) file matching the pattern.
+				# If there is none, abort (as retrying won't
+				# help).
+
+				lst = [ fl for fl in self.list_dir( rdir )
+				        if fnmatch( fl, pat )              ]
+
+				if ( len( lst ) == 0 ) :
+					return None
+
+				fl = lst[-1]
+
+				fl_path = os.path.join( path, fl )
+
+				# If the file has already been downloaded (e.g.,
+				# by another thread), return its path.
+
+				if ( os.path.isfile( fl_path ) ) :
+					return fl_path
+
+				# Download the file to a temporary file, and
+				# then rename that.
+
+				tmp_name = '.{}.tmp{:d}.{}'.format( fl,
+				                   os.getpid( ),
+				                   current_thread( ).name )
+
+				tmp_path = os.path.join( path, tmp_name )
+
+				self.copy_file( rdir, fl, tmp_path )
+
+				os.rename( tmp_path, fl_path )
+
+				return fl_path
+
+			except :
+
+				# Remove any partially downloaded file and any
+				# (possibly stale) listing of the directory.
+
+				if ( ( tmp_path is not None ) and
+				     ( os.path.isfile( tmp_path ) ) ) :
+					os.remove( tmp_path )
+
+				with self.lock :
+					self.lst.pop( rdir, None )
+
+		return None
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR DOWNLOADING A SET OF FILES CONCURRENTLY.
+	#-----------------------------------------------------------------------
+
+	def get_rang( self, req ) :
+
+		# Note.  The argument "req" is a list of "( rdir, pat, path )"
+		#        tuples (see "self.get_file").  The files are
+		#        downloaded by (at most) "self.n_conn" threads, and a
+		#        list of their local paths (with "None" for each file
+		#        that could not be downloaded) is returned.
+
+		n_req = len( req )
+
+		ret = [ None ] * n_req
+		nxt = [ 0 ]
+
+		# Start the threads, each of which downloads files until none
+		# remain, and wait for them to finish.
+
+		thr = [ Thread( target=self.get_work, args=( req, ret, nxt ) )
+		        for t in range( min( self.n_conn, n_req ) )           ]
+
+		for t in thr :
+			t.start( )
+
+		for t in thr :
+			t.join( )
+
+		# Return the list of local paths.
+
+		return ret
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION RUN BY EACH THREAD OF "self.get_rang".
+	#-----------------------------------------------------------------------
+
+	def get_work( self, req, ret, nxt ) :
+
+		# Repeatedly claim the next unclaimed request and download its
+		# file until no requests remain.
+
+		while ( True ) :
+
+			with self.lock :
+				i = nxt[0]
+				nxt[0] += 1
+
+			if ( i >= len( req ) ) :
+				return
+
+			ret[i] = self.get_file( *req[i] )
@@ -25,22 +25,19 @@
 ## LOAD THE NECESSARY MODULES.
 ################################################################################
 
-# Load the necessary modules for signaling the graphical interface.
-
-from PyQt4.QtCore import SIGNAL
-
 # Load the modules necessary handling dates and times.
 
 from datetime import datetime, timedelta
 
-from janus_time import calc_time_str, calc_time_val, calc_time_epc
+from janus_time import calc_time_str, calc_time_val, calc_time_epc, \
+                       calc_time_val_arr
 
 # Load the necessary "numpy" array modules.
 
-from numpy import abs, amax, amin, append, arange, argsort, array, tile, \
-                  transpose, where
+from numpy import abs, amax, amin, append, arange, argsort, array, \
+                  concatenate, floor, searchsorted, tile, transpose, where
 
-# Load the modules necessary for file I/O (including FTP).
+# Load the modules necessary for file I/O.
 
 from spacepy import pycdf
 
@@ -48,10 +45,51 @@ import os.path
 
 from glob import glob
 
-from ftplib import FTP
-
 from scipy.io.idl import readsav
 
+# Load the module necessary for preprocessing the spectra.
+
+from janus_fc_prep import calc_vel_bin, calc_n_vel
+
+# Load the module necessary for caching converted data.
+
+from janus_cache import cache_bdgt, calc_cache_byte, drop_cache, load_cache, \
+                        save_cache
+
+# Load the module necessary for downloading data files.
+
+from janus_dnld import dnld_mngr
+
+# Load the module necessary for indexing the data directory.
+
+from janus_indx import file_indx
+
+# Load the modules necessary for prefetching data in the background.
+
+from threading import Thread
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR COMBINING THE CURRENTS FROM AN IDL "SAVE" FILE.
+################################################################################
+
+def calc_idl_cur( cur ) :
+
+	# Note.  The argument "cur" is the array of currents (in amperes) read
+	#        from an IDL "SAVE" file, whose axes are the spectrum, the
+	#        half-cup, the look direction, and the velocity window.  The
+	#        currents of the two halves of each cup are summed, and the
+	#        last two axes are swapped (for all spectra at once).  The
+	#        resulting currents (in picoamperes) of cups 1 and 2 are
+	#        returned.
+
+	sub_cup1_cur = 1E12 * transpose( cur[:,0,:,:] + cur[:,2,:,:],
+	                                 ( 0, 2, 1 )                  )
+	sub_cup2_cur = 1E12 * transpose( cur[:,1,:,:] + cur[:,3,:,:],
+	                                 ( 0, 2, 1 )                  )
+
+	return ( sub_cup1_cur, sub_cup2_cur )
+
 
 ################################################################################
 ## DEFINE THE "fc_arcv" CLASS FOR ACCESSING THE ARCHIVE OF Wind/FC SPECTRA.
@@ -65,7 +103,9 @@ class fc_arcv( object ) :
 
 	def __init__( self, core=None, buf=3600., tol=3600.,
 	                    n_file_max=None, n_date_max=None,
-	                    use_idl=False, path=None, verbose=True ) :
+	                    use_idl=False, path=None, verbose=True,
+	                    use_cache=True, use_pref=True, src=None,
+	                    bdgt=None, n_byte_max=None              ) :
 
 		# Save the arguments for later use.
 
@@ -75,8 +115,27 @@ class fc_arcv( object ) :
 		self.path       = path
 		self.n_file_max = n_file_max
 		self.n_date_max = n_date_max
+		self.n_byte_max = n_byte_max
 		self.use_idl    = use_idl
 		self.verbose    = verbose
+		self.use_cache  = use_cache
+		self.use_pref   = use_pref
+
+		# Initialize the manager for downloading data files (by default,
+		# from CDAWeb).
+
+		self.dnld = dnld_mngr( src=src )
+
+		# Save the memory budget of the loaded dates (which may be
+		# shared with other archives) or, if none was provided,
+		# initialize one (with no limit).
+
+		if ( bdgt is None ) :
+			self.bdgt = cache_bdgt( )
+		else :
+			self.bdgt = bdgt
+
+		self.mem_rprt = False
 
 		# Validate the values of the "self.max_*" parameters and, if
 		# necessary, provide values for them.
@@ -106,6 +165,17 @@ class fc_arcv( object ) :
 			self.path = os.path.join( os.path.dirname( __file__ ),
 			                          'data', 'fc'                 )
 
+		# Initialize the index of the CDF files in the data directory
+		# (which also limits the number and total size of those files).
+
+		if ( self.use_idl ) :
+			self.indx = None
+		else :
+			self.indx = file_indx( self.path,
+			                       'wi_sw-ion-dist_swe-faraday',
+			                       n_file_max=self.n_file_max,
+			                       n_byte_max=self.n_byte_max    )
+
 		# Initialize the array of dates loaded.
 
 		self.date_str = array( [ ] )
@@ -114,22 +184,37 @@ class fc_arcv( object ) :
 		self.n_date = 0
 		self.t_date = 0
 
-		# Initialize the arrays that will store the data from the loaded
-		# spectra.
+		# Initialize the dictionary of "chunks" of data from the loaded
+		# dates (see "self.load_date") and the sorted index of the
+		# spectra therein (see "self.calc_indx").
+
+		# Note.  The timestamp of each spectrum is stored as a value
+		#        (see "janus_time"); it is only converted to a
+		#        "datetime" epoch when the spectrum is returned.
+
+		self.fc_chnk = { }
 
-		self.fc_time_epc   = tile(  0., ( 0 ) )
-		self.fc_cup1_azm   = tile(  0., ( 0, 20 ) )
-		self.fc_cup2_azm   = tile(  0., ( 0, 20 ) )
-		self.fc_cup1_c_vol = tile(  0., ( 0, 31 ) )
-		self.fc_cup2_c_vol = tile(  0., ( 0, 31 ) )
-		self.fc_cup1_d_vol = tile(  0., ( 0, 31 ) )
-		self.fc_cup2_d_vol = tile(  0., ( 0, 31 ) )
-		self.fc_cup1_cur   = tile(  0., ( 0, 20, 31 ) )
-		self.fc_cup2_cur   = tile(  0., ( 0, 20, 31 ) )
-		self.fc_ind        = tile( -1 , ( 0 ) )
+		self.fc_chnk_arr = [ 'time_val',
+		                     'cup1_azm'  , 'cup2_azm'  ,
+		                     'cup1_c_vol', 'cup2_c_vol',
+		                     'cup1_d_vol', 'cup2_d_vol',
+		                     'cup1_cur'  , 'cup2_cur'    ]
+
+		self.fc_time_val = tile( 0., 0 )
+		self.fc_chnk_key = [ ]
+		self.fc_chnk_ind = tile( -1, 0 )
+		self.fc_chnk_row = tile( -1, 0 )
 
 		self.n_fc = 0
 
+		# Initialize the dictionary of dates being prefetched (see
+		# "self.pref_date") and the time of the spectrum near which
+		# they were requested.
+
+		self.fc_pref = { }
+
+		self.pref_time = None
+
 	#-----------------------------------------------------------------------
 	# DEFINE THE FUNCTION FOR RETURNING THE NUMBER OF LOADED SPECTRA.
 	#-----------------------------------------------------------------------
@@ -149,22 +234,38 @@ class fc_arcv( object ) :
 		if ( ( tmin is None ) and ( tmax is None ) ) :
 			return self.n_fc
 
-		# Identify the subset of spectra with timestamps between "tmin"
-		# and "tmax" and return the size of that subset.
+		# Identify the range of spectra with timestamps between "tmin"
+		# and "tmax" and return the size of that range.
 
-		if ( tmin is not None ) :
-			con_tmin = ( self.fc_time_epc >= calc_time_epc( tmin ) )
-		else :
-			con_tmin = tile( True, self.n_fc )
+		( i_min, i_max ) = self.calc_rang( tmin, tmax )
+
+		return ( i_max - i_min )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR FINDING THE RANGE OF SPECTRA IN AN INTERVAL.
+	#-----------------------------------------------------------------------
+
+	def calc_rang( self, tmin=None, tmax=None ) :
 
-		if ( tmax is not None ) :
-			con_tmax = ( self.fc_time_epc <= calc_time_epc( tmax ) )
+		# Return the indices (in the sorted index) of the first spectrum
+		# with a timestamp at or after "tmin" and of the one after the
+		# last with a timestamp at or before "tmax".
+
+		if ( tmin is None ) :
+			i_min = 0
 		else :
-			con_tmax = tile( True, self.n_fc )
+			i_min = searchsorted( self.fc_time_val,
+			                      calc_time_val( tmin ),
+			                      side='left'            )
 
-		tk_con = where( con_tmin & con_tmax )[0]
+		if ( tmax is None ) :
+			i_max = self.n_fc
+		else :
+			i_max = searchsorted( self.fc_time_val,
+			                      calc_time_val( tmax ),
+			                      side='right'           )
 
-		return len( tk_con )
+		return ( i_min, max( i_min, i_max ) )
 
 	#-----------------------------------------------------------------------
 	# DEFINE THE FUNCTION FOR LOADING (AND RETURNING) AN ION SPECTRUM.
@@ -183,7 +284,6 @@ class fc_arcv( object ) :
 
 		time_req_str = calc_time_str( time )
 		time_req_val = calc_time_val( time )
-		time_req_epc = calc_time_epc( time )
 
 		# Extract requested date (as a string) and the requested time
 		# (as a float indicating seconds since midnight).  Likewise,
@@ -219,92 +319,67 @@ class fc_arcv( object ) :
 			self.mesg_txt( 'none' )
 			return None
 
-		# Identify the subset of spectra with timestamps between "tmin"
+		# Identify the range of spectra with timestamps between "tmin"
 		# and "tmax".
 
-		if ( tmin is not None ) :
-			con_tmin = ( self.fc_time_epc >= calc_time_epc( tmin ) )
-		else :
-			con_tmin = tile( True, self.n_fc )
-
-		if ( tmax is not None ) :
-			con_tmax = ( self.fc_time_epc <= calc_time_epc( tmax ) )
-		else :
-			con_tmax = tile( True, self.n_fc )
-
-		tk_con = where( con_tmin & con_tmax )[0]
+		( i_min, i_max ) = self.calc_rang( tmin, tmax )
 
 		# If no spectra had timestamps in the specified range, abort.
 
-		if ( len( tk_con ) <= 0 ) :
+		if ( i_max <= i_min ) :
 			self.mesg_txt( 'none' )
 			return None
 
-		# Compute the time difference between the timestamps within the
-		# "tm??" range and the requested time.  Identify the index of
-		# the smallest absolute in this array and the index of the
-		# corresponding spectrum.
+		# Identify the spectrum (within the "tm??" range) with the
+		# timestamp closest to the requested time.  It must be one of
+		# the two spectra that straddle the requested time in the
+		# sorted index.  If the two are equally close, select the
+		# earlier one.
 
-		dt = array( [ ( epc - time_req_epc ).total_seconds( )
-		              for epc in self.fc_time_epc[tk_con]     ] )
+		i = searchsorted( self.fc_time_val, time_req_val, side='left' )
 
-		dt_abs = abs( dt )
+		i_a = min( max( i - 1, i_min ), i_max - 1 )
+		i_b = min( max( i    , i_min ), i_max - 1 )
 
-		dt_abs_min = amin( dt_abs )
-
-		tk_dt = where( dt_abs == dt_abs_min )[0][0]
-
-		tk_req = tk_con[tk_dt]
-
-		# Set the spectrum with index "tk_req" to be returned.  If the
-		# (chronologically) next or previous spectrum has been
-		# requested, find it and set it to be returned instead.
+		if ( abs( self.fc_time_val[i_b] - time_req_val ) <
+		     abs( self.fc_time_val[i_a] - time_req_val )   ) :
+			tk = i_b
+		else :
+			tk = i_a
 
-		tk = tk_req
+		# If the (chronologically) next or previous spectrum has been
+		# requested, find it and select it instead.
 
 		if ( ( get_prev ) and ( not get_next ) ) :
 
-			tk_sub = where( dt < dt[tk_dt] )[0]
+			tk = searchsorted( self.fc_time_val,
+			                   self.fc_time_val[tk],
+			                   side='left'           ) - 1
 
-			if ( len( tk_sub ) <= 0 ) :
+			if ( tk < i_min ) :
 				self.mesg_txt( 'none' )
 				return None
 
-			tk_dt_prev = where( dt == amax( dt[tk_sub] ) )[0][0]
-
-			tk = tk_con[tk_dt_prev]
-
 		if ( ( get_next ) and ( not get_prev ) ) :
 
-			tk_sub = where( dt > dt[tk_dt] )[0]
+			tk = searchsorted( self.fc_time_val,
+			                   self.fc_time_val[tk],
+			                   side='right'          )
 
-			if ( len( tk_sub ) <= 0 ) :
+			if ( tk >= i_max ) :
 				self.mesg_txt( 'none' )
 				return None
 
-			tk_dt_next = where( dt == amin( dt[tk_sub] ) )[0][0]
-
-			tk = tk_con[tk_dt_next]
-
 		# If the selected spectrum is not within the the request
 		# tolerence, abort.
 
-		if ( abs( ( self.fc_time_epc[tk] - time_req_epc
-		                             ).total_seconds( ) ) > self.tol ) :
+		if ( abs( self.fc_time_val[tk] - time_req_val ) > self.tol ) :
 			self.mesg_txt( 'none' )
 			return None
 
-		# Extract the spectrum to be returned.
+		# Extract the spectrum to be returned from its chunk.
 
-		ret_time_epc = self.fc_time_epc[tk]
-		ret_cup1_azm = self.fc_cup1_azm[tk]
-		ret_cup2_azm = self.fc_cup2_azm[tk]
-		ret_cup1_c_vol = self.fc_cup1_c_vol[tk]
-		ret_cup2_c_vol = self.fc_cup2_c_vol[tk]
-		ret_cup1_d_vol = self.fc_cup1_d_vol[tk]
-		ret_cup2_d_vol = self.fc_cup2_d_vol[tk]
-		ret_cup1_cur = self.fc_cup1_cur[tk]
-		ret_cup2_cur = self.fc_cup2_cur[tk]
+		ret = self.calc_spec( tk )
 
 		# Request a cleanup of the data loaded into this archive.
 
@@ -312,11 +387,184 @@ class fc_arcv( object ) :
 
 		# Return the selected spetrum to the user.
 
+		return ret
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR ITERATING OVER A RANGE OF SPECTRA.
+	#-----------------------------------------------------------------------
+
+	def iter_spec( self, time_strt, time_stop=None, get_next=False ) :
+
+		# Note.  This function is a generator.  It yields the spectrum
+		#        that "self.load_spec( time_strt, get_next=get_next )"
+		#        would return and then each subsequent spectrum (in
+		#        chronological order) until it reaches one that
+		#        follows "time_stop" (if specified) or one that is more
+		#        than "self.tol" seconds after the previous one (i.e.,
+		#        the one that "self.load_spec" would not return with
+		#        "get_next=True").  Each date is loaded only once the
+		#        spectra approach it, and each date is dropped from
+		#        this archive once they have passed it (by more than
+		#        "self.buf" seconds).  Thus, each step costs only a
+		#        binary search of the sorted index of spectra, and the
+		#        number of loaded dates remains small.
+
+		# Convert the stop time to a value.
+
+		if ( time_stop is None ) :
+			time_stop_val = float( 'infinity' )
+		else :
+			time_stop_val = calc_time_val( time_stop )
+
+		# Load the first spectrum.  If none could be loaded, abort.
+
+		spec = self.load_spec( time_strt, get_next=get_next )
+
+		if ( spec is None ) :
+			return
+
+		time_val = calc_time_val( spec[0] )
+
+		# Initialize the list of the dates (as the values of their
+		# midnights) that have been loaded (or, at least, attempted).
+
+		# Note.  Each date's value is computed directly (rather than
+		#        from its string) since values do not count leap
+		#        seconds.
+
+		# Note.  Each of these dates is pinned in the memory budget
+		#        until the spectra have passed it.  Otherwise, a date
+		#        loaded ahead of the spectra (or the current one) could
+		#        be dropped as the least recently used while the
+		#        caller loads other data (e.g., from "mfi_arcv") and
+		#        would then not be loaded again.
+
+		date_done = [ ]
+
+		# Yield each spectrum in turn.
+
+		try :
+
+			while ( time_val <= time_stop_val ) :
+
+				self.load_near( time_val, date_done )
+
+				yield spec
+
+				# Find the next spectrum.  If there is none
+				# (within "self.tol" of this one), abort.
+
+				i = searchsorted( self.fc_time_val, time_val,
+				                  side='right'               )
+
+				if ( ( i >= self.n_fc ) or
+				     ( self.fc_time_val[i] - time_val >
+				                               self.tol   ) ) :
+					self.mesg_txt( 'none' )
+					return
+
+				time_val = self.fc_time_val[i]
+
+				spec = self.calc_spec( i )
+
+		# Once the iteration has ended (or been abandoned), unpin the
+		# remaining dates.
+
+		finally :
+
+			for date_val in date_done :
+				date_str = calc_time_str( date_val )[0:10]
+				self.bdgt.unpin_item( self, date_str )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR LOADING THE DATES NEAR A SPECTRUM.
+	#-----------------------------------------------------------------------
+
+	def load_near( self, time_val, date_done ) :
+
+		# Note.  This function is a helper of "self.iter_spec", whose
+		#        list of the dates (as the values of their midnights)
+		#        that have been loaded (or, at least, attempted) is
+		#        "date_done".
+
+		# Load (and pin) any dates that could contain the spectrum that
+		# follows the one at "time_val" (i.e., those within "self.tol"
+		# of it) and that have not already been loaded.
+
+		date_val = 86400. * floor( time_val / 86400. )
+		date_new = False
+
+		while ( date_val <= ( time_val + self.tol ) ) :
+
+			if ( date_val not in date_done ) :
+
+				date_done.append( date_val )
+				date_new = True
+
+				date_str = calc_time_str( date_val )[0:10]
+
+				self.bdgt.pin_item( self, date_str )
+
+				self.load_date( date_str )
+
+			date_val += 86400.
+
+		# If any date was just loaded, drop (and unpin) any dates that
+		# the spectra have passed.
+
+		if ( date_new ) :
+
+			for date_str in self.date_str.tolist( ) :
+
+				date_val = calc_time_val( date_str )
+
+				if ( date_val + 86400. + self.buf < time_val ) :
+					self.drop_date( date_str )
+					self.bdgt.unpin_item( self, date_str )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR EXTRACTING A SPECTRUM FROM ITS CHUNK.
+	#-----------------------------------------------------------------------
+
+	def calc_spec( self, i ) :
+
+		# Locate the "i"-th spectrum (in the sorted index) in its
+		# chunk.
+
+		date_str = self.fc_chnk_key[self.fc_chnk_ind[i]]
+
+		chnk = self.fc_chnk[date_str]
+		row  = self.fc_chnk_row[i]
+
+		# Record this use of the date (for the memory budget).
+
+		self.bdgt.use_item( self, date_str )
+
+		# Extract and return the spectrum.
+
+		# Note.  The arrays returned are (read-only) views into the
+		#        chunk.
+
+		ret_time_epc = calc_time_epc( float( self.fc_time_val[i] ) )
+		ret_cup1_azm = chnk['cup1_azm'][row]
+		ret_cup2_azm = chnk['cup2_azm'][row]
+		ret_cup1_c_vol = chnk['cup1_c_vol'][row]
+		ret_cup2_c_vol = chnk['cup2_c_vol'][row]
+		ret_cup1_d_vol = chnk['cup1_d_vol'][row]
+		ret_cup2_d_vol = chnk['cup2_d_vol'][row]
+		ret_cup1_cur = chnk['cup1_cur'][row]
+		ret_cup2_cur = chnk['cup2_cur'][row]
+		ret_vel_cen  = chnk['vel_cen'][row]
+		ret_vel_wid  = chnk['vel_wid'][row]
+		ret_n_vel    = int( chnk['n_vel'][row] )
+
 		return ( ret_time_epc  ,
 		         ret_cup1_azm  , ret_cup2_azm  ,
 		         ret_cup1_c_vol, ret_cup2_c_vol,
 		         ret_cup1_d_vol, ret_cup2_d_vol,
-		         ret_cup1_cur  , ret_cup2_cur    )
+		         ret_cup1_cur  , ret_cup2_cur  ,
+		         ret_vel_cen   , ret_vel_wid   ,
+		         ret_n_vel                       )
 
 	#-----------------------------------------------------------------------
 	# DEFINE THE FUNCTION FOR LOADING ALL SPECTRA FROM DATE-SPECIFIED FILE.
@@ -334,6 +582,271 @@ class fc_arcv( object ) :
 			if ( len( tk ) > 0 ) :
 				return
 
+		# If this date is being (or has been) prefetched, wait for that
+		# to finish and use its result.  Otherwise, load the spectra
+		# from this date now.
+
+		if ( date_str in self.fc_pref ) :
+
+			( thr, res ) = self.fc_pref.pop( date_str )
+
+			thr.join( )
+
+			chnk = res[0]
+
+		else :
+
+			chnk = self.conv_date( date_str )
+
+		if ( chnk is None ) :
+			return
+
+		# Preprocess all spectra from this date at once: convert their
+		# bins from voltages to velocities, and count the valid bins of
+		# each (see "janus_fc_prep").
+
+		c_vol = array( [ chnk['cup1_c_vol'], chnk['cup2_c_vol'] ] )
+		d_vol = array( [ chnk['cup1_d_vol'], chnk['cup2_d_vol'] ] )
+
+		( c_vel, d_vel ) = calc_vel_bin( c_vol, d_vol )
+
+		chnk['vel_cen'] = c_vel[0]
+		chnk['vel_wid'] = d_vel[0]
+		chnk['n_vel']   = calc_n_vel( c_vel[0], c_vel[1] )
+
+		# Store the spectra as a new chunk of the archive, and make its
+		# arrays read-only (as they will be shared with the callers of
+		# "self.load_spec").
+
+		for key in chnk :
+			chnk[key].flags.writeable = False
+
+		self.fc_chnk[date_str] = chnk
+
+		self.calc_indx( )
+
+		# Add this date to the memory budget.
+
+		# Note.  Only the arrays held in memory are counted (i.e., not
+		#        those memory-mapped from the cache).
+
+		n_byte = calc_cache_byte( chnk )
+
+		self.bdgt.add_item( self, date_str, n_byte )
+
+		self.mem_rprt = True
+
+		# Append the array of loaded dates with this one.
+
+		self.date_str = append( self.date_str, [ date_str    ] )
+		self.date_ind = append( self.date_ind, [ self.n_date ] )
+
+		self.n_date += 1
+		self.t_date += 1
+
+		# Request a clean-up of the files in the data directory.
+
+		self.cleanup_file( )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR DOWNLOADING THE DATA FILES FOR A SET OF DATES.
+	#-----------------------------------------------------------------------
+
+	def dnld_date( self, date_lst ) :
+
+		# Note.  This function downloads (concurrently) any of the data
+		#        files for the dates in "date_lst" that are missing
+		#        from the data directory; it does not load any spectra.
+		#        IDL "SAVE" files are never downloaded.
+
+		if ( self.use_idl ) :
+			return
+
+		# Construct a request for the file of each date that is not
+		# already in the data directory.
+
+		req_date = [ ]
+		req      = [ ]
+
+		for date_str in date_lst :
+
+			if ( self.indx.find_file( date_str ) is not None ) :
+				continue
+
+			fl0 = 'wi_sw-ion-dist_swe-faraday_' + \
+			      date_str[0:4] + date_str[5:7] + \
+			      date_str[8:10] + '_v??.cdf'
+
+			self.mesg_txt( 'ftp', date_str )
+
+			req_date.append( date_str )
+			req.append( ( 'pub/data/wind/swe/swe_faraday/' +
+			              date_str[0:4], fl0, self.path      ) )
+
+		# Download the requested files, index them, and report any
+		# failures.
+
+		ret = self.dnld.get_rang( req )
+
+		for ( date_str, fl_path ) in zip( req_date, ret ) :
+			if ( fl_path is None ) :
+				self.mesg_txt( 'fail', date_str )
+			else :
+				self.indx.add_file( fl_path )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR PREFETCHING ALL SPECTRA FROM A DATE.
+	#-----------------------------------------------------------------------
+
+	def pref_date( self, date_str, time_val=None ) :
+
+		# Note.  This function returns immediately.  The spectra from
+		#        the requested date are read (and converted) by a
+		#        background thread, and "self.load_date" later adds
+		#        them to the archive (waiting for the thread only if it
+		#        has not yet finished).  Thus, the analysis of spectra
+		#        from one date need not stall while the next date's file
+		#        is downloaded and read.
+
+		# Note.  If the time "time_val" of the spectrum near which the
+		#        date has been requested is given, it is saved, and
+		#        any other date being prefetched from which it is more
+		#        than a day away is dropped (see "self.cleanup_pref").
+
+		if ( time_val is not None ) :
+			self.pref_time = time_val
+
+		self.cleanup_pref( )
+
+		# If prefetching is disabled, or if the requested date has
+		# already been loaded or is already being prefetched, abort.
+
+		if ( not self.use_pref ) :
+			return
+
+		if ( ( date_str in self.fc_pref            ) or
+		     ( date_str in self.date_str.tolist( ) )    ) :
+			return
+
+		# Start a thread that loads the spectra from the requested date
+		# and saves them to "res".
+
+		res = [ None ]
+
+		thr = Thread( target=self.pref_work, args=( date_str, res ) )
+
+		thr.daemon = True
+
+		thr.start( )
+
+		self.fc_pref[date_str] = ( thr, res )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION RUN BY THE THREAD THAT PREFETCHES A DATE.
+	#-----------------------------------------------------------------------
+
+	def pref_work( self, date_str, res ) :
+
+		res[0] = self.conv_date( date_str )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR CLEANING UP THE PREFETCHED DATES.
+	#-----------------------------------------------------------------------
+
+	def cleanup_pref( self ) :
+
+		# Note.  A prefetched date is only removed from "self.fc_pref"
+		#        when "self.load_date" takes its result.  Thus, a date
+		#        that is prefetched but never loaded (e.g., as the user
+		#        has jumped to another date) would otherwise be kept
+		#        indefinitely.
+
+		for date_str in list( self.fc_pref.keys( ) ) :
+
+			# If the spectrum near which dates are being
+			# prefetched is more than a day away from this date,
+			# drop it.
+
+			date_val = calc_time_val( date_str )
+
+			if ( ( self.pref_time is not None ) and
+			     ( ( self.pref_time < date_val - 86400. ) or
+			       ( self.pref_time > date_val + 172800. ) ) ) :
+				self.drop_date( date_str )
+				continue
+
+			# If this date has finished being prefetched, add it
+			# to the memory budget (if it has not already been).
+
+			# Note.  It is added as unused so that it is the first
+			#        date to be dropped to enforce the budget.
+
+			( thr, res ) = self.fc_pref[date_str]
+
+			if ( ( thr.is_alive( )                     ) or
+			     ( res[0] is None                      ) or
+			     ( ( self, date_str ) in self.bdgt.item )    ) :
+				continue
+
+			n_byte = calc_cache_byte( res[0] )
+
+			self.bdgt.add_item( self, date_str, n_byte, use=False )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR CONVERTING ALL SPECTRA FROM A DATE.
+	#-----------------------------------------------------------------------
+
+	def conv_date( self, date_str ) :
+
+		# Find (or download) the data file of this date.  If this fails,
+		# abort.
+
+		fl_path = self.find_file( date_str )
+
+		if ( fl_path is None ) :
+			return None
+
+		# Attempt to load the spectra from this date from the cache of
+		# converted data (see "janus_cache"), which memory-maps them.
+		# If they are not there, read them from the data file and add
+		# them to the cache.
+
+		# Note.  The cached item is named after the data file, so each
+		#        version of a file is cached separately.
+
+		name = 'fc_' + os.path.basename( fl_path )[0:-4]
+
+		chnk = None
+
+		if ( self.use_cache ) :
+
+			chnk = load_cache( self.path, name, self.fc_chnk_arr,
+			                   src=fl_path                       )
+
+			if ( chnk is not None ) :
+				self.mesg_txt( 'load', date_str )
+
+		if ( chnk is None ) :
+
+			chnk = self.read_date( date_str, fl_path )
+
+			if ( chnk is None ) :
+				return None
+
+			if ( self.use_cache ) :
+				save_cache( self.path, name, self.fc_chnk_arr,
+				            chnk, src=fl_path                 )
+
+		# Return the loaded spectra.
+
+		return chnk
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR FINDING THE DATA FILE OF A DATE.
+	#-----------------------------------------------------------------------
+
+	def find_file( self, date_str ) :
+
 		# Extract the year, month, and day portions of the "date_str"
 		# string.
 
@@ -341,7 +854,65 @@ class fc_arcv( object ) :
 		str_mon  = date_str[5:7]
 		str_day  = date_str[8:10]
 
-		# Attempt to load and extract data from the appropriate file.
+		# If IDL "SAVE" files are being used, return the path of the
+		# file corresponding to the requested date (whether or not it
+		# exists).
+
+		if ( self.use_idl ) :
+
+			fl = 'wind_janus_fc_' + str_year + '-' + \
+			                        str_mon + '-' + str_day + '.idl'
+
+			return os.path.join( self.path, fl )
+
+		# Determine the name of the file that contains data from
+		# the requested date.
+
+		# Note.  The file is looked up in the index of the data
+		#        directory.  Only if it is not there is the
+		#        directory itself searched (in case the file was
+		#        added by some other means) and then, failing
+		#        that, the file downloaded.
+
+		fl0 = 'wi_sw-ion-dist_swe-faraday_' + \
+		      str_year + str_mon + str_day + '_v??.cdf'
+
+		fl0_path = os.path.join( self.path, fl0 )
+
+		fl_path = self.indx.find_file( date_str )
+
+		if ( fl_path is None ) :
+			gb = glob( fl0_path )
+			if ( len( gb ) > 0 ) :
+				fl_path = sorted( gb )[-1]
+				self.indx.add_file( fl_path )
+
+		# If the file does not exist, attempt to download it.
+
+		if ( fl_path is None ) :
+			self.mesg_txt( 'ftp', date_str )
+			fl_path = self.dnld.get_file(
+			      'pub/data/wind/swe/swe_faraday/' +
+			      str_year, fl0, self.path            )
+			if ( fl_path is None ) :
+				self.mesg_txt( 'fail', date_str )
+				return None
+			self.indx.add_file( fl_path )
+
+		self.indx.use_file( fl_path )
+
+		# Return the path of the file.
+
+		return fl_path
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR READING ALL SPECTRA FROM A DATA FILE.
+	#-----------------------------------------------------------------------
+
+	def read_date( self, date_str, fl_path ) :
+
+		# Attempt to load and extract data from the file "fl_path" (see
+		# "self.find_file").
 
 		# Note.  The default data file format is CDF, and the code will
 		#        attempt to download the appropriate CDF file from
@@ -351,14 +922,6 @@ class fc_arcv( object ) :
 
 		if ( self.use_idl ) :
 
-			# Determine the path and name of the file corresponding
-			# to the requested date.
-
-			fl = 'wind_janus_fc_' + str_year + '-' + \
-			                        str_mon + '-' + str_day + '.idl'
-
-			fl_path = os.path.join( self.path, fl )
-
 			# If the file exists, attempt to load it; otherwise,
 			# abort.
 
@@ -369,10 +932,10 @@ class fc_arcv( object ) :
 					dat = readsav( fl_path )
 				except :
 					self.mesg_txt( 'fail', date_str )
-					return
+					return None
 			else :
 				self.mesg_txt( 'fail', date_str )
-				return
+				return None
 
 			# Determine the number of spectra loaded.  If no spectra
 			# were loaded, return.
@@ -381,15 +944,12 @@ class fc_arcv( object ) :
 
 			if ( n_sub <= 0 ) :
 				self.mesg_txt( 'fail', date_str )
-				return
+				return None
 
 			# Separate the loaded data into parameter arrays.
 
 			sub_time_val = dat.sec + calc_time_val( date_str )
 
-			sub_time_epc = array( [ calc_time_epc( t_val )
-			                        for t_val in sub_time_val ] )
-
 			sub_cup1_azm   = dat.cup1_angles
 			sub_cup2_azm   = dat.cup2_angles
 			sub_cup1_c_vol = dat.cup1_eperq
@@ -397,50 +957,11 @@ class fc_arcv( object ) :
 			sub_cup1_d_vol = dat.cup1_eqdel
 			sub_cup2_d_vol = dat.cup2_eqdel
 
-			sub_cup1_cur = 1E12 * array( [ 
-			                  transpose( dat.currents[s,0,:,:] +
-			                             dat.currents[s,2,:,:] )
-			                  for s in range( n_sub )            ] )
-			sub_cup2_cur = 1E12 * array( [ 
-			                  transpose( dat.currents[s,1,:,:] +
-			                             dat.currents[s,3,:,:] )
-			                  for s in range( n_sub )            ] )
-
-			sub_ind = tile( self.t_date, n_sub )
+			( sub_cup1_cur, sub_cup2_cur ) = calc_idl_cur(
+			                                         dat.currents )
 
 		else :
 
-			# Determine the name of the file that contains data from
-			# the requested date.
-
-			fl0 = 'wi_sw-ion-dist_swe-faraday_' + \
-			      str_year + str_mon + str_day + '_v??.cdf'
-
-			fl0_path = os.path.join( self.path, fl0 )
-
-			gb = glob( fl0_path )
-
-			# If the file does not exist, attempt to download it.
-
-			if ( len( gb ) > 0 ) :
-				fl_path = gb[-1]
-			else :
-				try :
-					self.mesg_txt( 'ftp', date_str )
-					ftp = FTP( 'cdaweb.gsfc.nasa.gov' )
-					ftp.login( )
-					ftp.cwd(
-					      'pub/data/wind/swe/swe_faraday/' )
-					ftp.cwd( str_year )
-					ls = ftp.nlst( fl0 )
-					fl = ls[-1]
-					fl_path = os.path.join( self.path, fl )
-					ftp.retrbinary( "RETR " + fl,
-					           open( fl_path, 'wb' ).write )
-				except :
-					self.mesg_txt( 'fail', date_str )
-					return
-
 			# If the file now exists, try to load it; otherwise,
 			# abort.
 
@@ -451,15 +972,15 @@ class fc_arcv( object ) :
 					cdf = pycdf.CDF( fl_path )
 				except :
 					self.mesg_txt( 'fail', date_str )
-					return
+					return None
 			else :
 				self.mesg_txt( 'fail', date_str )
-				return
+				return None
 
 			# Separate the loaded data into parameter arrays, and
 			# determine the number of spectra loaded.
 
-			sub_time_epc   = array( cdf['Epoch']          )
+			sub_time_val   = calc_time_val_arr( cdf['Epoch'][:] )
 			sub_cup1_azm   = array( cdf['cup1_azimuth']   )
 			sub_cup2_azm   = array( cdf['cup2_azimuth']   )
 			sub_cup1_c_vol = array( cdf['cup1_EperQ']     )
@@ -469,45 +990,96 @@ class fc_arcv( object ) :
 			sub_cup1_cur   = array( cdf['cup1_qflux']     )
 			sub_cup2_cur   = array( cdf['cup2_qflux']     )
 
-			n_sub = len( sub_time_epc )
-
-			sub_ind = tile( self.t_date, n_sub )
-
-		# Add the loaded and formatted Wind/FC spectra to the archive.
-
-		self.fc_time_epc   = append( self.fc_time_epc  ,
-		                                        sub_time_epc  , axis=0 )
-		self.fc_cup1_azm   = append( self.fc_cup1_azm  ,
-		                                        sub_cup1_azm  , axis=0 )
-		self.fc_cup2_azm   = append( self.fc_cup2_azm  ,
-		                                        sub_cup2_azm  , axis=0 )
-		self.fc_cup1_c_vol = append( self.fc_cup1_c_vol,
-		                                        sub_cup1_c_vol, axis=0 )
-		self.fc_cup2_c_vol = append( self.fc_cup2_c_vol,
-		                                        sub_cup2_c_vol, axis=0 )
-		self.fc_cup1_d_vol = append( self.fc_cup1_d_vol,
-		                                        sub_cup1_d_vol, axis=0 )
-		self.fc_cup2_d_vol = append( self.fc_cup2_d_vol,
-		                                        sub_cup2_d_vol, axis=0 )
-		self.fc_cup1_cur   = append( self.fc_cup1_cur  ,
-		                                        sub_cup1_cur  , axis=0 )
-		self.fc_cup2_cur   = append( self.fc_cup2_cur  ,
-		                                        sub_cup2_cur  , axis=0 )
-		self.fc_ind        = append( self.fc_ind,  sub_ind    , axis=0 )
-
-		self.n_fc = self.n_fc + n_sub
+			n_sub = len( sub_time_val )
 
-		# Append the array of loaded dates with this one.
+		# Return the loaded and formatted Wind/FC spectra.
 
-		self.date_str = append( self.date_str, [ date_str    ] )
-		self.date_ind = append( self.date_ind, [ self.n_date ] )
+		return { 'time_val'  :array( sub_time_val  , dtype=float ),
+		         'cup1_azm'  :array( sub_cup1_azm  , dtype=float ),
+		         'cup2_azm'  :array( sub_cup2_azm  , dtype=float ),
+		         'cup1_c_vol':array( sub_cup1_c_vol, dtype=float ),
+		         'cup2_c_vol':array( sub_cup2_c_vol, dtype=float ),
+		         'cup1_d_vol':array( sub_cup1_d_vol, dtype=float ),
+		         'cup2_d_vol':array( sub_cup2_d_vol, dtype=float ),
+		         'cup1_cur'  :array( sub_cup1_cur  , dtype=float ),
+		         'cup2_cur'  :array( sub_cup2_cur  , dtype=float )  }
 
-		self.n_date += 1
-		self.t_date += 1
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR INDEXING THE SPECTRA IN THE LOADED CHUNKS.
+	#-----------------------------------------------------------------------
 
-		# Request a clean-up of the files in the data directory.
+	def calc_indx( self ) :
 
-		self.cleanup_file( )
+		# Note.  The index consists of the timestamps of all loaded
+		#        spectra (in ascending order) and, for each, the key
+		#        of its chunk and its row therein.  Only these small
+		#        arrays are rebuilt when a chunk is added or removed;
+		#        the spectral data themselves are never copied.
+
+		self.fc_chnk_key = sorted( self.fc_chnk.keys( ) )
+
+		if ( len( self.fc_chnk_key ) == 0 ) :
+
+			self.fc_time_val = tile( 0., 0 )
+			self.fc_chnk_ind = tile( -1, 0 )
+			self.fc_chnk_row = tile( -1, 0 )
+
+			self.n_fc = 0
+
+			return
+
+		time_val = [ self.fc_chnk[key]['time_val']
+		             for key in self.fc_chnk_key   ]
+
+		chnk_ind = concatenate( [ tile( k, len( t ) )
+		                          for ( k, t ) in
+		                                   enumerate( time_val ) ] )
+		chnk_row = concatenate( [ arange( len( t ) )
+		                          for t in time_val    ] )
+
+		time_val = concatenate( time_val )
+
+		srt = argsort( time_val, kind='mergesort' )
+
+		self.fc_time_val = time_val[srt]
+		self.fc_chnk_ind = chnk_ind[srt]
+		self.fc_chnk_row = chnk_row[srt]
+
+		self.n_fc = len( self.fc_time_val )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR DROPPING A DATE FROM THIS ARCHIVE.
+	#-----------------------------------------------------------------------
+
+	def drop_date( self, date_str ) :
+
+		# If the requested date is being (or has been) prefetched,
+		# discard that prefetch (whose thread will finish on its own).
+
+		if ( date_str in self.fc_pref ) :
+			del self.fc_pref[date_str]
+			self.bdgt.drop_item( self, date_str )
+			return
+
+		# Delete the chunk of spectra from the requested date, remove
+		# the date from the array of loaded dates, and rebuild the
+		# index.
+
+		tk = where( self.date_str != date_str )[0]
+
+		if ( len( tk ) == self.n_date ) :
+			return
+
+		del self.fc_chnk[date_str]
+
+		self.date_str = self.date_str[tk]
+		self.date_ind = self.date_ind[tk]
+
+		self.n_date = len( self.date_str )
+
+		self.calc_indx( )
+
+		self.bdgt.drop_item( self, date_str )
 
 	#-----------------------------------------------------------------------
 	# DEFINE THE FUNCTION FOR CLEANING UP THIS ARCHIVE.
@@ -515,38 +1087,39 @@ class fc_arcv( object ) :
 
 	def cleanup_date( self ) :
 
-		# If the number of dates is less than or equal to the maximum,
-		# abort (as nothing needs to be done).
+		# Drop any prefetched dates that are no longer near the current
+		# spectrum (and add the others to the memory budget).
 
-		if ( self.n_date <= self.n_date_max ) :
-			return
+		self.cleanup_pref( )
+
+		# Drop the least recently used dates from this archive until the
+		# number of loaded dates is within the maximum.
+
+		while ( self.n_date > self.n_date_max ) :
 
-		# Delete dates (and all associated data) from this archive so
-		# that the number of loaded dates equals the maximum allowed.
+			key = self.bdgt.calc_lru( self )
 
-		n_rm = self.n_date - self.n_date_max
+			if ( key is None ) :
+				break
 
-		ind_min = self.t_date - self.n_date_max
+			self.drop_date( key[1] )
 
-		self.date_str = self.date_str[n_rm:]
-		self.date_ind = self.date_ind[n_rm:]
+		# Drop the least recently used dates (from this or any other
+		# archive sharing the memory budget) until the loaded dates fit
+		# within the budget.
 
-		self.n_date -= n_rm
+		if ( self.bdgt.cleanup( ) > 0 ) :
+			self.mem_rprt = True
 
-		tk   = where( self.fc_ind >= ind_min )[0]
+		# If any date has been loaded or dropped since the last report,
+		# report the memory used by the loaded dates.
 
-		self.n_fc = len( tk )
+		if ( self.mem_rprt ) :
 
-		self.fc_time_epc   = self.fc_time_epc[tk]
-		self.fc_cup1_azm   = self.fc_cup1_azm[tk]
-		self.fc_cup2_azm   = self.fc_cup2_azm[tk]
-		self.fc_cup1_c_vol = self.fc_cup1_c_vol[tk]
-		self.fc_cup2_c_vol = self.fc_cup2_c_vol[tk]
-		self.fc_cup1_d_vol = self.fc_cup1_d_vol[tk]
-		self.fc_cup2_d_vol = self.fc_cup2_d_vol[tk]
-		self.fc_cup1_cur   = self.fc_cup1_cur[tk]
-		self.fc_cup2_cur   = self.fc_cup2_cur[tk]
-		self.fc_ind        = self.fc_ind[tk]
+			self.mem_rprt = False
+
+			self.mesg_txt( 'mem', '{:.1f} MB'.format(
+			                   self.bdgt.calc_mem( ) / 2.**20 ) )
 
 	#-----------------------------------------------------------------------
 	# DEFINE THE FUNCTION FOR CLEANING UP THE DATA DIRECTORY.
@@ -554,22 +1127,29 @@ class fc_arcv( object ) :
 
 	def cleanup_file( self ) :
 
+		# Note.  The cached conversion (see "self.conv_date") of each
+		#        deleted file is also deleted.
+
+		# If CDF files are being used, request that their index delete
+		# the least recently used files until both the number of files
+		# and their total size are within the limits.
+
+		if ( not self.use_idl ) :
+			for fl in self.indx.cleanup( ) :
+				drop_cache( self.path, 'fc_' + fl[0:-4] )
+			return
+
 		# If there is no limit on the number files in the data
 		# directory, abort (as there's nothing to be done).
 
 		if ( self.n_file_max >= float( 'infinity' ) ) :
 			return
 
-		# Generate a list of the names of all files of the requested
-		# type (as specified by the "use_*" keywords) in the data
-		# directory.
+		# Generate a list of the names of all IDL "SAVE" files in the
+		# data directory.
 
-		if ( self.use_idl ) :
-			file_name = array( glob(
-			         os.path.join( self.path, 'wind_janus_fc*' ) ) )
-		else :
-			file_name = array( glob(
-			         os.path.join( self.path, 'wi_sw-ion*'     ) ) )
+		file_name = array( glob(
+		         os.path.join( self.path, 'wind_janus_fc*' ) ) )
 
 		n_file = len( file_name )
 
@@ -595,6 +1175,8 @@ class fc_arcv( object ) :
 
 		for f in range( n_file - self.n_file_max ) :
 			os.remove( file_name[f] )
+			drop_cache( self.path, 'fc_' +
+			            os.path.basename( file_name[f] )[0:-4] )
 
 	#-----------------------------------------------------------------------
 	# DEFINE THE FUNCTION FOR SENDING INFORMATIONAL MESSAGES TO THE USER.
@@ -609,8 +1191,7 @@ class fc_arcv( object ) :
 
 			return
 
-		# Emit a message signal (on behalf of the core) containing the
+		# Emit a message event (on behalf of the core) containing the
 		# message parameters.
 
-		self.core.emit( SIGNAL('janus_mesg'),
-		                'fc', mesg_typ, mesg_obj )
+		self.core.emit( 'janus_mesg', 'fc', mesg_typ, mesg_obj )
@@ -0,0 +1,145 @@
+################################################################################
+##
+## Janus -- GUI Software for Processing Thermal-Ion Measurements from the
+##          Wind Spacecraft's Faraday Cups
+##
+## Copyright (C) 2016 Bennett A. Maruca (bmaruca@udel.edu)
+##
+## This program is free software: you can redistribute it and/or modify it under
+## the terms of the GNU General Public License as published by the Free Software
+## Foundation, either version 3 of the License, or (at your option) any later
+## version.
+##
+## This program is distributed in the hope that it will be useful, but WITHOUT
+## ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+## FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+## details.
+##
+## You should have received a copy of the GNU General Public License along with
+## this program.  If not, see http://www.gnu.org/licenses/.
+##
+################################################################################
+
+
+
+################################################################################
+## LOAD THE NECESSARY MODULES.
+################################################################################
+
+# Load the dictionary of physical constants.
+
+from janus_const import const
+
+# Load the necessary "numpy" array modules.
+
+from numpy import arange, argmax, array, logical_not, sqrt, where, zeros
+
+
+## +----------+----------------------------------------------------------------+
+## |          |                                                                |
+## | Argument | Comments                                                       |
+## |          |                                                                |
+## +----------+----------------------------------------------------------------+
+## |          |                                                                |
+## | c_vol    | Array of the voltages [V] of the centers of the bins           |
+## |          |                                                                |
+## | d_vol    | Array of the voltage widths [V] of the bins                    |
+## |          |                                                                |
+## | c_vel_?  | Array of the velocities [km/s] of the centers of the bins of   |
+## |          | cup "?"                                                        |
+## |          |                                                                |
+## | cur      | Array of the currents [pA] with the last three axes being      |
+## |          | altitude, azimuth, and velocity                                |
+## |          |                                                                |
+## | n_vel    | Number of valid velocity bins (or array thereof)               |
+## |          |                                                                |
+## +----------+----------------------------------------------------------------+
+
+# Note.  Each of these functions operates on whole arrays.  The leading axes
+#        (if any) are left untouched, so each can be applied either to a
+#        single spectrum or to all the spectra of a date at once (e.g., to
+#        arrays of shape "[n_spec, 31]" or "[n_spec, 2, 20, 31]").
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR CONVERTING VOLTAGE BINS TO VELOCITY BINS.
+################################################################################
+
+def calc_vel_bin( c_vol, d_vol ) :
+
+	# Compute the voltages of the centers and the edges of the bins, and
+	# convert them all (in one operation) to velocities [km/s].
+
+	vol = array( [ c_vol, c_vol - ( d_vol / 2. ), c_vol + ( d_vol / 2. ) ] )
+
+	vel = 1E-3 * sqrt( 2 * const['q_p'] * vol / const['m_p'] )
+
+	# Return the velocities of the centers and the widths of the bins.
+
+	return ( vel[0], vel[2] - vel[1] )
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR COUNTING THE VALID VELOCITY BINS.
+################################################################################
+
+def calc_n_vel( c_vel_1, c_vel_2 ) :
+
+	# Note.  The velocity windows should be assending order, and unused
+	#        windows sould occur at the end of the arrays and be indicated
+	#        by having their elements set to the instrument's minimum
+	#        value.  Thus, the number of valid windows is the position of
+	#        the first element (in either cup) that is smaller than the
+	#        element before it.
+
+	# Identify each element that is smaller than its predecessor.
+
+	drp = ( ( c_vel_1[...,1:] < c_vel_1[...,:-1] ) |
+	        ( c_vel_2[...,1:] < c_vel_2[...,:-1] )   )
+
+	# Return the position of the first such element or, if there are none,
+	# the number of elements.
+
+	return where( drp.any( axis=-1 ), argmax( drp, axis=-1 ) + 1,
+	              c_vel_1.shape[-1]                             )
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR DETERMINING THE VALIDITY OF EACH CURRENT.
+################################################################################
+
+def calc_cur_vld( cur, n_vel, cur_min, cur_jmp ) :
+
+	# Note.  A current is invalid if it is less than "cur_min" or if it
+	#        exceeds (by a factor of more than "cur_jmp") both of its
+	#        neighbors in velocity (or its one neighbor, for the first and
+	#        last valid bins).  If there are fewer than two valid bins, all
+	#        currents are valid.
+
+	# Reshape the number(s) of valid bins so that it broadcasts against
+	# the altitude, azimuth, and velocity axes, and index the velocity
+	# bins.
+
+	n = array( n_vel ).reshape( array( n_vel ).shape + ( 1, 1, 1 ) )
+
+	v = arange( cur.shape[-1] )
+
+	# Identify each current that jumps over its predecessor and over its
+	# successor (ignoring any successor beyond the last valid bin).
+
+	jmp_prv = zeros( cur.shape, dtype=bool )
+	jmp_nxt = zeros( cur.shape, dtype=bool )
+
+	jmp_prv[...,1:]  = ( cur[...,1:]  > ( cur_jmp * cur[...,:-1] ) )
+	jmp_nxt[...,:-1] = ( cur[...,:-1] > ( cur_jmp * cur[...,1:]  ) )
+
+	jmp_nxt = jmp_nxt & ( v < ( n - 1 ) )
+
+	# Return the validity of each current.
+
+	inv = ( ( cur < cur_min                  ) |
+	        ( ( v == 0         ) & jmp_nxt   ) |
+	        ( ( v == ( n - 1 ) ) & jmp_prv   ) |
+	        ( jmp_prv            & jmp_nxt   )   )
+
+	return logical_not( inv ) | ( n < 2 )
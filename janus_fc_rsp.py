@@ -0,0 +1,504 @@
+################################################################################
+##
+## Janus -- GUI Software for Processing Thermal-Ion Measurements from the
+##          Wind Spacecraft's Faraday Cups
+##
+## Copyright (C) 2016 Bennett A. Maruca (bmaruca@udel.edu)
+##
+## This program is free software: you can redistribute it and/or modify it under
+## the terms of the GNU General Public License as published by the Free Software
+## Foundation, either version 3 of the License, or (at your option) any later
+## version.
+##
+## This program is distributed in the hope that it will be useful, but WITHOUT
+## ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+## FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+## details.
+##
+## You should have received a copy of the GNU General Public License along with
+## this program.  If not, see http://www.gnu.org/licenses/.
+##
+################################################################################
+
+
+
+################################################################################
+## LOAD THE NECESSARY MODULES.
+################################################################################
+
+# Load the dictionary of physical constants.
+
+from janus_const import const
+
+# Load the necessary array modules and mathematical functions.
+
+from numpy import append, arange, arccos, array, broadcast_arrays, ceil, \
+                  clip, cos, deg2rad, diff, exp, interp, linspace, newaxis, \
+                  pi, rad2deg, searchsorted, sin, sqrt, stack, sum, where
+
+from scipy.special import erf
+
+
+################################################################################
+## DEFINE THE EFFECTIVE COLLECTING AREA OF THE Wind/FC CUPS.
+################################################################################
+
+# Define the data array with values for effective collecting area,
+# "eff_area" [cm^2], as a function of inflow angle, "eff_deg" [deg].
+
+eff_deg  = arange( 0., 91., dtype=float )
+
+eff_area = 1.e-5 * array( [
+      3382000.0, 3383000.0, 3383000.0, 3382000.0, 3381000.0,
+      3380000.0, 3378000.0, 3377000.0, 3376000.0, 3374000.0,
+      3372000.0, 3369000.0, 3368000.0, 3364000.0, 3362000.0,
+      3359000.0, 3355000.0, 3351000.0, 3347000.0, 3343000.0,
+      3338700.0, 3334100.0, 3329300.0, 3324300.0, 3318200.0,
+      3312800.0, 3306300.0, 3299600.0, 3292800.0, 3285900.0,
+      3277800.0, 3270700.0, 3261600.0, 3253500.0, 3244500.0,
+      3234600.0, 3224900.0, 3200100.0, 3161500.0, 3114000.0,
+      3058820.0, 2997170.0, 2930000.0, 2857000.0, 2779000.0,
+      2694000.0, 2586999.7, 2465000.0, 2329999.6, 2183000.0,
+      2025999.6, 1859000.1, 1682999.6, 1497000.1, 1301999.6,
+      1099000.1, 887799.56, 668500.16, 452099.62, 257500.16,
+      96799.784, 539.96863, 0.0000000, 0.0000000, 0.0000000,
+      0.0000000, 0.0000000, 0.0000000, 0.0000000, 0.0000000,
+      0.0000000, 0.0000000, 0.0000000, 0.0000000, 0.0000000,
+      0.0000000, 0.0000000, 0.0000000, 0.0000000, 0.0000000,
+      0.0000000, 0.0000000, 0.0000000, 0.0000000, 0.0000000,
+      0.0000000, 0.0000000, 0.0000000, 0.0000000, 0.0000000,
+      0.0000000                                              ] )
+
+
+## +----------+----------------------------------------------------------------+
+## |          |                                                                |
+## | Argument | Comments                                                       |
+## |          |                                                                |
+## +----------+----------------------------------------------------------------+
+## |          |                                                                |
+## | vel_cen  | Each argument of these functions may be either a scalar or an  |
+## | vel_wid  | array.  All arguments are broadcast against one another (in    |
+## | dir_alt  | the usual "numpy" sense), and an array of the broadcast shape  |
+## | dir_azm  | is returned.  Cartesian vectors are stored along a final axis  |
+## | mag_?    | of length three.                                               |
+## | prm_?    |                                                                |
+## |          | The "rsp_*_jac" functions also return the partial derivatives  |
+## |          | of the result with respect to each of the model parameters,    |
+## |          | which are stored along a final axis of the returned array.     |
+## |          |                                                                |
+## | tab      | Table of the "erf" factor (see "rsp_tab") with which to        |
+## |          | approximate the current, or "None" for the exact current       |
+## |          |                                                                |
+## +----------+----------------------------------------------------------------+
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR STACKING COMPONENTS INTO CARTESIAN VECTORS.
+################################################################################
+
+def rsp_vec( x, y, z ) :
+
+	# Broadcast the three components against one another and stack them
+	# along a new, final axis.
+
+	return stack( broadcast_arrays( x, y, z ), axis=-1 )
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR CONVERTING ALT-AZM TO A CARTESIAN UNIT VECTOR.
+################################################################################
+
+def rsp_dir_look( alt, azm ) :
+
+	# Convert altitude and azimuth the spherical coordinates.
+
+	the = deg2rad( - array( alt, dtype=float ) + 90. )
+	phi = deg2rad( - array( azm, dtype=float )       )
+
+	# Convert from spherical to rectangular coordinates and return the
+	# result.
+
+	return rsp_vec( sin( the ) * cos( phi ),
+	                sin( the ) * sin( phi ),
+	                cos( the )               )
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR CALCULATING THE EFFECTIVE AREA OF THE CUP.
+################################################################################
+
+def rsp_eff_area( dlk, vel ) :
+
+	# Note.  The argument "dlk" is an array of vectors that indicates the
+	#        look direction of the cup, and "vel" is a similar array that
+	#        indicates the particle velocity.  Only the angle between
+	#        "dlk" and "-vel" is used.  The returned value of the
+	#        effective collecting area is in units of square centimeters.
+
+	# Normalize the look direction and particle velocity.
+
+	dn = dlk / sqrt( sum( dlk**2, axis=-1 ) )[...,newaxis]
+	vn = vel / sqrt( sum( vel**2, axis=-1 ) )[...,newaxis]
+
+	# Calculate the particle inflow angle (in degrees) relative to the cup
+	# normal (i.e., the cup pointing direction).
+
+	psi = clip( rad2deg( arccos( sum( dn * ( - vn ), axis=-1 ) ) ),
+	            0., 90.                                              )
+
+	# Return the effective collecting area corresponding to "psi".
+
+	return interp( psi, eff_deg, eff_area )
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR CALCULATING THE EFFECTIVE AREA AND ITS DERIVATIVE.
+################################################################################
+
+def rsp_eff_area_jac( dlk, vel ) :
+
+	# Note.  This function returns the effective collecting area (as in
+	#        "rsp_eff_area") along with its gradient with respect to the
+	#        particle velocity "vel" (in units of square centimeters per
+	#        unit of "vel").  As the area is tabulated, it is a piecewise
+	#        linear function of the inflow angle.
+
+	# Normalize the look direction and particle velocity.
+
+	dn = dlk / sqrt( sum( dlk**2, axis=-1 ) )[...,newaxis]
+
+	vel_mag = sqrt( sum( vel**2, axis=-1 ) )[...,newaxis]
+
+	vn = vel / vel_mag
+
+	# Calculate the particle inflow angle (in degrees) and the effective
+	# collecting area.
+
+	cos_psi = sum( dn * ( - vn ), axis=-1 )
+
+	psi = clip( rad2deg( arccos( cos_psi ) ), 0., 90. )
+
+	area = interp( psi, eff_deg, eff_area )
+
+	# Determine the slope of the tabulated area on the interval of the
+	# table that contains each inflow angle.
+
+	i = clip( searchsorted( eff_deg, psi, side='right' ) - 1,
+	          0, len( eff_deg ) - 2                          )
+
+	slp = ( ( eff_area[i+1] - eff_area[i] ) /
+	        ( eff_deg[i+1]  - eff_deg[i]  )   )
+
+	# Apply the chain rule through the inflow angle.  Where the inflow is
+	# exactly along the cup normal, the derivative of the angle is
+	# singular, but the area there is flat; in that case, take the
+	# derivative to be zero.
+
+	sin_psi = sqrt( clip( 1. - cos_psi**2, 0., None ) )
+
+	fac = where( sin_psi > 0., slp * rad2deg( 1. ) /
+	                           where( sin_psi > 0., sin_psi, 1. ), 0. )
+
+	area_v = ( fac[...,newaxis] * ( dn + ( cos_psi[...,newaxis] * vn ) )
+	           / vel_mag )
+
+	# Return the area and its gradient.
+
+	return ( area, area_v )
+
+
+################################################################################
+## DEFINE THE CLASS FOR THE TABULATED (NORMALIZED) RESPONSE.
+################################################################################
+
+class rsp_tab( object ) :
+
+	# Note.  The current in each velocity window depends on the thermal
+	#        speed and the edges of the window only through two functions
+	#        of the normalized offset "u" of each edge (i.e., "vel_1 /
+	#        prm_w" and "vel_2 / prm_w"): the Gaussian factor,
+	#        "sqrt( 2 / pi ) * exp( - u**2 / 2 )", and the "erf" factor,
+	#        "erf( u / sqrt( 2 ) )".  The latter is by far the more
+	#        costly to evaluate, so this class tabulates it on a uniform
+	#        grid and evaluates it by linear interpolation.  The spacing
+	#        of the grid is chosen such that the absolute error is at
+	#        most "tol" (the error of linear interpolation being at most
+	#        "h**2 / 8" times the maximum of the second derivative, which
+	#        is "sqrt( 2 / pi ) * exp( - 1 / 2 )").  Beyond "u_max", the
+	#        factor is taken to be that at "u_max" (i.e., effectively
+	#        plus or minus one).
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE INITIALIZATION FUNCTION.
+	#-----------------------------------------------------------------------
+
+	def __init__( self, tol=1.e-6, u_max=10. ) :
+
+		# Save the arguments.
+
+		self.tol   = float( tol   )
+		self.u_max = float( u_max )
+
+		# Compute the grid of normalized offsets.
+
+		h = sqrt( 8. * self.tol / ( sqrt( 2. / pi ) * exp( -0.5 ) ) )
+
+		self.n = int( ceil( 2. * self.u_max / h ) ) + 1
+
+		u = linspace( - self.u_max, self.u_max, self.n )
+
+		self.h_inv = 1. / ( u[1] - u[0] )
+
+		# Tabulate the factor and the difference between each pair of
+		# adjacent values (with a final zero so that the last value can
+		# also be looked up).
+
+		self.erf   = erf( u / sqrt( 2. ) )
+		self.erf_d = append( diff( self.erf ), 0. )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR EVALUATING THE TABULATED FACTOR.
+	#-----------------------------------------------------------------------
+
+	def calc( self, u ) :
+
+		# Locate each normalized offset on the grid (as the index of
+		# the point below it and its fractional distance beyond that
+		# point).
+
+		# Note.  The fractional distance of a "nan" offset (and thus
+		#        its factor) remains "nan", and it is looked up at the
+		#        first point of the grid.
+
+		s = ( clip( u, - self.u_max, self.u_max )
+		      + self.u_max                        ) * self.h_inv
+
+		i = clip( s.astype( int ), 0, self.n - 1 )
+
+		s -= i
+
+		# Return the interpolated "erf" factor.
+
+		s *= self.erf_d.take( i )
+		s += self.erf.take( i )
+
+		return s
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR CALCULATING EXPECTED CURRENT (BI-MAXWELLIAN).
+################################################################################
+
+def rsp_cur_bmx( vel_cen, vel_wid,
+                 dir_alt, dir_azm,
+                 mag_x, mag_y, mag_z,
+                 prm_n, prm_v_x, prm_v_y, prm_v_z,
+                 prm_w_per, prm_w_par, tab=None    ) :
+
+	# Note.  This function is based on Equation 2.34 from Maruca (PhD
+	#        thesis, 2012), but differs by a factor of $2$ (i.e., the
+	#        factor of $2$ from Equation 2.13, which is automatically
+	#        calibrated out of the Wind/FC data).
+
+	# Calculate the vector bulk velocity, the look direction (as a
+	# Cartesian unit vector), and the direction of the magnetic field (as
+	# a Cartesian unit vector).
+
+	prm_v = rsp_vec( prm_v_x, prm_v_y, prm_v_z )
+
+	dlk = rsp_dir_look( dir_alt, dir_azm )
+
+	mag = rsp_vec( mag_x, mag_y, mag_z )
+
+	dmg = mag / sqrt( sum( mag**2, axis=-1 ) )[...,newaxis]
+
+	# Calculate the component of the magnetic field unit vector that lies
+	# along the look direction, and use it to compute the effective
+	# thermal speed along this look direction.
+
+	dmg_dlk = sum( dmg * dlk, axis=-1 )
+
+	prm_w = sqrt( ( ( 1. - dmg_dlk**2 ) * prm_w_per**2 ) +
+	              (        dmg_dlk**2   * prm_w_par**2 )   )
+
+	# Calculate (once) the projected inflow speed along the look
+	# direction and the offset of each edge of each velocity window from
+	# it.
+
+	prm_v_prj = sum( dlk * ( - prm_v ), axis=-1 )
+
+	vel_1 = vel_cen - ( vel_wid / 2. ) - prm_v_prj
+	vel_2 = vel_cen + ( vel_wid / 2. ) - prm_v_prj
+
+	# Calcuate the exponential and "erf" terms of the current (taking
+	# the latter, if requested, from the table "tab"), and then
+	# calculate the parenthetical expression.
+
+	ret_exp_1 = 1.e3 * prm_w * sqrt( 2. / pi ) * exp(
+	                                   - ( vel_1 / prm_w )**2 / 2. )
+	ret_exp_2 = 1.e3 * prm_w * sqrt( 2. / pi ) * exp(
+	                                   - ( vel_2 / prm_w )**2 / 2. )
+
+	if ( tab is None ) :
+		erf_1 = erf( vel_1 / ( sqrt(2.) * prm_w ) )
+		erf_2 = erf( vel_2 / ( sqrt(2.) * prm_w ) )
+	else :
+		erf_1 = tab.calc( vel_1 / prm_w )
+		erf_2 = tab.calc( vel_2 / prm_w )
+
+	ret_erf_1 = 1.e3 * prm_v_prj * erf_1
+	ret_erf_2 = 1.e3 * prm_v_prj * erf_2
+
+	ret_prn = ( ( ret_exp_2 + ret_erf_2 ) -
+	            ( ret_exp_1 + ret_erf_1 )   )
+
+	# Calculate and return the expected current.
+
+	return ( ( 1.e12 ) * ( 1. / 2. ) * ( const['q_p'] )
+	         * ( 1.e6 * prm_n )
+	         * ( 1.e-4 * rsp_eff_area( dlk, prm_v ) )
+	         * ( ret_prn ) )
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR CALCULATING EXPECTED CURRENT (MAXWELLIAN).
+################################################################################
+
+def rsp_cur_max( vel_cen, vel_wid,
+                 dir_alt, dir_azm,
+                 prm_n, prm_v_x, prm_v_y, prm_v_z, prm_w, tab=None ) :
+
+	# Return the equivalent bi-Maxwellian response for equal perpendicular
+	# and parallel thermal speeds and a dummy magnetic field.
+
+	return rsp_cur_bmx( vel_cen, vel_wid,
+	                    dir_alt, dir_azm, 1., 0., 0.,
+	                    prm_n, prm_v_x, prm_v_y, prm_v_z,
+	                    prm_w, prm_w, tab=tab             )
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR CALCULATING CURRENT AND JACOBIAN (BI-MAXWELLIAN).
+################################################################################
+
+def rsp_cur_bmx_jac( vel_cen, vel_wid,
+                     dir_alt, dir_azm,
+                     mag_x, mag_y, mag_z,
+                     prm_n, prm_v_x, prm_v_y, prm_v_z,
+                     prm_w_per, prm_w_par, tab=None    ) :
+
+	# Note.  This function returns the expected current (as in
+	#        "rsp_cur_bmx") along with its partial derivatives with
+	#        respect to "prm_n", "prm_v_x", "prm_v_y", "prm_v_z",
+	#        "prm_w_per", and "prm_w_par" (in that order).
+
+	# Calculate the vector bulk velocity, the look direction, the
+	# direction of the magnetic field, and the effective thermal speed
+	# along the look direction.
+
+	prm_v = rsp_vec( prm_v_x, prm_v_y, prm_v_z )
+
+	dlk = rsp_dir_look( dir_alt, dir_azm )
+
+	mag = rsp_vec( mag_x, mag_y, mag_z )
+
+	dmg = mag / sqrt( sum( mag**2, axis=-1 ) )[...,newaxis]
+
+	dmg_dlk = sum( dmg * dlk, axis=-1 )
+
+	prm_w = sqrt( ( ( 1. - dmg_dlk**2 ) * prm_w_per**2 ) +
+	              (        dmg_dlk**2   * prm_w_par**2 )   )
+
+	# Calculate the projected inflow speed and the offset of each edge of
+	# each velocity window from it.
+
+	prm_v_prj = sum( dlk * ( - prm_v ), axis=-1 )
+
+	vel_1 = vel_cen - ( vel_wid / 2. ) - prm_v_prj
+	vel_2 = vel_cen + ( vel_wid / 2. ) - prm_v_prj
+
+	# Calculate the Gaussian and "erf" factors at each edge (taking the
+	# latter, if requested, from the table "tab").
+
+	gss_1 = sqrt( 2. / pi ) * exp( - ( vel_1 / prm_w )**2 / 2. )
+	gss_2 = sqrt( 2. / pi ) * exp( - ( vel_2 / prm_w )**2 / 2. )
+
+	if ( tab is None ) :
+		erf_1 = erf( vel_1 / ( sqrt(2.) * prm_w ) )
+		erf_2 = erf( vel_2 / ( sqrt(2.) * prm_w ) )
+	else :
+		erf_1 = tab.calc( vel_1 / prm_w )
+		erf_2 = tab.calc( vel_2 / prm_w )
+
+	# Calculate the parenthetical expression and its derivatives with
+	# respect to the projected inflow speed and the thermal speed.
+
+	ret_prn = 1.e3 * ( ( ( prm_w * gss_2 ) + ( prm_v_prj * erf_2 ) ) -
+	                   ( ( prm_w * gss_1 ) + ( prm_v_prj * erf_1 ) )   )
+
+	prn_prj = 1.e3 * (
+	          ( erf_2 + ( gss_2 * ( vel_2 - prm_v_prj ) / prm_w ) ) -
+	          ( erf_1 + ( gss_1 * ( vel_1 - prm_v_prj ) / prm_w ) )   )
+
+	prn_w = 1.e3 * (
+	        ( gss_2 * ( 1. + ( vel_2 * ( vel_2 - prm_v_prj )
+	                           / prm_w**2                    ) ) ) -
+	        ( gss_1 * ( 1. + ( vel_1 * ( vel_1 - prm_v_prj )
+	                           / prm_w**2                    ) ) )   )
+
+	# Calculate the effective area and its gradient.
+
+	( area, area_v ) = rsp_eff_area_jac( dlk, prm_v )
+
+	# Calculate the expected current and its partial derivatives.  Note
+	# that the gradient of the projected inflow speed with respect to
+	# the bulk velocity is simply "-dlk".
+
+	fac = ( 1.e12 ) * ( 1. / 2. ) * ( const['q_p'] ) * ( 1.e6 ) * ( 1.e-4 )
+
+	cur_n = fac * area * ret_prn
+
+	cur_v = array( fac * prm_n )[...,newaxis] * (
+	          ( area_v * array( ret_prn )[...,newaxis] ) -
+	          ( array( area * prn_prj )[...,newaxis] * dlk ) )
+
+	cur_w = fac * prm_n * area * prn_w
+
+	cur_w_per = cur_w * ( 1. - dmg_dlk**2 ) * prm_w_per / prm_w
+	cur_w_par = cur_w *        dmg_dlk**2   * prm_w_par / prm_w
+
+	# Return the expected current and the Jacobian.
+
+	return ( cur_n * prm_n,
+	         stack( broadcast_arrays( cur_n,
+	                                  cur_v[...,0], cur_v[...,1],
+	                                  cur_v[...,2],
+	                                  cur_w_per, cur_w_par        ),
+	                axis=-1                                          ) )
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR CALCULATING CURRENT AND JACOBIAN (MAXWELLIAN).
+################################################################################
+
+def rsp_cur_max_jac( vel_cen, vel_wid,
+                     dir_alt, dir_azm,
+                     prm_n, prm_v_x, prm_v_y, prm_v_z, prm_w,
+                     tab=None                                 ) :
+
+	# Note.  This function returns the expected current (as in
+	#        "rsp_cur_max") along with its partial derivatives with
+	#        respect to "prm_n", "prm_v_x", "prm_v_y", "prm_v_z", and
+	#        "prm_w" (in that order).
+
+	# Compute the equivalent bi-Maxwellian current and Jacobian, and then
+	# combine the derivatives with respect to the two thermal speeds.
+
+	( cur, jac ) = rsp_cur_bmx_jac( vel_cen, vel_wid,
+	                                dir_alt, dir_azm, 1., 0., 0.,
+	                                prm_n, prm_v_x, prm_v_y, prm_v_z,
+	                                prm_w, prm_w, tab=tab             )
+
+	jac[...,4] += jac[...,5]
+
+	return ( cur, jac[...,0:5] )
@@ -0,0 +1,528 @@
+################################################################################
+##
+## Janus -- GUI Software for Processing Thermal-Ion Measurements from the
+##          Wind Spacecraft's Faraday Cups
+##
+## Copyright (C) 2016 Bennett A. Maruca (bmaruca@udel.edu)
+##
+## This program is free software: you can redistribute it and/or modify it under
+## the terms of the GNU General Public License as published by the Free Software
+## Foundation, either version 3 of the License, or (at your option) any later
+## version.
+##
+## This program is distributed in the hope that it will be useful, but WITHOUT
+## ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+## FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+## details.
+##
+## You should have received a copy of the GNU General Public License along with
+## this program.  If not, see http://www.gnu.org/licenses/.
+##
+################################################################################
+
+
+
+################################################################################
+## LOAD THE NECESSARY MODULES.
+################################################################################
+
+# Load the modules necessary for file I/O.
+
+import os
+
+from glob import glob
+
+# Load the modules necessary for sharing the index between threads and for
+# timing the uses of files.
+
+from threading import Lock
+
+from time import time
+
+# Load the module necessary for naming temporary files.
+
+from tempfile import mkstemp
+
+
+################################################################################
+## DEFINE THE "file_indx" CLASS FOR INDEXING THE DATA FILES OF A PRODUCT.
+################################################################################
+
+## +------------+--------------------------------------------------------------+
+## |            |                                                              |
+## | Argument   | Comments                                                     |
+## |            |                                                              |
+## +------------+--------------------------------------------------------------+
+## |            |                                                              |
+## | path       | Data directory                                               |
+## |            |                                                              |
+## | prod       | Name of the product (e.g., "wi_h0_mfi"), whose files are     |
+## |            | named "<prod>_yyyymmdd_v??.cdf"                              |
+## |            |                                                              |
+## | n_file_max | Maximum number of files to keep in the data directory        |
+## |            |                                                              |
+## | n_byte_max | Maximum total size [bytes] of the files to keep in the data  |
+## |            | directory                                                    |
+## |            |                                                              |
+## +------------+--------------------------------------------------------------+
+
+class file_indx( object ) :
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE INITIALIZATION FUNCTION.
+	#-----------------------------------------------------------------------
+
+	def __init__( self, path, prod, n_file_max=None, n_byte_max=None ) :
+
+		# Save the arguments for later use.
+
+		self.path = path
+		self.prod = prod
+
+		if ( n_file_max is None ) :
+			self.n_file_max = float( 'infinity' )
+		else :
+			self.n_file_max = n_file_max
+
+		if ( n_byte_max is None ) :
+			self.n_byte_max = float( 'infinity' )
+		else :
+			self.n_byte_max = n_byte_max
+
+		# Determine the name of the (hidden) file in which the index is
+		# saved.
+
+		self.fl_path = os.path.join( path, '.indx_' + prod + '.txt' )
+
+		# Initialize the index.
+
+		# Note.  The dictionary "self.item" has an entry for each file
+		#        (by name) that gives its date, version, size, and time
+		#        of last use.  The dictionary "self.best" gives (by
+		#        date) the name of the file with the latest version.
+		#        Both are shared by the archive's threads (see
+		#        "fc_arcv.pref_date") and so are only accessed while
+		#        holding "self.lock".  The file of the index is only
+		#        written while holding "self.lock_save".
+
+		self.lock      = Lock( )
+		self.lock_save = Lock( )
+
+		# Note.  If "self.rd_only" is "True", the file of the index is
+		#        never written (see "self.save_indx").
+
+		self.rd_only = False
+
+		self.item = { }
+		self.best = { }
+
+		# Load the index from its file or, if that fails, rebuild it
+		# from the contents of the data directory.
+
+		if ( not self.load_indx( ) ) :
+			self.rbld_indx( )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR PARSING THE NAME OF A FILE.
+	#-----------------------------------------------------------------------
+
+	def pars_name( self, fl ) :
+
+		# Return the date (as "yyyy-mm-dd") and version of the named
+		# file or, if the name does not fit the product's pattern,
+		# "None".
+
+		n = len( self.prod )
+
+		if ( ( not fl.startswith( self.prod + '_' ) ) or
+		     ( not fl.endswith( '.cdf' )            ) or
+		     ( fl[n+9:n+11] != '_v'                 )    ) :
+			return None
+
+		try :
+			ver = int( fl[n+11:-4] )
+		except :
+			return None
+
+		date_str = fl[n+1:n+5] + '-' + fl[n+5:n+7] + '-' + fl[n+7:n+9]
+
+		return ( date_str, ver )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR READING THE INDEX FROM ITS FILE.
+	#-----------------------------------------------------------------------
+
+	def read_indx( self ) :
+
+		# Attempt to read the name, size, and time of last use of each
+		# indexed file.  Return the dictionary of the files (in the
+		# format of "self.item") or, if this fails, "None".
+
+		try :
+
+			with open( self.fl_path ) as fl_obj :
+				lin = fl_obj.read( ).splitlines( )
+
+			item = { }
+
+			for l in lin :
+
+				( fl, n_byte, t_use ) = l.split( '\t' )
+
+				( date_str, ver ) = self.pars_name( fl )
+
+				item[fl] = [ date_str, ver,
+				             int( n_byte ), float( t_use ) ]
+
+		except :
+
+			return None
+
+		return item
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR LOADING THE INDEX FROM ITS FILE.
+	#-----------------------------------------------------------------------
+
+	def load_indx( self ) :
+
+		# Load the index from its file, and return whether this
+		# succeeded.
+
+		item = self.read_indx( )
+
+		if ( item is None ) :
+			return False
+
+		with self.lock :
+			self.item = item
+			self.calc_best( )
+
+		return True
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR MERGING THE INDEX FROM ITS FILE.
+	#-----------------------------------------------------------------------
+
+	def merg_indx( self ) :
+
+		# Note.  The file of the index may have been rewritten by
+		#        another process (e.g., a worker of
+		#        "core.auto_run_pool") since it was loaded.  Its
+		#        entries are merged into this index: each file that is
+		#        not in this index (and that still exists) is added,
+		#        and each time of last use is the later of the two.
+
+		item = self.read_indx( )
+
+		if ( item is None ) :
+			return
+
+		with self.lock :
+
+			for ( fl, itm ) in item.items( ) :
+
+				fl_path = os.path.join( self.path, fl )
+
+				if ( fl in self.item ) :
+					t_use = max( self.item[fl][3], itm[3] )
+					self.item[fl][3] = t_use
+				elif ( os.path.isfile( fl_path ) ) :
+					self.item[fl] = itm
+
+			self.calc_best( )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR SAVING THE INDEX TO ITS FILE.
+	#-----------------------------------------------------------------------
+
+	def save_indx( self ) :
+
+		# Note.  The index is first merged with its file (so that the
+		#        entries of other processes are not lost) and then
+		#        written to a uniquely named temporary file, which is
+		#        renamed, so that it is never read partially written.
+		#        Any failure is ignored as the index can always be
+		#        rebuilt.
+
+		# Note.  Since "self.lock_save" only serializes the threads of
+		#        one process, several processes that might add files
+		#        at once (e.g., the workers of "core.auto_run_pool")
+		#        should instead make their indices read-only and leave
+		#        the files they add to be found by "self.scan_indx".
+
+		if ( self.rd_only ) :
+			return
+
+		with self.lock_save :
+
+			self.merg_indx( )
+
+			with self.lock :
+				item = sorted( self.item.items( ) )
+
+			lin = [ '{}\t{:d}\t{:.3f}\n'.format( fl, itm[2],
+			                                        itm[3]    )
+			        for ( fl, itm ) in item                    ]
+
+			tmp_path = None
+
+			try :
+				( fd, tmp_path ) = mkstemp( dir=self.path,
+				       prefix=os.path.basename( self.fl_path ) )
+				with os.fdopen( fd, 'w' ) as fl_obj :
+					fl_obj.write( ''.join( lin ) )
+				os.rename( tmp_path, self.fl_path )
+			except :
+				try :
+					os.remove( tmp_path )
+				except :
+					pass
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR REBUILDING THE INDEX FROM THE DATA DIRECTORY.
+	#-----------------------------------------------------------------------
+
+	def rbld_indx( self ) :
+
+		# Index every file of the product in the data directory (using
+		# its access time as its time of last use), and save the index.
+
+		item = { }
+
+		for fl_path in glob( os.path.join( self.path,
+		                                   self.prod + '_*.cdf' ) ) :
+
+			fl = os.path.basename( fl_path )
+
+			nv = self.pars_name( fl )
+
+			if ( nv is None ) :
+				continue
+
+			item[fl] = [ nv[0], nv[1], os.path.getsize( fl_path ),
+			             os.path.getatime( fl_path )               ]
+
+		with self.lock :
+			self.item = item
+			self.calc_best( )
+
+		self.save_indx( )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR INDEXING ANY UNINDEXED FILES.
+	#-----------------------------------------------------------------------
+
+	def scan_indx( self ) :
+
+		# Index each file of the product in the data directory that is
+		# not yet in the index (e.g., one added by a process whose index
+		# was read-only), using the current time as its time of last
+		# use, and save the index.
+
+		fl_new = [ ]
+
+		for fl_path in glob( os.path.join( self.path,
+		                                   self.prod + '_*.cdf' ) ) :
+
+			fl = os.path.basename( fl_path )
+
+			nv = self.pars_name( fl )
+
+			if ( ( nv is None ) or ( fl in self.item ) ) :
+				continue
+
+			fl_new.append( ( fl, [ nv[0], nv[1],
+			                       os.path.getsize( fl_path ),
+			                       time( )                    ] ) )
+
+		with self.lock :
+			self.item.update( fl_new )
+			self.calc_best( )
+
+		self.save_indx( )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR FINDING THE LATEST VERSION OF EACH DATE.
+	#-----------------------------------------------------------------------
+
+	def calc_best( self ) :
+
+		# CAUTION!  This function must only be called while holding
+		#           "self.lock".
+
+		self.best = { }
+
+		for ( fl, itm ) in self.item.items( ) :
+			if ( ( itm[0] not in self.best ) or
+			     ( itm[1] > self.item[self.best[itm[0]]][1] ) ) :
+				self.best[itm[0]] = fl
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR FINDING THE FILE OF A DATE.
+	#-----------------------------------------------------------------------
+
+	def find_file( self, date_str ) :
+
+		# Look up the latest version of the file of the requested date,
+		# and return its path (or, if there is none, "None").
+
+		# Note.  If the file has been deleted (other than by this
+		#        index), it is removed from the index.
+
+		with self.lock :
+			fl = self.best.get( date_str )
+
+		if ( fl is None ) :
+			return None
+
+		fl_path = os.path.join( self.path, fl )
+
+		if ( os.path.isfile( fl_path ) ) :
+			return fl_path
+
+		with self.lock :
+			self.item.pop( fl, None )
+			self.calc_best( )
+
+		return self.find_file( date_str )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR ADDING A FILE TO THE INDEX.
+	#-----------------------------------------------------------------------
+
+	def add_file( self, fl_path ) :
+
+		# Index the file (which has just been added to the data
+		# directory), and save the index.
+
+		fl = os.path.basename( fl_path )
+
+		nv = self.pars_name( fl )
+
+		if ( nv is None ) :
+			return
+
+		with self.lock :
+
+			self.item[fl] = [ nv[0], nv[1],
+			                  os.path.getsize( fl_path ), time( ) ]
+
+			best = self.best.get( nv[0] )
+
+			if ( ( best is None ) or
+			     ( self.item[best][1] < nv[1] ) ) :
+				self.best[nv[0]] = fl
+
+		self.save_indx( )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR RECORDING A USE OF A FILE.
+	#-----------------------------------------------------------------------
+
+	def use_file( self, fl_path ) :
+
+		with self.lock :
+			itm = self.item.get( os.path.basename( fl_path ) )
+			if ( itm is not None ) :
+				itm[3] = time( )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR DELETING FILES TO FIT WITHIN THE LIMITS.
+	#-----------------------------------------------------------------------
+
+	def cleanup( self ) :
+
+		# Delete the least recently used files until both the number of
+		# files and their total size are within the limits, save the
+		# index, and return the list of the names of the deleted files
+		# (so that, e.g., their cached conversions can also be
+		# deleted).  The files indexed by other processes are first
+		# merged into the index.
+
+		self.merg_indx( )
+
+		with self.lock :
+
+			n_file = len( self.item )
+			n_byte = sum( [ itm[2]
+			                for itm in self.item.values( ) ] )
+
+			if ( ( n_file <= self.n_file_max ) and
+			     ( n_byte <= self.n_byte_max )     ) :
+				srt = [ ]
+			else :
+				srt = sorted( [ ( self.item[fl][3], fl )
+				                for fl in self.item.keys( ) ] )
+
+			rm = [ ]
+
+			for ( t_use, fl ) in srt :
+
+				if ( ( n_file <= self.n_file_max ) and
+				     ( n_byte <= self.n_byte_max )     ) :
+					break
+
+				rm.append( fl )
+
+				n_file -= 1
+				n_byte -= self.item[fl][2]
+
+			for fl in rm :
+				self.item.pop( fl )
+
+			self.calc_best( )
+
+		for fl in rm :
+			try :
+				os.remove( os.path.join( self.path, fl ) )
+			except :
+				pass
+
+		self.save_indx( )
+
+		return rm
+
+
+################################################################################
+## REBUILD THE INDICES OF THE DEFAULT DATA DIRECTORIES (IF RUN AS A SCRIPT).
+################################################################################
+
+if ( __name__ == '__main__' ) :
+
+	from argparse import ArgumentParser
+
+	prs = ArgumentParser( description='Rebuild the indices of the ' +
+	                                  'Janus data directories.'       )
+
+	prs.add_argument( 'path', nargs='?', default=None,
+	                  help='data directory (default: both of those ' +
+	                       'used by Janus)'                            )
+
+	arg = prs.parse_args( )
+
+	dname = os.path.join( os.path.dirname( os.path.abspath( __file__ ) ),
+	                      'data'                                          )
+
+	prod = [ 'wi_sw-ion-dist_swe-faraday', 'wi_h0_mfi', 'wi_k0_mfi',
+	         'wi_h2_mfi'                                                ]
+
+	if ( arg.path is None ) :
+		lst = [ ( os.path.join( dname, 'fc'  ), prod[0] ),
+		        ( os.path.join( dname, 'mfi' ), prod[1] ),
+		        ( os.path.join( dname, 'mfi' ), prod[2] ),
+		        ( os.path.join( dname, 'mfi' ), prod[3] )  ]
+	else :
+		lst = [ ( arg.path, p ) for p in prod ]
+
+	for ( path, prod ) in lst :
+
+		if ( not os.path.isdir( path ) ) :
+			continue
+
+		indx = file_indx( path, prod )
+
+		indx.rbld_indx( )
+
+		print( '{}: {:d} files'.format( os.path.join( path, prod ),
+		                                len( indx.item )           ) )
@@ -25,21 +25,20 @@
 ## LOAD THE NECESSARY MODULES.
 ################################################################################
 
-# Load the necessary modules for signaling the graphical interface.
-
-from PyQt4.QtCore import SIGNAL
-
 # Load the modules necessary handling dates and times.
 
 from datetime import datetime, timedelta
 
-from janus_time import calc_time_str, calc_time_val, calc_time_epc
+from janus_time import calc_time_str, calc_time_val, calc_time_epc, \
+                       calc_time_val_arr
 
 # Load the necessary "numpy" array modules.
 
-from numpy import amax, amin, append, argsort, array, ceil, floor, tile, where
+from numpy import amax, amin, append, arange, argsort, around, array, ceil, \
+                  concatenate, float32, floor, int32, searchsorted, tile, \
+                  where
 
-# Load the modules necessary for file I/O (including FTP).
+# Load the modules necessary for file I/O.
 
 from spacepy import pycdf
 
@@ -47,10 +46,112 @@ import os.path
 
 from glob import glob
 
-from ftplib import FTP
-
 from scipy.io.idl import readsav
 
+# Load the module necessary for caching converted data.
+
+from janus_cache import cache_bdgt, calc_cache_byte, drop_cache, load_cache, \
+                        save_cache
+
+# Load the module necessary for downloading data files.
+
+from janus_dnld import dnld_mngr
+
+# Load the module necessary for indexing the data directory.
+
+from janus_indx import file_indx
+
+# Load the modules necessary for prefetching data in the background.
+
+from threading import Thread
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR DATING THE DATA FROM AN IDL "SAVE" FILE.
+################################################################################
+
+def calc_idl_date( year, doy_min, ind_0, sub_t ) :
+
+	# Note.  An IDL "SAVE" file of Wind/MFI data covers (at most) the 20
+	#        days of the year "year" that start with day-of-year
+	#        "doy_min".  This function returns the array of those dates
+	#        that are valid, the array of their indices (numbered from
+	#        "ind_0"), and, for each of the times (i.e., values) in
+	#        "sub_t", the index of its date (or "-1" if it has none).
+
+	# Construct an array of dates associated with the file.  For each of
+	# the 20 day-of-year values that could (hypothetically, at least) be
+	# stored in the file, determine whether that value is valid, and, if
+	# it is, add it to the array of dates.  While doing this, also
+	# populate the look-up table of date indices ("-1" for any invalid
+	# day-of-year value and for the times before and after the 20 days).
+
+	new_date_str = array( [ ] )
+	new_date_ind = array( [ ] )
+	n_new_date   = 0
+
+	tab_ind = tile( -1, 22 )
+
+	for d in range( 20 ) :
+
+		# Determine the "d"-th day-of-year value associated with this
+		# file.
+
+		doy_d = doy_min + d
+
+		# If this day-of-year value is too small, move on to the next
+		# one.
+
+		if ( doy_d <= 0 ) :
+			continue
+
+		# Construct a "datetime" object to represent this day-of-year
+		# value.
+
+		# Note.  Noon is chosen for the time of day to avoid any
+		#        potential issues with leap seconds.
+
+		time_epc_d = datetime( year, 1, 1, 12 ) + timedelta( doy_d - 1 )
+
+		# If the "datetime" object indicates a year other than the one
+		# associated with the file, continue onto the next day-of-year
+		# value.
+
+		if ( time_epc_d.year != year ) :
+			continue
+
+		# Since this day-of-year value is valid, enter it into the array
+		# of dates and the look-up table.
+
+		date_str_d = calc_time_str( time_epc_d )[0:10]
+		date_ind_d = ind_0 + n_new_date
+
+		new_date_str = append( new_date_str, [ date_str_d ] )
+		new_date_ind = append( new_date_ind, [ date_ind_d ] )
+
+		tab_ind[d+1] = date_ind_d
+
+		n_new_date += 1
+
+	# Assign each datum the index of its date by locating it among the
+	# boundaries (i.e., midnights) of the 20 days and looking that day up
+	# in the table.
+
+	# Note.  This is done for all data at once (rather than with a
+	#        selection for each date).  Each datum before the first
+	#        boundary (or after the last) is located at the first (or
+	#        last) entry of the table.
+
+	time_val_year = calc_time_val( datetime( year, 1, 1 ) )
+
+	bnd = time_val_year + 86400. * ( doy_min - 1 + arange( 21 ) )
+
+	sub_ind = tab_ind[searchsorted( bnd, sub_t, side='right' )]
+
+	# Return the dates, their indices, and the index of each datum.
+
+	return ( new_date_str, new_date_ind, sub_ind )
+
 
 ################################################################################
 ## DEFINE THE "mfi_arcv" CLASS FOR ACCESSING THE ARCHIVE OF Wind/MFI DATA.
@@ -63,9 +164,12 @@ class mfi_arcv( object ) :
 	#-----------------------------------------------------------------------
 
 	def __init__( self, core=None, buf=3600., tol=0.,
-	                    use_idl=False, use_k0=False,
+	                    use_idl=False, use_k0=False, use_h2=False,
 	                    n_file_max=None, n_date_max=None,
-	                    path=None, verbose=True           ) :
+	                    path=None, verbose=True,
+	                    use_cache=True, use_pref=True,
+	                    src=None, bdgt=None, n_byte_max=None,
+	                    use_win=False, win_dur=900. ) :
 
 		# Save the arguments for later use.
 
@@ -75,9 +179,31 @@ class mfi_arcv( object ) :
 		self.path       = path
 		self.use_idl    = use_idl
 		self.use_k0     = use_k0
+		self.use_h2     = use_h2
 		self.n_file_max = n_file_max
 		self.n_date_max = n_date_max
+		self.n_byte_max = n_byte_max
 		self.verbose    = verbose
+		self.use_cache  = use_cache
+		self.use_pref   = use_pref
+		self.use_win    = use_win
+		self.win_dur    = win_dur
+
+		# Initialize the manager for downloading data files (by default,
+		# from CDAWeb).
+
+		self.dnld = dnld_mngr( src=src )
+
+		# Save the memory budget of the loaded dates (which may be
+		# shared with other archives) or, if none was provided,
+		# initialize one (with no limit).
+
+		if ( bdgt is None ) :
+			self.bdgt = cache_bdgt( )
+		else :
+			self.bdgt = bdgt
+
+		self.mem_rprt = False
 
 		# Validate the values of the "self.max_*" parameters and, if
 		# necessary, provide values for them.
@@ -107,6 +233,24 @@ class mfi_arcv( object ) :
 			self.path = os.path.join( os.path.dirname( __file__ ),
 			                          'data', 'mfi'                )
 
+		# Initialize the index of the CDF files in the data directory
+		# (which also limits the number and total size of those files).
+
+		if ( self.use_idl ) :
+			self.indx = None
+		elif ( self.use_k0 ) :
+			self.indx = file_indx( self.path, 'wi_k0_mfi',
+			                       n_file_max=self.n_file_max,
+			                       n_byte_max=self.n_byte_max )
+		elif ( self.use_h2 ) :
+			self.indx = file_indx( self.path, 'wi_h2_mfi',
+			                       n_file_max=self.n_file_max,
+			                       n_byte_max=self.n_byte_max )
+		else :
+			self.indx = file_indx( self.path, 'wi_h0_mfi',
+			                       n_file_max=self.n_file_max,
+			                       n_byte_max=self.n_byte_max )
+
 		# Initialize the array of dates loaded.
 
 		self.date_str = array( [ ] )
@@ -117,29 +261,72 @@ class mfi_arcv( object ) :
 
 		# Initialize the data arrays.
 
+		# Note.  The timestamp of each datum is stored as a value (see
+		#        "janus_time") rather than as a "datetime" epoch.
+
 		self.mfi_t   = array( [ ] )
 		self.mfi_b_x = array( [ ] )
 		self.mfi_b_y = array( [ ] )
 		self.mfi_b_z = array( [ ] )
 		self.mfi_ind = array( [ ] )
 
+		# Initialize the dictionary of dates being prefetched (see
+		# "self.pref_date") and the time of the spectrum near which
+		# they were requested.
+
+		self.mfi_pref = { }
+
+		self.pref_time = None
+
+		# Initialize the window of data read from the CDF files (see
+		# "self.load_win") and the dictionary of those files held open.
+
+		# Note.  To keep the window compact (as is necessary for the
+		#        "h2" files), each timestamp is stored as an "int32"
+		#        number of milliseconds since "self.win_base", and each
+		#        field component as a "float32".
+
+		self.win_strt = None
+		self.win_stop = None
+		self.win_base = None
+
+		self.win_t   = array( [ ], dtype=int32   )
+		self.win_b_x = array( [ ], dtype=float32 )
+		self.win_b_y = array( [ ], dtype=float32 )
+		self.win_b_z = array( [ ], dtype=float32 )
+
+		self.win_cdf = { }
+
+		# Note.  The window is counted in the memory budget as the
+		#        item "win" of this archive, which is pinned (as the
+		#        window is only ever replaced, never dropped).  The
+		#        files held open are not counted, as their records are
+		#        only read when sliced.
+
+		self.bdgt.pin_item( self, 'win' )
+
 	#-----------------------------------------------------------------------
 	# DEFINE THE FUNCTION FOR LOADING (AND RETURNING) A range OF THE DATA.
 	#-----------------------------------------------------------------------
 
 	def load_rang( self, time_strt, dur_sec ) :
 
-		# Compute the requested start and stop times as values, as
-		# strings, and as "datetime" epochs.
+		# Note.  The timestamps returned by this function are values
+		#        (i.e., seconds since "1970-01-01/00:00:00.000"; see
+		#        "janus_time").
+
+		# Compute the requested start and stop times as values.
 
 		time_strt_val = calc_time_val( time_strt               )
 		time_stop_val = calc_time_val( time_strt_val + dur_sec )
 
-		time_strt_str = calc_time_str( time_strt_val )
-		time_stop_str = calc_time_str( time_stop_val )
+		# If the windowed reading of CDF files has been requested (as it
+		# always is for the "h2" files, whose size prohibits loading
+		# whole dates), load the requested range from the window.
 
-		time_strt_epc = calc_time_epc( time_strt_val )
-		time_stop_epc = calc_time_epc( time_stop_val )
+		if ( ( ( self.use_win ) or ( self.use_h2 ) ) and
+		     ( not self.use_idl )                          ) :
+			return self.load_win( time_strt_val, time_stop_val )
 
 		# Construct an array of the dates requested.
 
@@ -172,12 +359,14 @@ class mfi_arcv( object ) :
 
 		[ self.load_date( dt ) for dt in date_req ]
 
+		# Record this use of each date (for the memory budget).
+
+		[ self.bdgt.use_item( self, dt ) for dt in date_req ]
+
 		# Identify and extract the requested range of Wind/MFI data.
 
-		tk = where( ( self.mfi_t >= ( time_strt_epc -
-		                              timedelta( 0, self.tol ) ) ) &
-		            ( self.mfi_t <= ( time_stop_epc +
-		                              timedelta( 0, self.tol ) ) )   )
+		tk = where( ( self.mfi_t >= ( time_strt_val - self.tol ) ) &
+		            ( self.mfi_t <= ( time_stop_val + self.tol ) )   )
 		tk = tk[0]
 
 		n_tk = len( tk )
@@ -213,6 +402,275 @@ class mfi_arcv( object ) :
 
 		return ( ret_t, ret_b_x, ret_b_y, ret_b_z )
 
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR LOADING (AND RETURNING) A RANGE FROM A WINDOW.
+	#-----------------------------------------------------------------------
+
+	def load_win( self, time_strt_val, time_stop_val ) :
+
+		# Note.  Rather than loading whole dates, this function reads
+		#        from the CDF files only those records within a window
+		#        of "self.win_dur" seconds.  That window is retained in
+		#        memory and is only re-read (i.e., slid forward or
+		#        backward) once a requested range falls outside of it.
+
+		# Compute the start and stop times of the requested range
+		# (including the tolerance).
+
+		req_strt = time_strt_val - self.tol
+		req_stop = time_stop_val + self.tol
+
+		# If the requested range is not entirely within the current
+		# window, read a new window that begins at the start of the
+		# range.
+
+		if ( ( self.win_strt is None    ) or
+		     ( req_strt < self.win_strt ) or
+		     ( req_stop > self.win_stop )    ) :
+
+			self.read_win( req_strt, max( req_stop,
+			                          req_strt + self.win_dur ) )
+
+		# Identify and extract the requested range of Wind/MFI data
+		# (converting it back to timestamp values and "float" field
+		# components).
+
+		# Note.  The data of the window are already sorted by time (see
+		#        "self.read_win").
+
+		i_strt = searchsorted( self.win_t, around(
+		                       ( req_strt - self.win_base ) * 1000. ),
+		                       side='left'                           )
+		i_stop = searchsorted( self.win_t, around(
+		                       ( req_stop - self.win_base ) * 1000. ),
+		                       side='right'                          )
+
+		if ( i_stop <= i_strt ) :
+			self.mesg_txt( 'none' )
+
+		ret_t   = around( self.win_base +
+		                  self.win_t[i_strt:i_stop] / 1000., 3 )
+		ret_b_x = array( self.win_b_x[i_strt:i_stop], dtype=float )
+		ret_b_y = array( self.win_b_y[i_strt:i_stop], dtype=float )
+		ret_b_z = array( self.win_b_z[i_strt:i_stop], dtype=float )
+
+		# Request a clean-up of the files in the data directory.
+
+		self.cleanup_file( )
+
+		# Return the requested range of Wind/MFI data.
+
+		return ( ret_t, ret_b_x, ret_b_y, ret_b_z )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR READING A WINDOW OF DATA FROM THE CDF FILES.
+	#-----------------------------------------------------------------------
+
+	def read_win( self, win_strt, win_stop ) :
+
+		# Determine the names of the variables in the CDF files.
+
+		( var_t, var_b, var_pnt ) = self.calc_var( )
+
+		# Construct a list of the dates spanned by the window.
+
+		date_lst = [ ]
+
+		date_i = ( calc_time_str( win_strt ) )[0:10]
+		time_i = calc_time_val( date_i + '/00:00:00.000' )
+
+		while ( time_i <= win_stop ) :
+
+			date_lst.append( date_i )
+
+			time_i = time_i + 86400.
+			date_i = ( calc_time_str( time_i ) )[0:10]
+			time_i = calc_time_val( date_i + '/00:00:00.000' )
+
+		# Close any file whose date is not spanned by the window.
+
+		for date_str in list( self.win_cdf.keys( ) ) :
+
+			if ( date_str not in date_lst ) :
+
+				cdf = self.win_cdf.pop( date_str )
+
+				if ( cdf is not None ) :
+					cdf.close( )
+
+		# From the file for each date, read only those records within
+		# the window.
+
+		sub_t   = [ ]
+		sub_b_x = [ ]
+		sub_b_y = [ ]
+		sub_b_z = [ ]
+
+		for date_str in date_lst :
+
+			# If this date's file is not already open, open it.  If
+			# this fails, move on to the next date.
+
+			# Note.  A failure is also retained (as "None") so that
+			#        the file is not sought again for every window.
+
+			if ( date_str not in self.win_cdf ) :
+				self.win_cdf[date_str] = self.open_cdf(
+				                                     date_str )
+
+			cdf = self.win_cdf[date_str]
+
+			if ( cdf is None ) :
+				continue
+
+			# Locate the records within the window.
+
+			# CAUTION!  The bisection of the epochs assumes that
+			#           they are stored (as is the case for the
+			#           Wind/MFI CDF files) in ascending order.
+
+			i_strt = self.srch_epc( cdf[var_t], win_strt, False )
+			i_stop = self.srch_epc( cdf[var_t], win_stop, True  )
+
+			if ( i_stop <= i_strt ) :
+				continue
+
+			# Read the records within the window.
+
+			# Note.  Some of these variables are two-dimensional
+			#        (with a single column) in the "h0" files.
+
+			t = calc_time_val_arr( cdf[var_t][i_strt:i_stop] )
+			b = array( cdf[var_b][i_strt:i_stop], dtype=float )
+
+			t = t.reshape( ( -1 ) )
+
+			# Select those data which seem to have valid (versus
+			# fill) values.
+
+			if ( var_pnt is None ) :
+				tk = where( amax( abs( b ), axis=1 )
+				                                < 1000. )[0]
+			else :
+				pnt = array( cdf[var_pnt][i_strt:i_stop] )
+				tk  = where( pnt.reshape( ( -1 ) ) > 0 )[0]
+
+			sub_t.append(   t[tk]      )
+			sub_b_x.append( b[tk,0]    )
+			sub_b_y.append( b[tk,1]    )
+			sub_b_z.append( b[tk,2]    )
+
+		# Save the data of the new window (sorted by time and in their
+		# compact form; see "self.__init__").
+
+		self.win_strt = win_strt
+		self.win_stop = win_stop
+		self.win_base = floor( win_strt )
+
+		if ( len( sub_t ) > 0 ) :
+
+			t = concatenate( sub_t )
+
+			srt = argsort( t, kind='mergesort' )
+
+			self.win_t   = array( around( ( t[srt] - self.win_base )
+			                              * 1000. ), dtype=int32 )
+			self.win_b_x = array( concatenate( sub_b_x )[srt],
+			                      dtype=float32                 )
+			self.win_b_y = array( concatenate( sub_b_y )[srt],
+			                      dtype=float32                 )
+			self.win_b_z = array( concatenate( sub_b_z )[srt],
+			                      dtype=float32                 )
+
+		else :
+
+			self.win_t   = array( [ ], dtype=int32   )
+			self.win_b_x = array( [ ], dtype=float32 )
+			self.win_b_y = array( [ ], dtype=float32 )
+			self.win_b_z = array( [ ], dtype=float32 )
+
+		# Update the size of the window in the memory budget.
+
+		n_byte = ( self.win_t.nbytes   + self.win_b_x.nbytes +
+		           self.win_b_y.nbytes + self.win_b_z.nbytes   )
+
+		self.bdgt.add_item( self, 'win', n_byte, use=False )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR OPENING (WITHOUT READING) A DATE'S CDF.
+	#-----------------------------------------------------------------------
+
+	def open_cdf( self, date_str ) :
+
+		# Find (or download) the file that contains data from the
+		# requested date.  If this fails, abort.
+
+		fl_path = self.find_cdf( date_str )
+
+		if ( fl_path is None ) :
+			return None
+
+		# Attempt to open the file.
+
+		# Note.  Opening a CDF file does not read its variables; the
+		#        records of each are only read when sliced.
+
+		self.mesg_txt( 'load', date_str )
+
+		try :
+			return pycdf.CDF( fl_path )
+		except :
+			self.mesg_txt( 'fail', date_str )
+			return None
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR BISECTING A CDF'S EPOCHS.
+	#-----------------------------------------------------------------------
+
+	def srch_epc( self, var, time_val, right ) :
+
+		# Note.  This function returns the index at which "time_val"
+		#        would be inserted into the (ascending) epochs of "var"
+		#        (i.e., as "numpy.searchsorted" would with "side" set to
+		#        "left" or, if "right" is "True", to "right").  Only a
+		#        single record is read per iteration.
+
+		i_lo = 0
+		i_hi = len( var )
+
+		while ( i_lo < i_hi ) :
+
+			i_md = ( i_lo + i_hi ) // 2
+
+			t_md = calc_time_val_arr( var[i_md:i_md+1] ).flat[0]
+
+			if ( ( t_md < time_val ) or
+			     ( right and ( t_md == time_val ) ) ) :
+				i_lo = i_md + 1
+			else :
+				i_hi = i_md
+
+		return i_lo
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR DETERMINING THE NAMES OF THE CDF'S VARIABLES.
+	#-----------------------------------------------------------------------
+
+	def calc_var( self ) :
+
+		# Return the names of the variables for the epochs, the field
+		# vectors, and the number of points averaged into each vector.
+
+		# Note.  The "h2" files have no variable for the number of
+		#        points (as each vector is a single measurement).
+
+		if ( self.use_k0 ) :
+			return ( 'Epoch', 'BGSEc', 'N' )
+		elif ( self.use_h2 ) :
+			return ( 'Epoch', 'BGSE', None )
+		else :
+			return ( 'Epoch3', 'B3GSE', 'NUM3_PTS' )
+
 	#-----------------------------------------------------------------------
 	# DEFINE THE FUNCTION FOR LOADING ALL DATA FROM DATE-SPECIFIED FILE.
 	#-----------------------------------------------------------------------
@@ -269,115 +727,54 @@ class mfi_arcv( object ) :
 
 			fl_path = os.path.join( self.path, fl )
 
-			# If the file exists, attempt to load it; otherwise,
-			# abort.
-
-			self.mesg_txt( 'load', date_str )
-
-			if ( os.path.isfile( fl_path ) ) :
-				try :
-					dat = readsav( fl_path )
-				except :
-					self.mesg_txt( 'fail', date_str )
-					return
-			else :
-				self.mesg_txt( 'fail', date_str )
-				return
-
-			# Determine the number of data loaded.  If none were
-			# loaded, abort.
-
-			n_sub = len( dat.doymag )
-
-			if ( n_sub <= 0 ) :
-				self.mesg_txt( 'fail', date_str )
-				return
-
-			# Extract the data from the loaded file.
-
-			sub_doy = dat.doymag
-			sub_b_x = dat.bxmag
-			sub_b_y = dat.bymag
-			sub_b_z = dat.bzmag
-
-			sub_ind = tile( -1, len( dat.doymag ) )
-
-			# Convert the loaded time from floating-point
-			# day-of-year to "datetime" epoch.
-
-			sub_t = array( [ datetime( year, 1, 1 ) + 
-					               timedelta( doy - 1. )
-			                 for doy in sub_doy                  ] )
-
-			# Construct an array of dates associated with the file
-			# that was loaded.  For each of the 20 day-of-year
-			# values that could (hypothetically, at least) be stored
-			# in the file, determine whether that value is valid,
-			# and, if it is, add it to the array of dates.  While
-			# doing this, also populate the "sub_ind" array.
-
-			new_date_str = array( [ ] )
-			new_date_ind = array( [ ] )
-			n_new_date   = 0
-
-			for d in range( 20 ) :
+			# Attempt to load the data from the cache of converted
+			# data (see "janus_cache").  If they are not there, read
+			# them from the file and add them to the cache.
 
-				# Determine the "d"-th day-of-year value
-				# associated with this file.
+			name = 'mfi_' + fl[0:-4]
+			key  = [ 'doy', 'b_x', 'b_y', 'b_z' ]
+			sub  = None
 
-				doy_d = doy_min + d
+			if ( self.use_cache ) :
 
-				# If this day-of-year value is too small, move
-				# on to the next one.
+				sub = load_cache( self.path, name, key,
+				                  src=fl_path           )
 
-				if ( doy <= 0 ) :
-					continue
+				if ( sub is not None ) :
+					self.mesg_txt( 'load', date_str )
 
-				# Construct a "datetime" object to represent
-				# this day-of-year value.
+			if ( sub is None ) :
 
-				# Note.  Noon is chosen for the time of day to
-				#        avoid any potential issues with leap
-				#        seconds.
+				sub = self.read_idl( fl_path, date_str )
 
-				time_epc_d = datetime( year, 1, 1, 12 ) + \
-				             timedelta( doy_d - 1 )
-
-				time_epc_d_1 = datetime( year, 1, 1 ) + \
-				               timedelta( doy_d - 1 )
-				time_epc_d_2 = datetime( year, 1, 1 ) + \
-				               timedelta( doy_d )
-
-				# If the "datetime" object indicates a year
-				# other than the one associated with the file,
-				# continue onto the next day-of-year value.
-
-				if ( time_epc_d.year != year ) :
-					continue
+				if ( sub is None ) :
+					return
 
-				# Since this day-of-year value is valid, enter
-				# it into the array of dates.
+				if ( self.use_cache ) :
+					save_cache( self.path, name, key, sub,
+					            src=fl_path                )
 
-				date_str_d = calc_time_str( time_epc_d )[0:10]
-				date_ind_d = self.t_date + n_new_date
+			sub_doy = sub['doy']
+			sub_b_x = sub['b_x']
+			sub_b_y = sub['b_y']
+			sub_b_z = sub['b_z']
 
-				new_date_str = append( new_date_str,
-				                       [ date_str_d ] )
-				new_date_ind = append( new_date_ind,
-				                       [ date_ind_d ] )
+			# Convert the loaded time from floating-point
+			# day-of-year to a value.
 
-				n_new_date += 1
+			time_val_year = calc_time_val( datetime( year, 1, 1 ) )
 
-				# Select all data associated with this date
-				# and assign each the date index.
+			sub_t = around( time_val_year +
+			                ( 86400. * ( sub_doy - 1. ) ), 3 )
 
-				tk_d = where( ( sub_t >= time_epc_d_1 ) &
-				              ( sub_t <  time_epc_d_2 )   )[0]
+			# Construct the array of dates associated with the file
+			# that was loaded, and assign each datum the index of
+			# its date.
 
-				n_tk_d = len( tk_d )
+			( new_date_str, new_date_ind, sub_ind ) = \
+			      calc_idl_date( year, doy_min, self.t_date, sub_t )
 
-				if ( n_tk_d > 0 ) :
-					sub_ind[tk_d] = date_ind_d
+			n_new_date = len( new_date_str )
 
 			# Select those data which seem to have valid (versus
 			# fill) values.
@@ -391,77 +788,30 @@ class mfi_arcv( object ) :
 
 		else :
 
-			# Determine the name of the file that contains data
-			# from the requested date.
+			# If this date is being (or has been) prefetched, wait
+			# for that to finish and use its result.  Otherwise,
+			# load the data from this date now.
 
-			str_year = date_str[0:4]
-			str_mon  = date_str[5:7]
-			str_day  = date_str[8:10]
+			if ( date_str in self.mfi_pref ) :
 
-			if ( self.use_k0 ) :
-				fl0 = 'wi_k0_mfi_' + \
-				      str_year + str_mon + str_day + '_v??.cdf'
-			else :
-				fl0 = 'wi_h0_mfi_' + \
-				      str_year + str_mon + str_day + '_v??.cdf'
+				( thr, res ) = self.mfi_pref.pop( date_str )
 
-			fl0_path = os.path.join( self.path, fl0 )
+				thr.join( )
 
-			gb = glob( fl0_path )
+				sub = res[0]
 
-			# If the file does not exist, attempt to download it.
-
-			if ( len( gb ) > 0 ) :
-				fl_path = gb[-1]
 			else :
-				try :
-					self.mesg_txt( 'ftp', date_str )
-					ftp = FTP( 'cdaweb.gsfc.nasa.gov' )
-					ftp.login( )
-					ftp.cwd( 'pub/data/wind/mfi/' )
-					if ( self.use_k0 ) :
-						ftp.cwd( 'mfi_k0/' )
-					else :
-						ftp.cwd( 'mfi_h0/' )
-					ftp.cwd( str_year )
-					ls = ftp.nlst( fl0 )
-					fl = ls[-1]
-					fl_path = os.path.join( self.path, fl )
-					ftp.retrbinary( "RETR " + fl,
-					           open( fl_path, 'wb' ).write )
-				except :
-					self.mesg_txt( 'fail', date_str )
-					return
 
-			# If the file now exists, try to load it; otherwise,
-			# abort.
+				sub = self.conv_date( date_str )
 
-			self.mesg_txt( 'load', date_str )
-
-			if ( os.path.isfile( fl_path ) ) :
-				try :
-					cdf = pycdf.CDF( fl_path )
-				except :
-					self.mesg_txt( 'fail', date_str )
-					return
-			else :
-				self.mesg_txt( 'fail', date_str )
+			if ( sub is None ) :
 				return
 
-			# Extract the data from the loaded file.
-
-			if ( self.use_k0 ) :
-				sub_t   = cdf['Epoch'][:]
-				sub_b_x = cdf['BGSEc'][:,0]
-				sub_b_y = cdf['BGSEc'][:,1]
-				sub_b_z = cdf['BGSEc'][:,2]
-				sub_pnt = cdf['N'][:]
-			else :
-				sub_t   = cdf['Epoch3'][:,0]
-				sub_b_x = cdf['B3GSE'][:,0]
-				sub_b_y = cdf['B3GSE'][:,1]
-				sub_b_z = cdf['B3GSE'][:,2]
-				sub_pnt = cdf['NUM3_PTS'][:,0]
+			sub_t   = sub['t']
+			sub_b_x = sub['b_x']
+			sub_b_y = sub['b_y']
+			sub_b_z = sub['b_z']
+			sub_pnt = sub['pnt']
 
 			sub_ind = tile( self.t_date, len( sub_t ) )
 
@@ -496,35 +846,453 @@ class mfi_arcv( object ) :
 		self.n_date += n_new_date
 		self.t_date += n_new_date
 
+		# Add each of these dates to the memory budget.
+
+		# Note.  Each datum comprises five "float" values (see
+		#        "self.mfi_*").
+
+		for d in range( n_new_date ) :
+
+			n_byte = 5 * 8 * len( where(
+			              sub_ind[tk] == new_date_ind[d] )[0] )
+
+			self.bdgt.add_item( self, new_date_str[d], n_byte )
+
+		self.mem_rprt = True
+
 		# Request a clean-up of the files in the data directory.
 
 		self.cleanup_file( )
 
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR DOWNLOADING THE DATA FILES FOR A SET OF DATES.
+	#-----------------------------------------------------------------------
+
+	def dnld_date( self, date_lst ) :
+
+		# Note.  This function downloads (concurrently) any of the data
+		#        files for the dates in "date_lst" that are missing
+		#        from the data directory; it does not load any data.
+		#        IDL "SAVE" files are never downloaded.
+
+		if ( self.use_idl ) :
+			return
+
+		# Construct a request for the file of each date that is not
+		# already in the data directory.
+
+		req_date = [ ]
+		req      = [ ]
+
+		for date_str in date_lst :
+
+			if ( self.indx.find_file( date_str ) is not None ) :
+				continue
+
+			fl0 = self.calc_fl0( date_str )
+
+			self.mesg_txt( 'ftp', date_str )
+
+			req_date.append( date_str )
+			req.append( ( self.calc_rdir( date_str ), fl0,
+			              self.path                       ) )
+
+		# Download the requested files, index them, and report any
+		# failures.
+
+		ret = self.dnld.get_rang( req )
+
+		for ( date_str, fl_path ) in zip( req_date, ret ) :
+			if ( fl_path is None ) :
+				self.mesg_txt( 'fail', date_str )
+			else :
+				self.indx.add_file( fl_path )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR NAMING THE CDF FOR A DATE.
+	#-----------------------------------------------------------------------
+
+	def calc_fl0( self, date_str ) :
+
+		# Return the pattern matching the name of the file that contains
+		# data from the requested date (the final characters of which
+		# give the file's version).
+
+		if ( self.use_k0 ) :
+			return 'wi_k0_mfi_' + date_str[0:4] + \
+			       date_str[5:7] + date_str[8:10] + '_v??.cdf'
+		elif ( self.use_h2 ) :
+			return 'wi_h2_mfi_' + date_str[0:4] + \
+			       date_str[5:7] + date_str[8:10] + '_v??.cdf'
+		else :
+			return 'wi_h0_mfi_' + date_str[0:4] + \
+			       date_str[5:7] + date_str[8:10] + '_v??.cdf'
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR NAMING THE SOURCE DIRECTORY OF A DATE'S CDF.
+	#-----------------------------------------------------------------------
+
+	def calc_rdir( self, date_str ) :
+
+		# Return the directory on the source that contains the file
+		# with data from the requested date.
+
+		if ( self.use_k0 ) :
+			return 'pub/data/wind/mfi/mfi_k0/' + date_str[0:4]
+		elif ( self.use_h2 ) :
+			return 'pub/data/wind/mfi/mfi_h2/' + date_str[0:4]
+		else :
+			return 'pub/data/wind/mfi/mfi_h0/' + date_str[0:4]
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR PREFETCHING ALL DATA FROM A DATE.
+	#-----------------------------------------------------------------------
+
+	def pref_date( self, date_str, time_val=None ) :
+
+		# Note.  This function returns immediately.  The data from the
+		#        requested date are read (and converted) by a background
+		#        thread, and "self.load_date" later adds them to the
+		#        archive (waiting for the thread only if it has not yet
+		#        finished).
+
+		# Note.  If the time "time_val" of the spectrum near which the
+		#        date has been requested is given, it is saved, and
+		#        any other date being prefetched from which it is more
+		#        than a day away is dropped (see "self.cleanup_pref").
+
+		if ( time_val is not None ) :
+			self.pref_time = time_val
+
+		self.cleanup_pref( )
+
+		# If prefetching is disabled, or if the requested date has
+		# already been loaded or is already being prefetched, abort.
+
+		# Note.  Dates are not prefetched from IDL "SAVE" files as each
+		#        of those covers twenty days (all of which are loaded
+		#        at once).
+
+		# Note.  Likewise, dates are not prefetched when the CDF files
+		#        are being read in windows (see "self.load_win").
+
+		if ( ( not self.use_pref ) or ( self.use_idl ) or
+		     ( self.use_win  ) or ( self.use_h2  )    ) :
+			return
+
+		if ( ( date_str in self.mfi_pref           ) or
+		     ( date_str in self.date_str.tolist( ) )    ) :
+			return
+
+		# Start a thread that loads the data from the requested date and
+		# saves them to "res".
+
+		res = [ None ]
+
+		thr = Thread( target=self.pref_work, args=( date_str, res ) )
+
+		thr.daemon = True
+
+		thr.start( )
+
+		self.mfi_pref[date_str] = ( thr, res )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION RUN BY THE THREAD THAT PREFETCHES A DATE.
+	#-----------------------------------------------------------------------
+
+	def pref_work( self, date_str, res ) :
+
+		res[0] = self.conv_date( date_str )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR CLEANING UP THE PREFETCHED DATES.
+	#-----------------------------------------------------------------------
+
+	def cleanup_pref( self ) :
+
+		# Note.  A prefetched date is only removed from "self.mfi_pref"
+		#        when "self.load_date" takes its result.  Thus, a date
+		#        that is prefetched but never loaded (e.g., as the user
+		#        has jumped to another date) would otherwise be kept
+		#        indefinitely.
+
+		for date_str in list( self.mfi_pref.keys( ) ) :
+
+			# If the spectrum near which dates are being
+			# prefetched is more than a day away from this date,
+			# drop it.
+
+			date_val = calc_time_val( date_str )
+
+			if ( ( self.pref_time is not None ) and
+			     ( ( self.pref_time < date_val - 86400. ) or
+			       ( self.pref_time > date_val + 172800. ) ) ) :
+				self.drop_date( date_str )
+				continue
+
+			# If this date has finished being prefetched, add it
+			# to the memory budget (if it has not already been).
+
+			# Note.  It is added as unused so that it is the first
+			#        date to be dropped to enforce the budget.
+
+			( thr, res ) = self.mfi_pref[date_str]
+
+			if ( ( thr.is_alive( )                     ) or
+			     ( res[0] is None                      ) or
+			     ( ( self, date_str ) in self.bdgt.item )    ) :
+				continue
+
+			n_byte = calc_cache_byte( res[0] )
+
+			self.bdgt.add_item( self, date_str, n_byte, use=False )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR CONVERTING ALL DATA FROM A DATE-SPECIFIED CDF.
+	#-----------------------------------------------------------------------
+
+	def conv_date( self, date_str ) :
+
+		# Find (or download) the file that contains data from the
+		# requested date.  If this fails, abort.
+
+		fl_path = self.find_cdf( date_str )
+
+		if ( fl_path is None ) :
+			return None
+
+		# Attempt to load the data from the cache of converted data (see
+		# "janus_cache").  If they are not there, read them from the
+		# file and add them to the cache.
+
+		# Note.  The cached item is named after the file, so each
+		#        version of a file is cached separately.
+
+		name = 'mfi_' + os.path.basename( fl_path )[0:-4]
+
+		key = [ 't', 'b_x', 'b_y', 'b_z', 'pnt' ]
+		sub = None
+
+		if ( self.use_cache ) :
+
+			sub = load_cache( self.path, name, key, src=fl_path )
+
+			if ( sub is not None ) :
+				self.mesg_txt( 'load', date_str )
+
+		if ( sub is None ) :
+
+			sub = self.read_cdf( fl_path, date_str )
+
+			if ( sub is None ) :
+				return None
+
+			if ( self.use_cache ) :
+				save_cache( self.path, name, key, sub,
+				            src=fl_path                )
+
+		# Return the loaded data.
+
+		return sub
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR READING THE DATA FROM AN IDL "SAVE" FILE.
+	#-----------------------------------------------------------------------
+
+	def read_idl( self, fl_path, date_str ) :
+
+		# If the file exists, attempt to load it; otherwise, abort.
+
+		self.mesg_txt( 'load', date_str )
+
+		if ( os.path.isfile( fl_path ) ) :
+			try :
+				dat = readsav( fl_path )
+			except :
+				self.mesg_txt( 'fail', date_str )
+				return None
+		else :
+			self.mesg_txt( 'fail', date_str )
+			return None
+
+		# Determine the number of data loaded.  If none were loaded,
+		# abort.
+
+		n_sub = len( dat.doymag )
+
+		if ( n_sub <= 0 ) :
+			self.mesg_txt( 'fail', date_str )
+			return None
+
+		# Extract and return the data from the loaded file.
+
+		return { 'doy':array( dat.doymag, dtype=float ),
+		         'b_x':array( dat.bxmag , dtype=float ),
+		         'b_y':array( dat.bymag , dtype=float ),
+		         'b_z':array( dat.bzmag , dtype=float )  }
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR READING THE DATA FROM A DATE-SPECIFIED CDF.
+	#-----------------------------------------------------------------------
+
+	def read_cdf( self, fl_path, date_str ) :
+
+		# If the file (see "self.find_cdf") exists, try to load it;
+		# otherwise, abort.
+
+		self.mesg_txt( 'load', date_str )
+
+		if ( os.path.isfile( fl_path ) ) :
+			try :
+				cdf = pycdf.CDF( fl_path )
+			except :
+				self.mesg_txt( 'fail', date_str )
+				return None
+		else :
+			self.mesg_txt( 'fail', date_str )
+			return None
+
+		# Extract the data from the loaded file.
+
+		# Note.  Some of these variables are two-dimensional (with a
+		#        single column) in the "h0" files.
+
+		( var_t, var_b, var_pnt ) = self.calc_var( )
+
+		sub_t   = calc_time_val_arr( cdf[var_t][...] ).reshape( ( -1 ) )
+		sub_b_x = cdf[var_b][:,0]
+		sub_b_y = cdf[var_b][:,1]
+		sub_b_z = cdf[var_b][:,2]
+
+		if ( var_pnt is None ) :
+			sub_pnt = where( ( abs( sub_b_x ) < 1000. ) &
+			                 ( abs( sub_b_y ) < 1000. ) &
+			                 ( abs( sub_b_z ) < 1000. ), 1, 0 )
+		else :
+			sub_pnt = array( cdf[var_pnt][...] ).reshape( ( -1 ) )
+
+		# Return the extracted data.
+
+		return { 't'  :array( sub_t  , dtype=float ),
+		         'b_x':array( sub_b_x, dtype=float ),
+		         'b_y':array( sub_b_y, dtype=float ),
+		         'b_z':array( sub_b_z, dtype=float ),
+		         'pnt':array( sub_pnt, dtype=float )  }
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR FINDING (OR DOWNLOADING) A DATE'S CDF.
+	#-----------------------------------------------------------------------
+
+	def find_cdf( self, date_str ) :
+
+		# Determine the name of the file that contains data from the
+		# requested date.
+
+		# Note.  The file is looked up in the index of the data
+		#        directory.  Only if it is not there is the directory
+		#        itself searched (in case the file was added by some
+		#        other means) and then, failing that, the file
+		#        downloaded.
+
+		fl0 = self.calc_fl0( date_str )
+
+		fl0_path = os.path.join( self.path, fl0 )
+
+		fl_path = self.indx.find_file( date_str )
+
+		if ( fl_path is None ) :
+			gb = glob( fl0_path )
+			if ( len( gb ) > 0 ) :
+				fl_path = sorted( gb )[-1]
+				self.indx.add_file( fl_path )
+
+		# If the file does not exist, attempt to download it.
+
+		if ( fl_path is None ) :
+			self.mesg_txt( 'ftp', date_str )
+			fl_path = self.dnld.get_file(
+			                     self.calc_rdir( date_str ),
+			                     fl0, self.path              )
+			if ( fl_path is None ) :
+				self.mesg_txt( 'fail', date_str )
+				return None
+			self.indx.add_file( fl_path )
+
+		self.indx.use_file( fl_path )
+
+		# Return the path of the file.
+
+		return fl_path
+
 	#-----------------------------------------------------------------------
 	# DEFINE THE FUNCTION FOR CLEANING UP THIS ARCHIVE.
 	#-----------------------------------------------------------------------
 
 	def cleanup_date( self ) :
 
-		# If the number of dates is less than or equal to the maximum,
-		# abort (as nothing needs to be done).
+		# Drop any prefetched dates that are no longer near the current
+		# spectrum (and add the others to the memory budget).
+
+		self.cleanup_pref( )
+
+		# Drop the least recently used dates from this archive until the
+		# number of loaded dates is within the maximum.
+
+		while ( self.n_date > self.n_date_max ) :
+
+			key = self.bdgt.calc_lru( self )
+
+			if ( key is None ) :
+				break
 
-		if ( self.n_date <= self.n_date_max ) :
+			self.drop_date( key[1] )
+
+		# Drop the least recently used dates (from this or any other
+		# archive sharing the memory budget) until the loaded dates fit
+		# within the budget.
+
+		if ( self.bdgt.cleanup( ) > 0 ) :
+			self.mem_rprt = True
+
+		# If any date has been loaded or dropped since the last report,
+		# report the memory used by the loaded dates.
+
+		if ( self.mem_rprt ) :
+
+			self.mem_rprt = False
+
+			self.mesg_txt( 'mem', '{:.1f} MB'.format(
+			                   self.bdgt.calc_mem( ) / 2.**20 ) )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR DROPPING A DATE FROM THIS ARCHIVE.
+	#-----------------------------------------------------------------------
+
+	def drop_date( self, date_str ) :
+
+		# If the requested date is being (or has been) prefetched,
+		# discard that prefetch (whose thread will finish on its own).
+
+		if ( date_str in self.mfi_pref ) :
+			del self.mfi_pref[date_str]
+			self.bdgt.drop_item( self, date_str )
 			return
 
-		# Delete dates (and all associated data) from this archive so
-		# that the number of loaded dates equals the maximum allowed.
+		# Identify the requested date.  If it has not been loaded,
+		# abort.
 
-		n_rm = self.n_date - self.n_date_max
+		tk = where( self.date_str == date_str )[0]
 
-		ind_min = self.t_date - self.n_date_max
+		if ( len( tk ) == 0 ) :
+			return
 
-		self.date_str = self.date_str[n_rm:]
-		self.date_ind = self.date_ind[n_rm:]
+		# Delete all data from the requested date, and remove the date
+		# from the array of loaded dates.
 
-		self.n_date -= n_rm
+		ind = self.date_ind[tk[0]]
 
-		tk = where( self.mfi_ind >= ind_min )[0]
+		tk = where( self.mfi_ind != ind )[0]
 
 		self.mfi_t   = self.mfi_t[tk]
 		self.mfi_b_x = self.mfi_b_x[tk]
@@ -532,32 +1300,44 @@ class mfi_arcv( object ) :
 		self.mfi_b_z = self.mfi_b_z[tk]
 		self.mfi_ind = self.mfi_ind[tk]
 
+		tk = where( self.date_str != date_str )[0]
+
+		self.date_str = self.date_str[tk]
+		self.date_ind = self.date_ind[tk]
+
+		self.n_date = len( self.date_str )
+
+		self.bdgt.drop_item( self, date_str )
+
 	#-----------------------------------------------------------------------
 	# DEFINE THE FUNCTION FOR CLEANING UP THE DATA DIRECTORY.
 	#-----------------------------------------------------------------------
 
 	def cleanup_file( self ) :
 
+		# Note.  The cached conversion (see "self.conv_date") of each
+		#        deleted file is also deleted.
+
+		# If CDF files are being used, request that their index delete
+		# the least recently used files until both the number of files
+		# and their total size are within the limits.
+
+		if ( not self.use_idl ) :
+			for fl in self.indx.cleanup( ) :
+				drop_cache( self.path, 'mfi_' + fl[0:-4] )
+			return
+
 		# If there is no limit on the number files in the data
 		# directory, abort (as there's nothing to be done).
 
 		if ( self.n_file_max >= float( 'infinity' ) ) :
 			return
 
-		# Generate a list of the names of all files of the requested
-		# type (as specified by the "use_*" keywords) in the data
-		# directory.
+		# Generate a list of the names of all IDL "SAVE" files in the
+		# data directory.
 
-		if ( self.use_idl ) :
-			file_name = array( glob(
-			              os.path.join( self.path, 'wind_mag*' ) ) )
-		else :
-			if ( self.use_k0 ) :
-				file_name = array( glob(
-				         os.path.join( self.path, 'wi_k0*' ) ) )
-			else :
-				file_name = array( glob(
-				         os.path.join( self.path, 'wi_h0*' ) ) )
+		file_name = array( glob(
+		              os.path.join( self.path, 'wind_mag*' ) ) )
 
 		n_file = len( file_name )
 
@@ -583,6 +1363,8 @@ class mfi_arcv( object ) :
 
 		for f in range( n_file - self.n_file_max ) :
 			os.remove( file_name[f] )
+			drop_cache( self.path, 'mfi_' +
+			            os.path.basename( file_name[f] )[0:-4] )
 
 	#-----------------------------------------------------------------------
 	# DEFINE THE FUNCTION FOR SENDING INFORMATIONAL MESSAGES TO THE USER.
@@ -597,8 +1379,7 @@ class mfi_arcv( object ) :
 
 			return
 
-		# Emit a message signal (on behalf of the core) containing the
+		# Emit a message event (on behalf of the core) containing the
 		# message parameters.
 
-		self.core.emit( SIGNAL('janus_mesg'),
-		                'mfi', mesg_typ, mesg_obj )
+		self.core.emit( 'janus_mesg', 'mfi', mesg_typ, mesg_obj )
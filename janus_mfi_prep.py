@@ -0,0 +1,242 @@
+################################################################################
+##
+## Janus -- GUI Software for Processing Thermal-Ion Measurements from the
+##          Wind Spacecraft's Faraday Cups
+##
+## Copyright (C) 2016 Bennett A. Maruca (bmaruca@udel.edu)
+##
+## This program is free software: you can redistribute it and/or modify it under
+## the terms of the GNU General Public License as published by the Free Software
+## Foundation, either version 3 of the License, or (at your option) any later
+## version.
+##
+## This program is distributed in the hope that it will be useful, but WITHOUT
+## ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+## FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+## details.
+##
+## You should have received a copy of the GNU General Public License along with
+## this program.  If not, see http://www.gnu.org/licenses/.
+##
+################################################################################
+
+
+
+################################################################################
+## LOAD THE NECESSARY MODULES.
+################################################################################
+
+# Load the necessary "numpy" array modules.
+
+from numpy import arange, arctan2, array, array_equal, concatenate, \
+                  rad2deg, searchsorted, sqrt, sum
+
+
+################################################################################
+## DEFINE THE "mfi_prep" CLASS FOR PREPARING THE Wind/MFI DATA OF A SPECTRUM.
+################################################################################
+
+# Note.  The Wind/MFI data of consecutive spectra (e.g., during an automated
+#        run) overlap heavily in time.  This class retains the data of the
+#        last window along with each datum's magnitude and angles and the
+#        running sums of the field components and angles.  When a new
+#        window overlaps the last one, only the data entering and leaving
+#        the window are processed.
+
+class mfi_prep( object ) :
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE INITIALIZATION FUNCTION.
+	#-----------------------------------------------------------------------
+
+	def __init__( self, n_updt_max=100 ) :
+
+		# Save the maximum number of consecutive incremental updates
+		# (after which the sums are recomputed from scratch so that
+		# rounding errors cannot accumulate).
+
+		self.n_updt_max = n_updt_max
+
+		# Initialize the window.
+
+		self.rset( )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR RESETTING THE WINDOW.
+	#-----------------------------------------------------------------------
+
+	def rset( self ) :
+
+		# Initialize the data of the window and each datum's magnitude
+		# and angles [deg].
+
+		self.n     = 0
+		self.t     = array( [ ] )
+		self.b_x   = array( [ ] )
+		self.b_y   = array( [ ] )
+		self.b_z   = array( [ ] )
+		self.b     = array( [ ] )
+		self.colat = array( [ ] )
+		self.lon   = array( [ ] )
+
+		# Initialize the running sums and the count of the incremental
+		# updates since they were last recomputed.
+
+		self.sum_b_x   = 0.
+		self.sum_b_y   = 0.
+		self.sum_b_z   = 0.
+		self.sum_colat = 0.
+		self.sum_lon   = 0.
+
+		self.n_updt = 0
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR COMPUTING THE MAGNITUDES AND ANGLES OF DATA.
+	#-----------------------------------------------------------------------
+
+	def calc_ang( self, b_x, b_y, b_z ) :
+
+		# Compute and return the magnitude and the angles [deg] of each
+		# magnetic field vector.
+
+		b_rho = sqrt( b_x**2 + b_y**2 )
+
+		b     = sqrt( b_rho**2 + b_z**2 )
+		colat = rad2deg( arctan2( b_z, b_rho ) )
+		lon   = rad2deg( arctan2( b_y, b_x   ) )
+
+		return ( b, colat, lon )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR UPDATING THE WINDOW.
+	#-----------------------------------------------------------------------
+
+	def updt( self, t, b_x, b_y, b_z ) :
+
+		# Note.  The timestamps "t" are values (see "janus_time") and
+		#        are assumed to be in ascending order (as returned by
+		#        "mfi_arcv.load_rang").
+
+		n = len( t )
+
+		# Locate, in the current window, those data that are also in the
+		# new window.
+
+		# Note.  This is only attempted if the new window's data include
+		#        those data (as a contiguous block with the same times
+		#        and field components); otherwise, the window is
+		#        recomputed from scratch.
+
+		i_0 = 0
+		i_1 = 0
+		j_0 = 0
+
+		if ( ( self.n > 0 ) and ( n > 0 ) and
+		     ( self.n_updt < self.n_updt_max ) ) :
+
+			i_0 = searchsorted( self.t, t[0] , side='left'  )
+			i_1 = searchsorted( self.t, t[-1], side='right' )
+
+			if ( i_1 > i_0 ) :
+				j_0 = searchsorted( t, self.t[i_0],
+				                    side='left'     )
+
+		m = i_1 - i_0
+
+		if ( ( m <= 0 ) or ( j_0 + m > n )                     or
+		     ( not array_equal( t[j_0:j_0+m], self.t[i_0:i_1] ) ) or
+		     ( not array_equal( b_x[j_0:j_0+m],
+		                        self.b_x[i_0:i_1] )            ) or
+		     ( not array_equal( b_y[j_0:j_0+m],
+		                        self.b_y[i_0:i_1] )            ) or
+		     ( not array_equal( b_z[j_0:j_0+m],
+		                        self.b_z[i_0:i_1] )            )    ) :
+
+			# Recompute the window from scratch.
+
+			( self.b, self.colat, self.lon ) = \
+			                         self.calc_ang( b_x, b_y, b_z )
+
+			self.sum_b_x   = sum( b_x        )
+			self.sum_b_y   = sum( b_y        )
+			self.sum_b_z   = sum( b_z        )
+			self.sum_colat = sum( self.colat )
+			self.sum_lon   = sum( self.lon   )
+
+			self.n_updt = 0
+
+		else :
+
+			# Identify the data leaving the window (i.e., those
+			# before and after the shared block in the current
+			# window) and the data entering it (i.e., those before
+			# and after the shared block in the new window).
+
+			lv = concatenate( [ arange( 0, i_0 ),
+			                    arange( i_1, self.n ) ] )
+			en = concatenate( [ arange( 0, j_0 ),
+			                    arange( j_0 + m, n ) ] )
+
+			# Compute the magnitudes and angles of only the entering
+			# data.
+
+			( en_b, en_colat, en_lon ) = \
+			          self.calc_ang( b_x[en], b_y[en], b_z[en] )
+
+			# Update the running sums.
+
+			self.sum_b_x   += ( sum( b_x[en]  ) -
+			                    sum( self.b_x[lv]   )   )
+			self.sum_b_y   += ( sum( b_y[en]  ) -
+			                    sum( self.b_y[lv]   )   )
+			self.sum_b_z   += ( sum( b_z[en]  ) -
+			                    sum( self.b_z[lv]   )   )
+			self.sum_colat += ( sum( en_colat ) -
+			                    sum( self.colat[lv] )   )
+			self.sum_lon   += ( sum( en_lon   ) -
+			                    sum( self.lon[lv]   )   )
+
+			self.n_updt += 1
+
+			# Merge the magnitudes and angles of the entering data
+			# with those of the shared data.
+
+			self.b     = concatenate( [ en_b[0:j_0],
+			                            self.b[i_0:i_1],
+			                            en_b[j_0:]          ] )
+			self.colat = concatenate( [ en_colat[0:j_0],
+			                            self.colat[i_0:i_1],
+			                            en_colat[j_0:]      ] )
+			self.lon   = concatenate( [ en_lon[0:j_0],
+			                            self.lon[i_0:i_1],
+			                            en_lon[j_0:]        ] )
+
+		# Save the data of the new window.
+
+		self.n   = n
+		self.t   = t
+		self.b_x = b_x
+		self.b_y = b_y
+		self.b_z = b_z
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR COMPUTING THE AVERAGE MAGNETIC FIELD.
+	#-----------------------------------------------------------------------
+
+	def calc_avg_vec( self ) :
+
+		# Return the average magnetic field vector of the window.
+
+		return array( [ self.sum_b_x, self.sum_b_y, self.sum_b_z ] ) / \
+		       self.n
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR COMPUTING THE AVERAGE ANGLES OF THE FIELD.
+	#-----------------------------------------------------------------------
+
+	def calc_avg_ang( self ) :
+
+		# Return the average colatitude and longitude [deg] of the
+		# magnetic field vectors of the window.
+
+		return array( [ self.sum_colat, self.sum_lon ] ) / self.n
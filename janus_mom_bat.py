@@ -0,0 +1,286 @@
+################################################################################
+##
+## Janus -- GUI Software for Processing Thermal-Ion Measurements from the
+##          Wind Spacecraft's Faraday Cups
+##
+## Copyright (C) 2016 Bennett A. Maruca (bmaruca@udel.edu)
+##
+## This program is free software: you can redistribute it and/or modify it under
+## the terms of the GNU General Public License as published by the Free Software
+## Foundation, either version 3 of the License, or (at your option) any later
+## version.
+##
+## This program is distributed in the hope that it will be useful, but WITHOUT
+## ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+## FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+## details.
+##
+## You should have received a copy of the GNU General Public License along with
+## this program.  If not, see http://www.gnu.org/licenses/.
+##
+################################################################################
+
+
+
+################################################################################
+## LOAD THE NECESSARY MODULES.
+################################################################################
+
+# Load the dictionary of physical constants.
+
+from janus_const import const
+
+# Load the (vectorized) model of the Wind/FC instrumental response.
+
+from janus_fc_rsp import rsp_cur_bmx, rsp_dir_look, rsp_eff_area
+
+# Load the necessary array modules and mathematical functions.
+
+from numpy import amax, amin, array, einsum, errstate, fmax, inf, nan, \
+                  newaxis, sqrt, sum, where
+
+from numpy.linalg import pinv
+
+
+## +----------+----------------------------------------------------------------+
+## |          |                                                                |
+## | Argument | Comments                                                       |
+## |          |                                                                |
+## +----------+----------------------------------------------------------------+
+## |          |                                                                |
+## | alt      | Altitudes [deg] of the two cups with the shape "( 2, )"        |
+## |          |                                                                |
+## | azm      | Azimuths [deg] of the look directions with the shape           |
+## |          | "( N, 2, 20 )"                                                 |
+## |          |                                                                |
+## | vel_cen  | Velocities [km/s] of the centers of the velocity windows with  |
+## |          | the shape "( N, V )"; padding (i.e., windows beyond those of a |
+## |          | spectrum) may take any positive value                          |
+## |          |                                                                |
+## | vel_wid  | Widths [km/s] of the velocity windows with the shape "( N, V )"|
+## |          |                                                                |
+## | cur      | Currents [pA] with the shape "( N, 2, 20, V )"                 |
+## |          |                                                                |
+## | sel_azm  | Selection of the look directions with the shape "( N, 2, 20 )" |
+## |          |                                                                |
+## | sel_cur  | Selection of the currents with the shape "( N, 2, 20, V )";    |
+## |          | padding must not be selected                                   |
+## |          |                                                                |
+## | mfi_nrm  | Average direction of the magnetic field (as a unit vector)     |
+## |          | with the shape "( N, 3 )"                                      |
+## |          |                                                                |
+## | mfi_vld  | Whether magnetic field data are available with the shape       |
+## |          | "( N, )"                                                       |
+## |          |                                                                |
+## +----------+----------------------------------------------------------------+
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR THE STACKED MOMENTS ANALYSIS.
+################################################################################
+
+def calc_bat_mom( alt, azm, vel_cen, vel_wid, cur, sel_azm, sel_cur,
+                  mfi_nrm, mfi_vld                                   ) :
+
+	# Note.  This function carries out the moments analysis of
+	#        "core.anls_mom" for a stack of "N" spectra at once.  It
+	#        returns a dictionary of the results, each an array whose
+	#        first axis indexes the spectra.  Any result that could not be
+	#        computed for a spectrum (e.g., the components of the thermal
+	#        speed without an anisotropy analysis) is "nan", as is each
+	#        "eta_*" value of a look direction that was not selected.
+
+	# Note.  Equations 3.11, 3.13, and 3.15 of my dissertation (Maruca,
+	#        PhD thesis, 2012) contain an extra factor of $2$ that is
+	#        omitted below in the calculation of the estimators.  This
+	#        factor reflects the half-efficiency that is inherent to the
+	#        use of demodulation and has already been taken into account in
+	#        the calibration of the current measurments.
+
+	q_p = const['q_p']
+	m_p = const['m_p']
+	k_b = const['k_b']
+
+	sel_azm = array( sel_azm, dtype=bool )
+	sel_cur = array( sel_cur, dtype=bool ) & sel_azm[...,newaxis]
+
+	# Suppress the warnings from the arithmetic on unselected (or
+	# insufficiently selected) data, whose results are masked below.
+
+	with errstate( divide='ignore', invalid='ignore' ) :
+
+		# Zero the unselected currents, and compute the sums over
+		# velocity that the estimators require.
+
+		cur_sel = where( sel_cur, cur, 0. )
+
+		vel = vel_cen[:,newaxis,newaxis,:]
+
+		sum_cur     = sum( cur_sel        , axis=-1 )
+		sum_cur_inv = sum( cur_sel / vel  , axis=-1 )
+		sum_cur_vel = sum( cur_sel * vel  , axis=-1 )
+
+		# Convert each look direction from altitude-azimuth to a
+		# Cartesian unit vector.
+
+		dlk = rsp_dir_look( alt[newaxis,:,newaxis], azm )
+
+		# Calculate the estimator of the projected inflow speed along
+		# each look direction.
+
+		eta_v = where( sel_azm, - sum_cur / sum_cur_inv, 0. )
+
+		# Use singular value decomposition (in the form of the stacked
+		# pseudo-inverse of the matrices of the selected look
+		# directions) to calculate the best-fit bulk velocity of each
+		# spectrum.
+
+		# Note.  The rows of the unselected look directions are zeroed,
+		#        which leaves the least-squares solution unchanged.
+
+		n_spc = len( azm )
+
+		mat = where( sel_azm[...,newaxis], dlk, 0. ).reshape(
+		                                          ( n_spc, -1, 3 ) )
+
+		mom_v_vec = einsum( 'nij,nj->ni', pinv( mat ),
+		                    eta_v.reshape( ( n_spc, -1 ) ) )
+
+		mom_v = sqrt( sum( mom_v_vec**2, axis=-1 ) )
+
+		# Use the derived bulk velocity to estimate the effective
+		# collecting area of each look direction, and then estimate the
+		# number density and thermal speed along each.
+
+		eta_eca = rsp_eff_area( dlk, mom_v_vec[:,newaxis,newaxis,:] )
+
+		eta_n = 1e-6 * ( ( 1. / q_p ) / ( 1.e-4 * eta_eca )
+		                 * ( 1.e-12 / 1.e3 ) * sum_cur_inv )
+
+		# Note.  As in the original (per-direction) analysis, a
+		#        non-finite value (e.g., from a look direction with no
+		#        effective collecting area) is clamped to zero, so
+		#        "fmax" is used rather than "maximum" (which would
+		#        propagate "nan").
+
+		eta_w = 1e-3 * sqrt( fmax( 0.,
+		            ( ( 1. / q_p ) / ( 1.e-4 * eta_eca )
+		              / ( 1.e6 * eta_n )
+		              * ( 1.e-12 * 1.e3 ) * sum_cur_vel )
+		            - ( 1e3 * eta_v )**2                    ) )
+
+		eta_t = ( 1.E-3 / k_b ) * m_p * ( ( 1.E3 * eta_w )**2 )
+
+		# Calculate the net estimator of the number density of each
+		# spectrum (weighting each look direction by the square of its
+		# effective collecting area), and the number of selected look
+		# directions.
+
+		wgt = where( sel_azm, eta_eca**2, 0. )
+
+		mom_n = sum( wgt * where( sel_azm, eta_n, 0. ),
+		             axis=( 1, 2 )                      ) / \
+		        sum( wgt, axis=( 1, 2 ) )
+
+		n_eta = sum( sel_azm, axis=( 1, 2 ) )
+
+		# For each spectrum with magnetic field data, fit the square of
+		# the thermal speed as a linear function of the square of the
+		# dot product between each look direction and the direction of
+		# the magnetic field (see Equation 2.32 by Maruca, PhD thesis,
+		# 2012).
+
+		# Note.  The fits are computed at once from the (masked) sums of
+		#        the closed-form linear regression.
+
+		dat_x = sum( dlk * mfi_nrm[:,newaxis,newaxis,:], axis=-1 )**2
+		dat_y = eta_w**2
+
+		x = where( sel_azm, dat_x, 0. )
+		y = where( sel_azm, dat_y, 0. )
+
+		s_x  = sum( x    , axis=( 1, 2 ) )
+		s_y  = sum( y    , axis=( 1, 2 ) )
+		s_xx = sum( x * x, axis=( 1, 2 ) )
+		s_xy = sum( x * y, axis=( 1, 2 ) )
+
+		f_slope = ( n_eta * s_xy - s_x * s_y ) / \
+		          ( n_eta * s_xx - s_x**2    )
+		f_icept = ( s_y - f_slope * s_x ) / n_eta
+
+		# Attempt the anisotropy analysis only for those spectra with
+		# magnetic field data and sufficient coverage of "dat_x", and
+		# accept it only if the fit parameters are physical.
+
+		x_max = amax( where( sel_azm, dat_x, -inf ), axis=( 1, 2 ) )
+		x_min = amin( where( sel_azm, dat_x,  inf ), axis=( 1, 2 ) )
+
+		aniso = ( array( mfi_vld, dtype=bool ) & ( x_max != x_min ) &
+		          ( f_icept > 0 ) & ( ( f_icept + f_slope ) > 0 )     )
+
+		# Compute the components of the thermal speed and temperature
+		# for those spectra with an anisotropy analysis.
+
+		mom_w_per = where( aniso, sqrt( f_icept           ), nan )
+		mom_w_par = where( aniso, sqrt( f_icept + f_slope ), nan )
+
+		mom_t_per = ( 1.E-3 / k_b ) * m_p * ( 1.E6 * mom_w_per**2 )
+		mom_t_par = ( 1.E-3 / k_b ) * m_p * ( 1.E6 * mom_w_par**2 )
+
+		mom_r = mom_t_per / mom_t_par
+
+		# Compute the scalar thermal speed and temperature (from the
+		# components, if available, or else from the average of the
+		# estimators).
+
+		w_avg = sum( where( sel_azm, eta_w, 0. ),
+		             axis=( 1, 2 )               ) / n_eta
+
+		mom_w = where( aniso, sqrt( ( (2./3.) * mom_w_per**2 ) +
+		                            ( (1./3.) * mom_w_par**2 )   ),
+		                      w_avg                                )
+
+		mom_t = where( aniso,
+		               ( (2./3.) * mom_t_per ) +
+		               ( (1./3.) * mom_t_par ),
+		               ( 1.E-3 / k_b ) * m_p * ( 1.E3 * w_avg )**2 )
+
+		# Calculate the expected currents of each spectrum based on the
+		# results.
+
+		# Note.  For those spectra without an anisotropy analysis, the
+		#        Maxwellian currents are computed as the equivalent
+		#        bi-Maxwellian ones (see "janus_fc_rsp.rsp_cur_max").
+
+		w_per = where( aniso, mom_w_per, mom_w )
+		w_par = where( aniso, mom_w_par, mom_w )
+
+		mag = where( aniso[:,newaxis], mfi_nrm,
+		             array( [ 1., 0., 0. ] )    )
+
+		mom_cur = rsp_cur_bmx( vel_cen[:,newaxis,newaxis,:],
+		                       vel_wid[:,newaxis,newaxis,:],
+		                       alt[newaxis,:,newaxis,newaxis],
+		                       azm[...,newaxis],
+		                       mag[:,0,newaxis,newaxis,newaxis],
+		                       mag[:,1,newaxis,newaxis,newaxis],
+		                       mag[:,2,newaxis,newaxis,newaxis],
+		                       mom_n[:,newaxis,newaxis,newaxis],
+		                       mom_v_vec[:,0,newaxis,newaxis,newaxis],
+		                       mom_v_vec[:,1,newaxis,newaxis,newaxis],
+		                       mom_v_vec[:,2,newaxis,newaxis,newaxis],
+		                       w_per[:,newaxis,newaxis,newaxis],
+		                       w_par[:,newaxis,newaxis,newaxis]       )
+
+	# Return the results.
+
+	return { 'n'    :mom_n    , 'v'    :mom_v    , 'w'    :mom_w    ,
+	         't'    :mom_t    , 'r'    :mom_r    , 'v_vec':mom_v_vec,
+	         'w_per':mom_w_per, 'w_par':mom_w_par,
+	         't_per':mom_t_per, 't_par':mom_t_par,
+	         'aniso':aniso    , 'n_eta':n_eta    ,
+	         'eta_n':where( sel_azm, eta_n, nan ),
+	         'eta_v':where( sel_azm, eta_v, nan ),
+	         'eta_w':where( sel_azm, eta_w, nan ),
+	         'eta_t':where( sel_azm, eta_t, nan ),
+	         'cur'  :mom_cur                                              }
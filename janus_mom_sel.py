@@ -0,0 +1,214 @@
+################################################################################
+##
+## Janus -- GUI Software for Processing Thermal-Ion Measurements from the
+##          Wind Spacecraft's Faraday Cups
+##
+## Copyright (C) 2016 Bennett A. Maruca (bmaruca@udel.edu)
+##
+## This program is free software: you can redistribute it and/or modify it under
+## the terms of the GNU General Public License as published by the Free Software
+## Foundation, either version 3 of the License, or (at your option) any later
+## version.
+##
+## This program is distributed in the hope that it will be useful, but WITHOUT
+## ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+## FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+## details.
+##
+## You should have received a copy of the GNU General Public License along with
+## this program.  If not, see http://www.gnu.org/licenses/.
+##
+################################################################################
+
+
+
+################################################################################
+## LOAD THE NECESSARY MODULES.
+################################################################################
+
+# Load the necessary array modules and mathematical functions.
+
+from numpy import abs, amax, any, arange, argmax, errstate, finfo, inf, \
+                  isfinite, newaxis, roll, sum, where, zeros
+
+
+## +----------+----------------------------------------------------------------+
+## |          |                                                                |
+## | Argument | Comments                                                       |
+## |          |                                                                |
+## +----------+----------------------------------------------------------------+
+## |          |                                                                |
+## | cur      | Currents [pA] with the shape "( ..., 2, 20, V )"               |
+## |          |                                                                |
+## | cur_vld  | Validity of the currents with the same shape as "cur";         |
+## |          | padding (i.e., windows beyond those of a spectrum) must be     |
+## |          | invalid                                                        |
+## |          |                                                                |
+## | sel_azm  | Selection of the look directions with the shape               |
+## |          | "( ..., 2, 20 )"                                               |
+## |          |                                                                |
+## | n_vel    | Number of velocity windows of each spectrum (an integer or an  |
+## |          | array with the shape of the leading axes)                      |
+## |          |                                                                |
+## | win_azm  | Number of look directions to select from each cup              |
+## |          |                                                                |
+## | win_cur  | Number of velocity windows to select from each look direction  |
+## |          |                                                                |
+## +----------+----------------------------------------------------------------+
+
+# Note.  These functions carry out the automatic data selection of the
+#        moments analysis (see "core.auto_mom_sel") for a single spectrum or,
+#        through the leading axes of the arguments, for a stack of spectra.
+#        The selections are identical to those of the original (looped)
+#        algorithm.
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR AUTO-SELECTING LOOK DIRECTIONS FOR MOMENTS.
+################################################################################
+
+def calc_sel_azm( cur, cur_vld, win_azm ) :
+
+	# Compute the maximum valid current of each look direction (or zero
+	# for a look direction without valid currents).
+
+	max_cur = where( any( cur_vld, axis=-1 ),
+	                 amax( where( cur_vld, cur, -inf ), axis=-1 ), 0. )
+
+	# Compute the sum of "max_cur" over a running, circular window of
+	# "win_azm" look directions.
+
+	# Note.  The shifted arrays are added in the same order as the
+	#        elements were in the original loop so that the sums (and
+	#        thus the selection) are identical.
+
+	n_azm = max_cur.shape[-1]
+
+	mm_cur = zeros( max_cur.shape )
+
+	for w in range( win_azm ) :
+		mm_cur += roll( max_cur, -w, axis=-1 )
+
+	# Select, in each cup, the window with the largest sum (or, in case
+	# of a tie, the first such window).
+
+	p_0 = argmax( mm_cur, axis=-1 )
+
+	return ( ( arange( n_azm ) - p_0[...,newaxis] ) % n_azm ) < win_azm
+
+
+################################################################################
+## DEFINE THE FUNC. FOR AUTO-SELECTING THE DATA OF ONE LOOK DIRECTION.
+################################################################################
+
+def calc_sel_cur_dir( cur, cur_vld, n_vel, win_cur ) :
+
+	# Note.  This function is the original (looped) algorithm for a single
+	#        look direction.  It returns the first index of the span of
+	#        "win_cur" windows with the largest total valid current.  It
+	#        is used only where the sums of "calc_sel_cur" are too close to
+	#        guarantee an identical selection.
+
+	v_rng = arange( n_vel )
+
+	v_0   = 0
+	cur_0 = 0.
+
+	for v in range( n_vel - win_cur ) :
+
+		tk = where( ( v_rng >= v                 ) &
+		            ( v_rng < ( v + win_cur )    ) &
+		            ( cur_vld[0:n_vel]           )   )
+
+		cur_v = sum( cur[0:n_vel][tk] )
+
+		if ( cur_v > cur_0 ) :
+			v_0   = v
+			cur_0 = cur_v
+
+	return v_0
+
+
+################################################################################
+## DEFINE THE FUNC. FOR AUTO-SELECTING INDIVIDUAL DATA FOR MOMENTS ANAL.
+################################################################################
+
+def calc_sel_cur( cur, cur_vld, sel_azm, n_vel, win_cur ) :
+
+	# Note.  For each selected look direction, the span of "win_cur"
+	#        velocity windows with the largest total valid current is
+	#        selected.  As in the original algorithm, the spans start at
+	#        each of the first "n_vel - win_cur" windows, and the first
+	#        span is selected if none has a positive total.
+
+	n_vel = zeros( cur.shape[:-3], dtype=int ) + n_vel
+
+	n_vel = n_vel[...,newaxis,newaxis]
+
+	n_v  = cur.shape[-1]
+	n_st = max( n_v - win_cur, 0 )
+
+	# Compute the total valid current of every span (and the total of
+	# its absolute values, which bounds the rounding error of the
+	# former).
+
+	c = where( cur_vld, cur, 0. )
+
+	tot = zeros( cur.shape[:-1] + ( n_st, ) )
+	mag = zeros( cur.shape[:-1] + ( n_st, ) )
+
+	for w in range( win_cur ) :
+		tot += c[...,w:w+n_st]
+		mag += abs( c[...,w:w+n_st] )
+
+	# Identify the spans that may start each selection, and find the
+	# largest and second largest totals among them.
+
+	cnd = ( arange( n_st ) < ( n_vel - win_cur )[...,newaxis] )
+
+	tot = where( cnd, tot, -inf )
+
+	if ( n_st > 0 ) :
+		v_0     = argmax( tot, axis=-1 )
+		tot_max = amax( tot, axis=-1 )
+		tot_sec = amax( where( arange( n_st ) == v_0[...,newaxis],
+		                       -inf, tot                          ),
+		                axis=-1 )
+		mag_max = amax( where( cnd, mag, 0. ), axis=-1 )
+	else :
+		v_0     = zeros( cur.shape[:-1], dtype=int )
+		tot_max = zeros( cur.shape[:-1] ) - inf
+		tot_sec = zeros( cur.shape[:-1] ) - inf
+		mag_max = zeros( cur.shape[:-1] )
+
+	v_0 = where( tot_max > 0., v_0, 0 )
+
+	# Identify the selected look directions whose largest total is (to
+	# within the rounding error of the sums) tied with another total or
+	# with zero, or is not finite.  For each, repeat the selection with
+	# the original algorithm (so that the selection is identical).
+
+	with errstate( invalid='ignore' ) :
+
+		tol = 8. * win_cur * finfo( float ).eps * mag_max
+
+		has_cnd = ( n_vel - win_cur > 0 ) & sel_azm
+
+		chk = has_cnd & ( ( ~ isfinite( tot_max )        ) |
+		                  ( abs( tot_max ) <= tol        ) |
+		                  ( ( tot_max - tot_sec ) <= tol )   )
+
+	for ind in zip( *where( chk ) ) :
+		v_0[ind] = calc_sel_cur_dir( cur[ind], cur_vld[ind],
+		                             int( n_vel[ind[:-2]+(0,0)] ),
+		                             win_cur                        )
+
+	# Select the span starting at "v_0" in each selected look direction
+	# (truncating it at the last window of the spectrum).
+
+	v = arange( n_v )
+
+	return ( sel_azm[...,newaxis]                    &
+	         ( v >= v_0[...,newaxis]               ) &
+	         ( v <  ( v_0[...,newaxis] + win_cur ) ) &
+	         ( v <  n_vel[...,newaxis]             )   )
@@ -0,0 +1,221 @@
+################################################################################
+##
+## Janus -- GUI Software for Processing Thermal-Ion Measurements from the
+##          Wind Spacecraft's Faraday Cups
+##
+## Copyright (C) 2016 Bennett A. Maruca (bmaruca@udel.edu)
+##
+## This program is free software: you can redistribute it and/or modify it under
+## the terms of the GNU General Public License as published by the Free Software
+## Foundation, either version 3 of the License, or (at your option) any later
+## version.
+##
+## This program is distributed in the hope that it will be useful, but WITHOUT
+## ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+## FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+## details.
+##
+## You should have received a copy of the GNU General Public License along with
+## this program.  If not, see http://www.gnu.org/licenses/.
+##
+################################################################################
+
+
+
+################################################################################
+## LOAD THE NECESSARY MODULES.
+################################################################################
+
+# Load the necessary array modules and mathematical functions.
+
+from numpy import all, amax, array, diagonal, einsum, eye, inf, isfinite, \
+                  maximum, newaxis, sqrt, sum, tile, where, zeros
+
+from numpy.linalg import LinAlgError, pinv, solve
+
+
+## +----------+----------------------------------------------------------------+
+## |          |                                                                |
+## | Argument | Comments                                                       |
+## |          |                                                                |
+## +----------+----------------------------------------------------------------+
+## |          |                                                                |
+## | func     | Function called as "func( x, prm )" that returns the modeled   |
+## |          | values and their Jacobian for a stack of spectra, with the     |
+## |          | shapes "( N, M )" and "( N, M, P )", respectively              |
+## |          |                                                                |
+## | x        | Independent data variables; each element of "x" (i.e., the    |
+## |          | array "x[i]") has the shape "( N, M )"                         |
+## |          |                                                                |
+## | y        | Measured values with the shape "( N, M )"                      |
+## |          |                                                                |
+## | wgt      | Weight (i.e., "1/sigma") of each value with the shape          |
+## |          | "( N, M )"; padding (i.e., points beyond those of a spectrum)  |
+## |          | must be given zero weight                                      |
+## |          |                                                                |
+## | gss      | Initial guess with the shape "( N, P )"                        |
+## |          |                                                                |
+## +----------+----------------------------------------------------------------+
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR SOLVING A STACK OF DAMPED NORMAL EQUATIONS.
+################################################################################
+
+def calc_bat_stp( a, b ) :
+
+	# Attempt to solve all of the systems at once.  If any of them is
+	# singular, solve each individually, and give those that are singular
+	# a step of "nan" (so that the step is rejected).
+
+	try :
+
+		return solve( a, b[...,newaxis] )[...,0]
+
+	except LinAlgError :
+
+		stp = zeros( b.shape )
+
+		for i in range( len( b ) ) :
+
+			try :
+				stp[i] = solve( a[i], b[i] )
+			except LinAlgError :
+				stp[i] = float( 'nan' )
+
+		return stp
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR THE STACKED LEVENBERG-MARQUARDT FIT.
+################################################################################
+
+def calc_bat_lm( func, x, y, wgt, gss,
+                 n_itr=200, tol_chi=1.49012e-8, tol_prm=1.49012e-8,
+                 lam=1.e-3                                           ) :
+
+	# Note.  This function fits each of "N" spectra independently but
+	#        advances all of them together: the residuals, Jacobians, and
+	#        damped normal equations of the spectra still being fit are
+	#        stacked, and each spectrum is masked out once it converges
+	#        (by the same criteria as "leastsq": a relative change in
+	#        chi-squared or in the parameters below "tol_chi" or
+	#        "tol_prm", respectively).  It returns the fit parameters,
+	#        their covariance matrices (scaled by the reduced
+	#        chi-squared, as by "curve_fit"), an array that indicates
+	#        which fits converged, and the numbers of evaluations of
+	#        the model and of iterations of each fit.  As with
+	#        "janus_nln_slvr.calc_slvr_covar", the covariance matrix of
+	#        a fit with no degrees of freedom is a matrix of "inf".
+
+	# Initialize the parameters, damping factors, and indicators.
+
+	prm = array( gss, dtype=float )
+
+	( n_spc, n_prm ) = prm.shape
+
+	lam = tile( float( lam ), n_spc )
+	act = tile( True, n_spc )
+	cnv = tile( False, n_spc )
+
+	cnt_evl = tile( 1, n_spc )
+	cnt_itr = tile( 0, n_spc )
+
+	# Evaluate the model at the initial guess.
+
+	( mod, jac ) = func( x, prm )
+
+	res = wgt * ( y - mod )
+	chi = sum( res**2, axis=1 )
+
+	# Iterate until all fits converge (or fail) or the maximum number of
+	# iterations is reached.
+
+	for i in range( n_itr ) :
+
+		tk = where( act )[0]
+
+		if ( len( tk ) == 0 ) :
+			break
+
+		# Compute the (weighted) normal equations of each active fit and
+		# damp them (with Marquardt's scaling by the diagonal).
+
+		jac_w = wgt[tk,:,newaxis] * jac[tk]
+
+		jtj = einsum( 'nmi,nmj->nij', jac_w, jac_w )
+		jtr = einsum( 'nmi,nm->ni'  , jac_w, res[tk] )
+
+		dgn = diagonal( jtj, axis1=1, axis2=2 )
+		dgn = maximum( dgn, 1.e-12 * amax( dgn, axis=1 )[:,newaxis] )
+
+		stp = calc_bat_stp( jtj + ( lam[tk,newaxis,newaxis] *
+		                            dgn[:,:,newaxis] * eye( n_prm ) ),
+		                    jtr                                        )
+
+		# Evaluate the model at the trial parameters.
+
+		prm_try = prm[tk] + stp
+
+		( mod_try, jac_try ) = func( x[:,tk], prm_try )
+
+		res_try = wgt[tk] * ( y[tk] - mod_try )
+		chi_try = sum( res_try**2, axis=1 )
+
+		cnt_evl[tk] += 1
+		cnt_itr[tk] += 1
+
+		# Accept each step that reduces chi-squared, and adjust the
+		# damping accordingly.
+
+		acc = ( isfinite( chi_try ) & ( chi_try <= chi[tk] ) &
+		        all( isfinite( stp ), axis=1 )                 )
+
+		tk_a = tk[acc]
+		tk_r = tk[~acc]
+
+		dlt_chi = ( chi[tk_a] - chi_try[acc] ) / \
+		          maximum( chi[tk_a], 1.e-300 )
+		dlt_prm = sqrt( sum( stp[acc]**2, axis=1 ) ) / \
+		          ( sqrt( sum( prm[tk_a]**2, axis=1 ) ) + tol_prm )
+
+		prm[tk_a] = prm_try[acc]
+		mod[tk_a] = mod_try[acc]
+		jac[tk_a] = jac_try[acc]
+		res[tk_a] = res_try[acc]
+		chi[tk_a] = chi_try[acc]
+
+		lam[tk_a] /= 10.
+		lam[tk_r] *= 10.
+
+		# Flag as converged each fit whose step no longer changes its
+		# chi-squared or parameters appreciably, and flag as failed each
+		# whose damping has grown without bound.
+
+		done = ( dlt_chi <= tol_chi ) | ( dlt_prm <= tol_prm )
+
+		cnv[tk_a[done]] = True
+		act[tk_a[done]] = False
+
+		act[tk_r[lam[tk_r] > 1.e16]] = False
+
+	# Calculate the covariance matrix of each fit.
+
+	jac_w = wgt[:,:,newaxis] * jac
+
+	n_dof = sum( wgt > 0., axis=1 ) - n_prm
+
+	covar = pinv( einsum( 'nmi,nmj->nij', jac_w, jac_w ) )
+
+	covar = covar * ( chi / maximum( n_dof, 1 ) )[:,newaxis,newaxis]
+
+	# Note.  The floor on "n_dof" above only avoids a division by zero;
+	#        the covariance of each fit without any degrees of freedom
+	#        is then set to "inf" (as by "calc_slvr_covar").
+
+	covar[n_dof <= 0] = inf
+
+	# Return the fit parameters, covariances, convergence indicators, and
+	# the numbers of evaluations and iterations.
+
+	return ( prm, covar, cnv, cnt_evl, cnt_itr )
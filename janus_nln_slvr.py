@@ -0,0 +1,255 @@
+################################################################################
+##
+## Janus -- GUI Software for Processing Thermal-Ion Measurements from the
+##          Wind Spacecraft's Faraday Cups
+##
+## Copyright (C) 2016 Bennett A. Maruca (bmaruca@udel.edu)
+##
+## This program is free software: you can redistribute it and/or modify it under
+## the terms of the GNU General Public License as published by the Free Software
+## Foundation, either version 3 of the License, or (at your option) any later
+## version.
+##
+## This program is distributed in the hope that it will be useful, but WITHOUT
+## ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+## FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+## details.
+##
+## You should have received a copy of the GNU General Public License along with
+## this program.  If not, see http://www.gnu.org/licenses/.
+##
+################################################################################
+
+
+
+################################################################################
+## LOAD THE NECESSARY MODULES.
+################################################################################
+
+# Load the necessary array modules and mathematical functions.
+
+from numpy import array, dot, inf, newaxis, sqrt, tile, transpose, sum
+
+from numpy.linalg import pinv
+
+# Load the module necessary for timing the solvers.
+
+from time import time
+
+# Load the necessary fitting routines.
+
+from scipy.optimize import leastsq, least_squares
+
+
+## +----------+----------------------------------------------------------------+
+## |          |                                                                |
+## | Argument | Comments                                                       |
+## |          |                                                                |
+## +----------+----------------------------------------------------------------+
+## |          |                                                                |
+## | resid    | Function called as "resid( prm )" that returns the (weighted)  |
+## |          | residuals (i.e., "( model - y ) / sigma") with the shape       |
+## |          | "( M, )"                                                       |
+## |          |                                                                |
+## | jac      | Function called as "jac( prm )" that returns the Jacobian of   |
+## |          | the (weighted) residuals with the shape "( M, P )"             |
+## |          |                                                                |
+## | gss      | Initial guess with the shape "( P, )"                          |
+## |          |                                                                |
+## | bnd      | Tuple "( lb, ub )" of the lower and upper bounds of the        |
+## |          | parameters, each with the shape "( P, )"                       |
+## |          |                                                                |
+## | tol      | Relative tolerance (in the sum of squares and in the           |
+## |          | parameters) for convergence, or "None" for the solver's        |
+## |          | default                                                        |
+## |          |                                                                |
+## +----------+----------------------------------------------------------------+
+
+# Note.  Each solver returns the tuple "( fit, covar, n_evl, n_itr )": the
+#        fit parameters, their covariance matrix (scaled by the reduced
+#        chi-squared, as by "curve_fit"), the number of evaluations of the
+#        residuals, and the number of iterations (i.e., of evaluations of
+#        the Jacobian).  If the fit fails, an exception is raised.  A
+#        custom solver can be made available to "core.anls_nln" by adding
+#        it (with the same arguments and return values) to the dictionary
+#        "nln_slvr" below; it is then selected by its key (see
+#        "calc_nln_slvr").  If it keeps the parameters within "bnd", its
+#        key should also be added to the list "nln_slvr_bnd".
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR COMPUTING THE COVARIANCE OF A FIT.
+################################################################################
+
+def calc_slvr_covar( res, jac ) :
+
+	# Compute the covariance matrix of the fit parameters from the
+	# Jacobian at the solution, and scale it by the reduced chi-squared.
+	# If there are no degrees of freedom, return a matrix of "inf" (as
+	# "curve_fit" would).
+
+	n_res = len( res )
+	n_prm = jac.shape[1]
+
+	if ( n_res <= n_prm ) :
+		return tile( inf, ( n_prm, n_prm ) )
+
+	return pinv( dot( transpose( jac ), jac ) ) * \
+	       ( sum( res**2 ) / ( n_res - n_prm ) )
+
+
+################################################################################
+## DEFINE THE LEVENBERG-MARQUARDT SOLVER.
+################################################################################
+
+def slvr_lm( resid, jac, gss, bnd, tol=None ) :
+
+	# Note.  This is the (unbounded) Levenberg-Marquardt algorithm of
+	#        MINPACK, as used by "curve_fit", so "bnd" is ignored.
+
+	arg = { } if ( tol is None ) else { 'ftol':tol, 'xtol':tol }
+
+	( fit, cov_x, info, mesg, ier ) = leastsq( resid, gss, Dfun=jac,
+	                                           full_output=True, **arg )
+
+	if ( ier not in [ 1, 2, 3, 4 ] ) :
+		raise RuntimeError( mesg )
+
+	# Scale the covariance matrix as "curve_fit" does (returning a
+	# matrix of "inf" if it could not be estimated).
+
+	res = info['fvec']
+
+	if ( ( cov_x is None ) or ( len( res ) <= len( fit ) ) ) :
+		covar = tile( inf, ( len( fit ), len( fit ) ) )
+	else :
+		covar = cov_x * ( sum( res**2 ) / ( len( res ) - len( fit ) ) )
+
+	return ( fit, covar, info['nfev'], info['njev'] )
+
+
+################################################################################
+## DEFINE THE TRUST-REGION-REFLECTIVE SOLVER.
+################################################################################
+
+def slvr_trf( resid, jac, gss, bnd, tol=None, loss='linear', f_scale=3. ) :
+
+	# Note.  This is the trust-region-reflective algorithm of
+	#        "least_squares", which keeps the parameters within "bnd".
+	#        The parameters are scaled by the norms of the columns of
+	#        the Jacobian.
+
+	# Note.  By default, the loss is the ordinary sum of squares (as for
+	#        "slvr_lm").  The robust "soft_l1" loss may instead be
+	#        requested (see "slvr_trf_l1"), in which case the influence
+	#        of each (weighted) residual beyond "f_scale" grows only
+	#        linearly.  As the residuals are weighted by the
+	#        uncertainties of the currents, the default of "3."
+	#        leaves those within three standard deviations essentially
+	#        unaffected.
+
+	# Note.  With the variable projection (see "core.calc_nln_vpro"),
+	#        this solver fits only the non-linear parameters.  The
+	#        densities are then solved for by non-negative (ordinary)
+	#        least squares, so a robust loss does not reduce the
+	#        influence of outlying currents on them.
+
+	if ( loss not in [ 'linear', 'soft_l1' ] ) :
+		raise ValueError( 'Unsupported loss: ' + str( loss ) )
+
+	# If the initial guess lies outside of the bounds, move it onto
+	# them.
+
+	( lb, ub ) = bnd
+
+	gss = array( gss, dtype=float )
+
+	gss[gss < lb] = lb[gss < lb]
+	gss[gss > ub] = ub[gss > ub]
+
+	# Perform the fit.  If it fails (e.g., because the maximum number of
+	# evaluations was reached), raise an exception.
+
+	arg = { } if ( tol is None ) else { 'ftol':tol, 'xtol':tol }
+
+	ret = least_squares( resid, gss, jac=jac, bounds=( lb, ub ),
+	                     method='trf', x_scale='jac', loss=loss,
+	                     f_scale=f_scale, **arg                   )
+
+	if ( ret.status <= 0 ) :
+		raise RuntimeError( ret.message )
+
+	# Compute the covariance matrix from the residuals and Jacobian at
+	# the solution.  For the "soft_l1" loss, each residual is replaced by
+	# its (square-rooted) contribution to the loss, and each row of the
+	# Jacobian is weighted by the square root of the derivative of the
+	# loss (i.e., that of the estimator actually used).
+
+	# Note.  The Jacobian returned by "least_squares" has been modified
+	#        by the loss function (through its second derivative as
+	#        well), so it is instead re-evaluated.
+
+	res   = ret.fun
+	jac_x = jac( ret.x )
+
+	if ( loss == 'soft_l1' ) :
+
+		# Note.  The loss of each residual, "2 f^2 ( z - 1 )" (where
+		#        "z = sqrt( 1 + ( res / f )**2 )"), is computed as
+		#        "2 res^2 / ( z + 1 )" to avoid cancellation.
+
+		z = sqrt( 1. + ( res / f_scale )**2 )
+
+		res   = res * sqrt( 2. / ( z + 1. ) )
+		jac_x = jac_x / sqrt( z )[:,newaxis]
+
+	covar = calc_slvr_covar( res, jac_x )
+
+	return ( ret.x, covar, ret.nfev, ret.njev )
+
+
+################################################################################
+## DEFINE THE ROBUST TRUST-REGION-REFLECTIVE SOLVER.
+################################################################################
+
+def slvr_trf_l1( resid, jac, gss, bnd, tol=None ) :
+
+	# Run the trust-region-reflective solver with the robust "soft_l1"
+	# loss (see "slvr_trf").
+
+	return slvr_trf( resid, jac, gss, bnd, tol=tol, loss='soft_l1' )
+
+
+################################################################################
+## DEFINE THE DICTIONARY OF AVAILABLE SOLVERS.
+################################################################################
+
+nln_slvr = { 'lm'     : slvr_lm,
+             'trf'    : slvr_trf,
+             'trf_l1' : slvr_trf_l1 }
+
+# Note.  This list gives the keys of the solvers that keep the parameters
+#        within the bounds.
+
+nln_slvr_bnd = [ 'trf', 'trf_l1' ]
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR RUNNING A SOLVER.
+################################################################################
+
+def calc_nln_slvr( slvr, resid, jac, gss, bnd, tol=None ) :
+
+	# Run the solver whose key in "nln_slvr" is "slvr", and return its
+	# results and its wall-clock run time [s].  If no such solver exists,
+	# raise an exception.
+
+	if ( slvr not in nln_slvr ) :
+		raise KeyError( 'Unknown solver: ' + str( slvr ) )
+
+	t_0 = time( )
+
+	( fit, covar, n_evl, n_itr ) = nln_slvr[slvr]( resid, jac, gss, bnd,
+	                                               tol=tol               )
+
+	return ( fit, covar, n_evl, n_itr, time( ) - t_0 )
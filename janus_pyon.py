@@ -121,6 +121,39 @@ class series( object ) :
 		if ( self.sort ) :
 			self.arr.sort( )
 
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR ADDING AN ARRAY OF SPECTRA TO THE SERIES.
+	#-----------------------------------------------------------------------
+
+	def add_arr( self, arr ) :
+
+		# Note.  This function is equivalent to calling "self.add_spec"
+		#        for each spectrum in "arr", but the array is searched
+		#        and sorted only once.
+
+		# Index the timestamps of the spectra already in the array.
+
+		ind = dict( [ ( s.time, i ) for ( i, s ) in
+		                                    enumerate( self.arr ) ] )
+
+		# Insert each new spectrum into the array (replacing an old
+		# spectrum, if that behavior has been requested and one is
+		# found).
+
+		for spec in arr :
+
+			if ( ( self.replace ) and ( spec.time in ind ) ) :
+				self.arr[ind[spec.time]] = spec
+			else :
+				ind[spec.time] = len( self.arr )
+				self.arr.append( spec )
+				self.n += 1
+
+		# If requested, sort the array.
+
+		if ( self.sort ) :
+			self.arr.sort( )
+
 	#-----------------------------------------------------------------------
 	# DEFINE THE FUNCTION FOR RETURNING A KEY.
 	#-----------------------------------------------------------------------
@@ -149,6 +182,16 @@ class plas( object ) :
 
 		self.covar = None
 
+		# Note.  The following record the solver of the non-linear fit
+		#        that produced these results (see "janus_nln_slvr"), its
+		#        numbers of iterations and of evaluations, and its run
+		#        time [s].
+
+		self.slvr   = None
+		self.n_itr  = None
+		self.n_evl  = None
+		self.t_slvr = None
+
 		self.v0_x = None
 		self.v0_y = None
 		self.v0_z = None
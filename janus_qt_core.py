@@ -0,0 +1,79 @@
+################################################################################
+##
+## Janus -- GUI Software for Processing Thermal-Ion Measurements from the
+##          Wind Spacecraft's Faraday Cups
+##
+## Copyright (C) 2016 Bennett A. Maruca (bmaruca@udel.edu)
+##
+## This program is free software: you can redistribute it and/or modify it under
+## the terms of the GNU General Public License as published by the Free Software
+## Foundation, either version 3 of the License, or (at your option) any later
+## version.
+##
+## This program is distributed in the hope that it will be useful, but WITHOUT
+## ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+## FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+## details.
+##
+## You should have received a copy of the GNU General Public License along with
+## this program.  If not, see http://www.gnu.org/licenses/.
+##
+################################################################################
+
+
+
+################################################################################
+## LOAD THE NECESSARY MODULES.
+################################################################################
+
+# Load the modules necessary for signaling the graphical interface.
+
+from PyQt4.QtCore import QObject, SIGNAL
+
+# Load the (graphical-interface independent) analysis core of Janus.
+
+from janus_core import core
+
+
+################################################################################
+## DEFINE THE "qt_core" CLASS TO ADAPT THE JANUS "core" TO "Qt" SIGNALING.
+################################################################################
+
+class qt_core( QObject, core ) :
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE INITIALIZATION FUNCTION.
+	#-----------------------------------------------------------------------
+
+	def __init__( self, app=None, time=None, sink=None ) :
+
+		# Inheret all attributes of the "QObject" class.
+
+		# Note.  This class does not directly provide any graphical
+		#        interface.  Rather, the functions of the "QObject"
+		#        class are used principally for signal the classes that
+		#        do.
+
+		# Note.  The "QObject" class must be initialized first since
+		#        the initialization of the "core" class may emit events
+		#        (i.e., if a spectrum has been requested).
+
+		QObject.__init__( self )
+
+		# Inheret all attributes of the "core" class.
+
+		core.__init__( self, app=app, time=time, sink=sink )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR EMITTING AN EVENT AS A "Qt" SIGNAL.
+	#-----------------------------------------------------------------------
+
+	def emit( self, sig, *args ) :
+
+		# Pass the event to the event sink (if any).
+
+		core.emit( self, sig, *args )
+
+		# Emit the event as a signal to the registered widgets.
+
+		QObject.emit( self, SIGNAL( sig ), *args )
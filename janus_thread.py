@@ -25,10 +25,6 @@
 ## LOAD THE NECESSARY MODULES.
 ################################################################################
 
-# Import the modules need for signaling.
-
-from PyQt4.QtCore import SIGNAL
-
 # Import the modules needed for multithreading.
 
 from threading import enumerate as ThreadList
@@ -69,12 +65,12 @@ def n_thread( ) :
 
 def thread_load_spec( core, time_req, get_prev=False, get_next=False ) :
 
-	core.emit( SIGNAL('janus_busy_end') )
-	core.emit( SIGNAL('janus_busy_beg') )
+	core.emit( 'janus_busy_end' )
+	core.emit( 'janus_busy_beg' )
 
 	core.load_spec( time_req, get_prev, get_next )
 
-	core.emit( SIGNAL('janus_busy_end') )
+	core.emit( 'janus_busy_end' )
 
 
 ################################################################################
@@ -83,12 +79,12 @@ def thread_load_spec( core, time_req, get_prev=False, get_next=False ) :
 
 def thread_auto_mom_sel( core, win_azm, win_cur ) :
 
-	core.emit( SIGNAL('janus_busy_end') )
-	core.emit( SIGNAL('janus_busy_beg') )
+	core.emit( 'janus_busy_end' )
+	core.emit( 'janus_busy_beg' )
 
 	core.auto_mom_sel( win_azm=win_azm, win_cur=win_cur )
 
-	core.emit( SIGNAL('janus_busy_end') )
+	core.emit( 'janus_busy_end' )
 
 
 ################################################################################
@@ -97,12 +93,12 @@ def thread_auto_mom_sel( core, win_azm, win_cur ) :
 
 def thread_chng_mom_sel( core, t, p, v ) :
 
-	core.emit( SIGNAL('janus_busy_end') )
-	core.emit( SIGNAL('janus_busy_beg') )
+	core.emit( 'janus_busy_end' )
+	core.emit( 'janus_busy_beg' )
 
 	core.chng_mom_sel( t, p, v )
 
-	core.emit( SIGNAL('janus_busy_end') )
+	core.emit( 'janus_busy_end' )
 
 
 ################################################################################
@@ -111,13 +107,13 @@ def thread_chng_mom_sel( core, t, p, v ) :
 
 def thread_anls_mom( core ) :
 
-	core.emit( SIGNAL('janus_busy_end') )
-	core.emit( SIGNAL('janus_busy_beg') )
+	core.emit( 'janus_busy_end' )
+	core.emit( 'janus_busy_beg' )
 
 	core.anls_mom( )
 	core.chng_dsp( 'mom' )
 
-	core.emit( SIGNAL('janus_busy_end') )
+	core.emit( 'janus_busy_end' )
 
 
 ################################################################################
@@ -126,12 +122,12 @@ def thread_anls_mom( core ) :
 
 def thread_chng_nln_spc( core, s, param, val ) :
 
-	core.emit( SIGNAL('janus_busy_end') )
-	core.emit( SIGNAL('janus_busy_beg') )
+	core.emit( 'janus_busy_end' )
+	core.emit( 'janus_busy_beg' )
 
 	core.chng_nln_spc( s, param, val )
 
-	core.emit( SIGNAL('janus_busy_end') )
+	core.emit( 'janus_busy_end' )
 
 
 ################################################################################
@@ -140,12 +136,12 @@ def thread_chng_nln_spc( core, s, param, val ) :
 
 def thread_chng_nln_pop( core, i, param, val ) :
 
-	core.emit( SIGNAL('janus_busy_end') )
-	core.emit( SIGNAL('janus_busy_beg') )
+	core.emit( 'janus_busy_end' )
+	core.emit( 'janus_busy_beg' )
 
 	core.chng_nln_pop( i, param, val )
 
-	core.emit( SIGNAL('janus_busy_end') )
+	core.emit( 'janus_busy_end' )
 
 
 ################################################################################
@@ -154,12 +150,12 @@ def thread_chng_nln_pop( core, i, param, val ) :
 
 def thread_chng_nln_set( core, i, param, val ) :
 
-	core.emit( SIGNAL('janus_busy_end') )
-	core.emit( SIGNAL('janus_busy_beg') )
+	core.emit( 'janus_busy_end' )
+	core.emit( 'janus_busy_beg' )
 
 	core.chng_nln_set( i, param, val )
 
-	core.emit( SIGNAL('janus_busy_end') )
+	core.emit( 'janus_busy_end' )
 
 
 ################################################################################
@@ -168,12 +164,12 @@ def thread_chng_nln_set( core, i, param, val ) :
 
 def thread_chng_nln_gss( core, i, param, val ) :
 
-	core.emit( SIGNAL('janus_busy_end') )
-	core.emit( SIGNAL('janus_busy_beg') )
+	core.emit( 'janus_busy_end' )
+	core.emit( 'janus_busy_beg' )
 
 	core.chng_nln_gss( i, param, val )
 
-	core.emit( SIGNAL('janus_busy_end') )
+	core.emit( 'janus_busy_end' )
 
 
 ################################################################################
@@ -182,12 +178,12 @@ def thread_chng_nln_gss( core, i, param, val ) :
 
 def thread_chng_nln_sel( core, t, p, v ) :
 
-	core.emit( SIGNAL('janus_busy_end') )
-	core.emit( SIGNAL('janus_busy_beg') )
+	core.emit( 'janus_busy_end' )
+	core.emit( 'janus_busy_beg' )
 
 	core.chng_nln_sel( t, p, v )
 
-	core.emit( SIGNAL('janus_busy_end') )
+	core.emit( 'janus_busy_end' )
 
 
 ################################################################################
@@ -196,13 +192,13 @@ def thread_chng_nln_sel( core, t, p, v ) :
 
 def thread_anls_nln( core ) :
 
-	core.emit( SIGNAL('janus_busy_end') )
-	core.emit( SIGNAL('janus_busy_beg') )
+	core.emit( 'janus_busy_end' )
+	core.emit( 'janus_busy_beg' )
 
 	core.anls_nln( )
 	core.chng_dsp( 'nln' )
 
-	core.emit( SIGNAL('janus_busy_end') )
+	core.emit( 'janus_busy_end' )
 
 
 ################################################################################
@@ -211,12 +207,12 @@ def thread_anls_nln( core ) :
 
 def thread_chng_dsp( core, value ) :
 
-	core.emit( SIGNAL('janus_busy_end') )
-	core.emit( SIGNAL('janus_busy_beg') )
+	core.emit( 'janus_busy_end' )
+	core.emit( 'janus_busy_beg' )
 
 	core.chng_dsp( value )
 
-	core.emit( SIGNAL('janus_busy_end') )
+	core.emit( 'janus_busy_end' )
 
 
 ################################################################################
@@ -225,12 +221,12 @@ def thread_chng_dsp( core, value ) :
 
 def thread_chng_dyn( core, anal, value ) :
 
-	core.emit( SIGNAL('janus_busy_end') )
-	core.emit( SIGNAL('janus_busy_beg') )
+	core.emit( 'janus_busy_end' )
+	core.emit( 'janus_busy_beg' )
 
 	core.chng_dyn( anal, value )
 
-	core.emit( SIGNAL('janus_busy_end') )
+	core.emit( 'janus_busy_end' )
 
 
 ################################################################################
@@ -240,12 +236,12 @@ def thread_chng_dyn( core, anal, value ) :
 def thread_auto_run( core, t_strt, t_stop,
                      get_next=None, err_halt=None, pause=None ) :
 
-	core.emit( SIGNAL('janus_busy_end') )
-	core.emit( SIGNAL('janus_busy_beg') )
+	core.emit( 'janus_busy_end' )
+	core.emit( 'janus_busy_beg' )
 
 	core.auto_run( t_strt, t_stop, get_next, err_halt, pause )
 
-	core.emit( SIGNAL('janus_busy_end') )
+	core.emit( 'janus_busy_end' )
 
 
 ################################################################################
@@ -254,12 +250,12 @@ def thread_auto_run( core, t_strt, t_stop,
 
 def thread_save_res( core, nm_fl, exit=False ) :
 
-	core.emit( SIGNAL('janus_busy_end') )
-	core.emit( SIGNAL('janus_busy_beg') )
+	core.emit( 'janus_busy_end' )
+	core.emit( 'janus_busy_beg' )
 
 	core.save_res( nm_fl, exit )
 
-	core.emit( SIGNAL('janus_busy_end') )
+	core.emit( 'janus_busy_end' )
 
 
 ################################################################################
@@ -268,9 +264,9 @@ def thread_save_res( core, nm_fl, exit=False ) :
 
 def thread_xprt_res( core, nm_fl, exit=False ) :
 
-	core.emit( SIGNAL('janus_busy_end') )
-	core.emit( SIGNAL('janus_busy_beg') )
+	core.emit( 'janus_busy_end' )
+	core.emit( 'janus_busy_beg' )
 
 	core.xprt_res( nm_fl, exit )
 
-	core.emit( SIGNAL('janus_busy_end') )
+	core.emit( 'janus_busy_end' )
@@ -27,7 +27,7 @@
 
 # Load the modules necessary for mathematical and array operations.
 
-from numpy import array, floor, where
+from numpy import around, array, floor, where
 
 # Load the Python modules necessary handling dates and times.
 
@@ -57,6 +57,9 @@ from datetime import datetime, timedelta
 ## |          |          |                                                     |
 ## | time_epc | datetime |                                                     |
 ## |          |          |                                                     |
+## | time_arr |   array  | Array of "time_val" values (see                     |
+## |          |          | "calc_time_val_arr")                                |
+## |          |          |                                                     |
 ## +----------+----------+-----------------------------------------------------+
 
 
@@ -110,6 +113,26 @@ def calc_time_val( time ) :
 			return None
 
 
+################################################################################
+## DEFINE THE FUNCTION FOR COMPUTING AN ARRAY OF TIMES AS VALUES.
+################################################################################
+
+def calc_time_val_arr( time ) :
+
+	# Note.  This function is the (vectorized) equivalent of applying
+	#        "calc_time_val" to each element of an array of "datetime"
+	#        epochs (e.g., as read from a CDF file) without creating any
+	#        intermediate "timedelta" objects.
+
+	# Convert the epochs to a count of microseconds since
+	# "1970-01-01/00:00:00.000", and return that as a number of seconds
+	# rounded to the third decimal place.
+
+	usec = array( time, dtype='datetime64[us]' ).astype( 'int64' )
+
+	return around( usec / 1.E6, 3 )
+
+
 ################################################################################
 ## DEFINE THE FUNCTION FOR COMPUTING TIME AS A STRING.
 ################################################################################
@@ -235,6 +235,10 @@ class widget_ctrl_info( format_TextEdit ) :
 					               'failed.' , speak=True)
 					self.clear_for_next_mesg = True
 
+			if ( mesg_typ == 'cont' ) :
+				self.prnt_brk( )
+				self.prnt_htm( mesg_obj )
+
 			if ( mesg_typ == 'abort' ) :
 
 				if ( mesg_obj == 'auto' ) :
@@ -288,6 +292,11 @@ class widget_ctrl_info( format_TextEdit ) :
 				self.prnt_htm( mesg_obj )
 				self.prnt_htm( ': FAILED!' )
 
+			if ( mesg_typ == 'mem' ) :
+				self.prnt_tab( 1 )
+				self.prnt_htm( 'Memory in use: ' )
+				self.prnt_htm( mesg_obj )
+
 			if ( mesg_typ == 'none' ) :
 				self.prnt_tab( 1 )
 				self.prnt_htm( 'ERROR!  No data found.' , speak=True)
@@ -149,7 +149,7 @@ class widget_ctrl_time( QWidget ) :
 
 		if ( fnc == 'goto' ) :
 			if ( n_thread( ) == 0 ) :
-				self.core.emit( SIGNAL('janus_rset') )
+				self.core.emit( 'janus_rset' )
 				time_req = str( self.txt_timestp.text( ) )
 				Thread( target=thread_load_spec,
 				        args=( self.core, time_req ) ).start()
@@ -166,7 +166,7 @@ class widget_ctrl_time( QWidget ) :
 
 		if ( fnc == '-1hr' ) :
 			if ( n_thread( ) == 0 ) :
-				self.core.emit( SIGNAL('janus_rset') )
+				self.core.emit( 'janus_rset' )
 				Thread( target=thread_load_spec,
 				        args=( self.core,
 				          self.core.time_val - 3600. ) ).start()
@@ -174,7 +174,7 @@ class widget_ctrl_time( QWidget ) :
 
 		if ( fnc == '-1sp' ) :
 			if ( n_thread( ) == 0 ) :
-				self.core.emit( SIGNAL('janus_rset') )
+				self.core.emit( 'janus_rset' )
 				Thread( target=thread_load_spec,
 				        args=( self.core,
 				               self.core.time_val,
@@ -183,7 +183,7 @@ class widget_ctrl_time( QWidget ) :
 
 		if ( fnc == '+1sp' ) :
 			if ( n_thread( ) == 0 ) :
-				self.core.emit( SIGNAL('janus_rset') )
+				self.core.emit( 'janus_rset' )
 				Thread( target=thread_load_spec,
 				        args=( self.core,
 				               self.core.time_val,
@@ -192,7 +192,7 @@ class widget_ctrl_time( QWidget ) :
 
 		if ( fnc == '+1hr' ) :
 			if ( n_thread( ) == 0 ) :
-				self.core.emit( SIGNAL('janus_rset') )
+				self.core.emit( 'janus_rset' )
 				Thread( target=thread_load_spec,
 				        args=( self.core,
 				          self.core.time_val + 3600. ) ).start()
@@ -0,0 +1,329 @@
+################################################################################
+##
+## Janus -- GUI Software for Processing Thermal-Ion Measurements from the
+##          Wind Spacecraft's Faraday Cups
+##
+## Copyright (C) 2016 Bennett A. Maruca (bmaruca@udel.edu)
+##
+## This program is free software: you can redistribute it and/or modify it under
+## the terms of the GNU General Public License as published by the Free Software
+## Foundation, either version 3 of the License, or (at your option) any later
+## version.
+##
+## This program is distributed in the hope that it will be useful, but WITHOUT
+## ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+## FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more
+## details.
+##
+## You should have received a copy of the GNU General Public License along with
+## this program.  If not, see http://www.gnu.org/licenses/.
+##
+################################################################################
+
+
+
+################################################################################
+## LOAD THE NECESSARY MODULES.
+################################################################################
+
+# Load the module for unit testing.
+
+import unittest
+
+# Load the necessary array modules and mathematical functions.
+
+from numpy import abs, amax, arange, array, eye, newaxis, rollaxis, tile, \
+                  zeros
+
+from numpy.random import RandomState
+
+# Load the (vectorized) model of the Wind/FC instrumental response and the
+# reference (per-point) implementation of it.
+
+from janus_fc_rsp import rsp_cur_bmx, rsp_cur_bmx_jac, rsp_cur_max, \
+                         rsp_cur_max_jac
+
+from janus_bench_rsp import bench_arg, ref_cur_bmx
+
+# Load the (graphical-interface independent) analysis core of Janus.
+
+from janus_core import core
+
+
+################################################################################
+## DEFINE THE TOLERANCES OF THE TESTS.
+################################################################################
+
+# Note.  Each difference is taken relative to the largest (absolute) value
+#        of the compared quantity (e.g., of that column of the Jacobian).
+#        The central differences are computed with a step of one part in
+#        a million of each parameter, so their truncation and round-off
+#        errors are each far below "tol_jac".
+
+tol_rsp = 1.e-10
+tol_jac = 1.e-6
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR THE CENTRAL-DIFFERENCE JACOBIAN.
+################################################################################
+
+def calc_jac_fd( func, prm ) :
+
+	# Estimate each column of the Jacobian of "func" (a function of the
+	# array of parameters "prm") through central differences.
+
+	prm = array( prm, dtype=float )
+
+	jac = [ ]
+
+	for k in range( len( prm ) ) :
+
+		h = 1.e-6 * max( [ 1., abs( prm[k] ) ] )
+
+		dp = h * eye( len( prm ) )[k]
+
+		jac.append( ( func( prm + dp ) - func( prm - dp ) ) /
+		            ( 2. * h )                              )
+
+	return rollaxis( array( jac ), 0, jac[0].ndim + 1 )
+
+
+################################################################################
+## DEFINE THE FUNCTION FOR THE LARGEST RELATIVE DIFFERENCE.
+################################################################################
+
+def calc_err( val, ref ) :
+
+	# Return the largest difference between "val" and "ref" relative to
+	# the largest (absolute) value of "ref" along all but the final axis.
+
+	ref = array( ref )
+
+	nrm = amax( abs( ref.reshape( ( -1, ref.shape[-1] ) ) ), axis=0 )
+
+	return amax( abs( val - ref ) / nrm )
+
+
+################################################################################
+## DEFINE THE TESTS OF THE CUP RESPONSE.
+################################################################################
+
+class test_rsp( unittest.TestCase ) :
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE TEST OF THE KERNEL AGAINST THE REFERENCE IMPLEMENTATION.
+	#-----------------------------------------------------------------------
+
+	def test_cur_bmx( self ) :
+
+		arg = bench_arg( 1240 )
+
+		cur = rsp_cur_bmx( *arg )
+		ref = ref_cur_bmx( *arg )
+
+		self.assertLess( amax( abs( cur - ref ) ) / amax( abs( ref ) ),
+		                 tol_rsp                                       )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE TEST OF THE BI-MAXWELLIAN (ANISOTROPIC) JACOBIAN.
+	#-----------------------------------------------------------------------
+
+	def test_cur_bmx_jac( self ) :
+
+		# Note.  The parameters are "n", "v_x", "v_y", "v_z", "w_per",
+		#        and "w_par" (i.e., arguments 7 through 12).
+
+		arg = list( bench_arg( 1240 ) )
+
+		def func( prm ) :
+			return rsp_cur_bmx( *( arg[0:7] + list( prm ) ) )
+
+		prm = [ 5., -400., 20., -10., 30., 40. ]
+
+		( cur, jac ) = rsp_cur_bmx_jac( *( arg[0:7] + prm ) )
+
+		self.assertLess( calc_err( cur[...,newaxis],
+		                           func( prm )[...,newaxis] ), tol_rsp )
+
+		self.assertLess( calc_err( jac, calc_jac_fd( func, prm ) ),
+		                 tol_jac                                    )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE TEST OF THE MAXWELLIAN (ISOTROPIC) JACOBIAN.
+	#-----------------------------------------------------------------------
+
+	def test_cur_max_jac( self ) :
+
+		arg = list( bench_arg( 1240 ) )
+
+		def func( prm ) :
+			return rsp_cur_max( *( arg[0:4] + list( prm ) ) )
+
+		prm = [ 5., -400., 20., -10., 35. ]
+
+		( cur, jac ) = rsp_cur_max_jac( *( arg[0:4] + prm ) )
+
+		self.assertLess( calc_err( cur[...,newaxis],
+		                           func( prm )[...,newaxis] ), tol_rsp )
+
+		self.assertLess( calc_err( jac, calc_jac_fd( func, prm ) ),
+		                 tol_jac                                    )
+
+
+################################################################################
+## DEFINE THE TESTS OF THE JACOBIAN OF THE NON-LINEAR MODEL.
+################################################################################
+
+class test_nln_jac( unittest.TestCase ) :
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR SETTING UP EACH TEST.
+	#-----------------------------------------------------------------------
+
+	def setUp( self ) :
+
+		# Initialize an analysis core (for its ion populations), and
+		# generate the data of the selected points of a spectrum (with
+		# the look directions and velocity windows of Wind/FC).
+
+		self.cr = core( )
+
+		alt = array( [ 15., -15. ] )
+		azm = ( 18. * arange( 20 ) )[newaxis,:] + \
+		      array( [ [ 0. ], [ 9. ] ] )
+
+		vel_cen = 200. * 1.06**arange( 31 )
+		vel_wid = 0.06 * vel_cen
+
+		rnd = RandomState( 0 )
+
+		t = rnd.randint( 0, 2, 400 )
+		p = rnd.randint( 0, 20, 400 )
+		v = rnd.randint( 0, 31, 400 )
+
+		mag = rnd.normal( 0., 5., 3 )
+
+		self.x = array( [ vel_cen[v], vel_wid[v], alt[t], azm[t,p],
+		                  tile( mag[0], 400 ), tile( mag[1], 400 ),
+		                  tile( mag[2], 400 )                       ] )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR CONSTRUCTING THE PARAMETERS OF A MODEL.
+	#-----------------------------------------------------------------------
+
+	def make_prm( self, pop ) :
+
+		# Assign realistic values to the parameters of the populations
+		# "pop" (in the order of "core.make_nln_gss").
+
+		prm = [ -400., 20., -10. ]
+
+		for ( k, p ) in enumerate( pop ) :
+
+			prm.append( 5. / ( k + 1 ) )
+
+			if ( self.cr.nln_pyon.arr_pop[p]['drift'] ) :
+				prm.append( 30. )
+
+			if ( self.cr.nln_pyon.arr_pop[p]['aniso'] ) :
+				prm += [ 30., 40. ]
+			else :
+				prm.append( 35. )
+
+		return array( prm )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR CHECKING THE JACOBIAN OF A MODEL.
+	#-----------------------------------------------------------------------
+
+	def check_jac( self, pop ) :
+
+		prm = self.make_prm( pop )
+
+		def func( prm ) :
+			return self.cr.calc_nln_cur( pop, self.x, prm )
+
+		( cur, jac ) = self.cr.calc_nln_jac( pop, self.x, prm,
+		                                     ret_cur=True       )
+
+		self.assertEqual( jac.shape, ( 400, len( prm ) ) )
+
+		self.assertLess( calc_err( cur[...,newaxis],
+		                           func( prm )[...,newaxis] ), tol_rsp )
+
+		self.assertLess( calc_err( jac, calc_jac_fd( func, prm ) ),
+		                 tol_jac                                    )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE FUNCTION FOR CONFIGURING THE POPULATIONS.
+	#-----------------------------------------------------------------------
+
+	def make_pop( self, kind ) :
+
+		# For each "( drift, aniso )" pair in "kind", configure one of
+		# the (valid) default populations to be of that kind, and
+		# return the list of those populations.
+
+		pop = range( len( kind ) )
+
+		for ( p, ( drift, aniso ) ) in zip( pop, kind ) :
+			self.cr.nln_pyon.arr_pop[p]['drift'] = drift
+			self.cr.nln_pyon.arr_pop[p]['aniso'] = aniso
+
+		return list( pop )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE TESTS OF EACH KIND OF POPULATION (AND OF ALL AT ONCE).
+	#-----------------------------------------------------------------------
+
+	def test_iso( self ) :
+		self.check_jac( self.make_pop( [ ( False, False ) ] ) )
+
+	def test_iso_drift( self ) :
+		self.check_jac( self.make_pop( [ ( True, False ) ] ) )
+
+	def test_aniso( self ) :
+		self.check_jac( self.make_pop( [ ( False, True ) ] ) )
+
+	def test_aniso_drift( self ) :
+		self.check_jac( self.make_pop( [ ( True, True ) ] ) )
+
+	def test_all( self ) :
+		self.check_jac( self.make_pop( [ ( False, False ),
+		                                 ( True , False ),
+		                                 ( False, True  ),
+		                                 ( True , True  )  ] ) )
+
+	#-----------------------------------------------------------------------
+	# DEFINE THE TEST OF A STACK OF SPECTRA.
+	#-----------------------------------------------------------------------
+
+	def test_stack( self ) :
+
+		# Note.  The Jacobian of each of a stack of spectra (as fit by
+		#        "janus_nln_bat") must equal that of the spectrum alone.
+
+		pop = self.make_pop( [ ( True, True ), ( False, False ) ] )
+
+		prm = self.make_prm( pop )
+		prm = prm * ( 1. + 0.05 * arange( 3 ) )[:,newaxis]
+
+		x = self.x[:,newaxis,:] + zeros( ( 1, 3, 1 ) )
+
+		jac = self.cr.calc_nln_jac( pop, x, prm )
+
+		for k in range( 3 ) :
+
+			ref = self.cr.calc_nln_jac( pop, self.x, prm[k] )
+
+			self.assertLess( calc_err( jac[k], ref ), tol_rsp )
+
+
+################################################################################
+## RUN THE TESTS.
+################################################################################
+
+if ( __name__ == '__main__' ) :
+
+	unittest.main( )